@@ -5,6 +5,10 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+
+实时推送接口 /api/notifications/stream/（SSE）需以 ASGI 方式运行，例如：
+    uvicorn TeachingAssistant.asgi:application --workers 1
+其余接口在 ASGI 与 WSGI 下行为一致。
 """
 
 import os
@@ -0,0 +1,58 @@
+"""
+学生助教管理平台 - 模型通用混入类
+"""
+
+
+class FieldTrackerMixin:
+    """
+    字段变更追踪：从数据库加载实例时（from_db）记录 tracked_fields 的原值，
+    信号处理函数可直接判断字段是否变化，无需在 pre_save 中再查询一次旧记录。
+
+    - 原值在 save() 完成后（post_save 信号之后）更新为已保存的值
+    - 非数据库加载的实例（新建、手动构造）没有原值，has_changed() 视为已变化
+    - 延迟加载（defer/only）未取出的字段同样视为没有原值
+    """
+
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked_fields()
+        return instance
+
+    def _tracked_attname(self, name):
+        return self._meta.get_field(name).attname
+
+    def _snapshot_tracked_fields(self, fields=None):
+        loaded = self.__dict__.setdefault('_loaded_values', {})
+        for name in self.tracked_fields if fields is None else fields:
+            attname = self._tracked_attname(name)
+            if attname in self.__dict__:
+                loaded[name] = self.__dict__[attname]
+
+    def has_original(self, name):
+        """是否记录了该字段从数据库加载时的原值"""
+        return name in self.__dict__.get('_loaded_values', {})
+
+    def previous_value(self, name, default=None):
+        """字段从数据库加载（或上次保存）时的值"""
+        return self.__dict__.get('_loaded_values', {}).get(name, default)
+
+    def has_changed(self, name):
+        """字段当前值与原值是否不同"""
+        if not self.has_original(name):
+            return True
+        return self.previous_value(name) != getattr(self, self._tracked_attname(name))
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self._snapshot_tracked_fields()
+        else:
+            self._snapshot_tracked_fields([name for name in self.tracked_fields if name in update_fields])
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        self._snapshot_tracked_fields([name for name in self.tracked_fields if not fields or name in fields])
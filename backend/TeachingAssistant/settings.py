@@ -165,6 +165,25 @@ else:
         }
 
 
+# Cache
+# RBAC 角色、报表等缓存依赖信号主动失效；多进程部署时应通过环境变量
+# 切换为共享缓存（如 FileBasedCache / Redis），否则各进程缓存互不可见
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'teaching-assistant'),
+    }
+}
+
+
+# Realtime events（SSE 推送，见 notifications/events.py、notifications/stream.py）
+# 默认进程内事件总线仅适用于单 worker 的 ASGI 部署；多进程时替换为共享实现
+REALTIME_EVENT_BACKEND = os.getenv('REALTIME_EVENT_BACKEND', 'notifications.events.InProcessEventBackend')
+REALTIME_STREAM_KEEPALIVE = int(os.getenv('REALTIME_STREAM_KEEPALIVE', '20'))        # 心跳间隔（秒）
+REALTIME_STREAM_MAX_SECONDS = int(os.getenv('REALTIME_STREAM_MAX_SECONDS', '300'))   # 单次连接最长时长（秒）
+REALTIME_STREAM_TICKET_TTL = int(os.getenv('REALTIME_STREAM_TICKET_TTL', '30'))      # 连接票据有效期（秒，一次性）
+
+
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
 
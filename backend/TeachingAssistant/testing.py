@@ -0,0 +1,75 @@
+"""
+学生助教管理平台 - 测试公共数据
+各应用的 tests.py 共用的测试数据构造（用户、角色、岗位），不随生产代码加载
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User, Role, UserRole, Student, Faculty
+from recruitment.models import Position
+
+
+class DashboardTestMixin:
+    """看板测试数据：教师发布岗位、学生申请、助教提交工时"""
+
+    @classmethod
+    def create_roles(cls):
+        cls.student_role = Role.objects.create(role_code='student', role_name='学生')
+        cls.faculty_role = Role.objects.create(role_code='faculty', role_name='教师')
+
+    @classmethod
+    def create_admin(cls, index=0):
+        role, _created = Role.objects.get_or_create(role_code='administrator', defaults={'role_name': '管理员'})
+        user = User.objects.create_user(
+            f'admin{index}', f'admin{index}@example.com', 'pass12345',
+            user_id=f'A{index:05d}', real_name='管理员'
+        )
+        UserRole.objects.create(user=user, role=role, is_primary=True)
+        return user
+
+    @classmethod
+    def create_student(cls, index, is_ta=False):
+        user = User.objects.create_user(
+            f'student{index}', f'student{index}@example.com', 'pass12345',
+            user_id=f'S{index:05d}', real_name=f'学生{index}'
+        )
+        UserRole.objects.create(user=user, role=cls.student_role, is_primary=True)
+        Student.objects.create(
+            user=user, student_id=f'{index:05d}', department='计算机学院',
+            major='软件工程', grade=2022, is_ta=is_ta
+        )
+        return user
+
+    @classmethod
+    def create_faculty(cls, index):
+        user = User.objects.create_user(
+            f'faculty{index}', f'faculty{index}@example.com', 'pass12345',
+            user_id=f'F{index:05d}', real_name=f'教师{index}'
+        )
+        UserRole.objects.create(user=user, role=cls.faculty_role, is_primary=True)
+        Faculty.objects.create(
+            user=user, faculty_id=f'{index:05d}', department='计算机学院', title='讲师'
+        )
+        return user
+
+    @classmethod
+    def create_position(cls, faculty, index, **kwargs):
+        now = timezone.now()
+        fields = dict(
+            title=f'数据结构助教{index}', course_name='数据结构', course_code=f'CS{index:03d}',
+            description='批改作业、答疑', requirements='成绩优良', num_positions=10,
+            work_hours_per_week=6, hourly_rate=Decimal('30.00'),
+            start_date=now.date(), end_date=now.date() + timedelta(days=90),
+            application_deadline=now + timedelta(days=14), posted_by=faculty,
+        )
+        fields.update(kwargs)
+        return Position.objects.create(**fields)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
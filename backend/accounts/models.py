@@ -183,17 +183,19 @@ class User(AbstractBaseUser, PermissionsMixin):
             return None
     
     def has_permission(self, permission_code):
-        """检查用户是否拥有某个权限"""
-        return Permission.objects.filter(
-            rolepermission__role__userrole__user=self,
-            permission_code=permission_code
-        ).exists()
+        """检查用户是否拥有某个权限（基于缓存的角色权限集）"""
+        return permission_code in self.get_permission_codes()
+    
+    def get_permission_codes(self):
+        """获取用户的所有权限代码（按角色权限集取并集，结果来自缓存）"""
+        from .rbac import get_user_permission_codes
+        return get_user_permission_codes(self)
     
     def get_all_permissions_list(self):
         """获取用户的所有权限列表"""
         return Permission.objects.filter(
-            rolepermission__role__userrole__user=self
-        ).distinct()
+            permission_code__in=self.get_permission_codes()
+        )
 
 
 # ==============================================================================
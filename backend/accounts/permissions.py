@@ -5,7 +5,7 @@
 """
 
 from rest_framework import permissions
-from .models import UserRole, Student
+from .rbac import get_request_roles, get_request_permission_codes
 
 
 class IsStudent(permissions.BasePermission):
@@ -19,10 +19,7 @@ class IsStudent(permissions.BasePermission):
             return False
         
         # 检查用户是否有student角色
-        return UserRole.objects.filter(
-            user=request.user,
-            role__role_code='student'
-        ).exists()
+        return get_request_roles(request).has_role('student')
 
 
 class IsTA(permissions.BasePermission):
@@ -37,11 +34,7 @@ class IsTA(permissions.BasePermission):
             return False
         
         # 检查用户是否为助教
-        try:
-            student = Student.objects.get(user=request.user)
-            return student.is_ta
-        except Student.DoesNotExist:
-            return False
+        return get_request_roles(request).is_ta
 
 
 class IsFaculty(permissions.BasePermission):
@@ -55,10 +48,7 @@ class IsFaculty(permissions.BasePermission):
             return False
         
         # 检查用户是否有faculty角色
-        return UserRole.objects.filter(
-            user=request.user,
-            role__role_code='faculty'
-        ).exists()
+        return get_request_roles(request).has_role('faculty')
 
 
 class IsAdministrator(permissions.BasePermission):
@@ -73,10 +63,7 @@ class IsAdministrator(permissions.BasePermission):
             return False
         if getattr(request.user, 'is_staff', False):
             return True
-        return UserRole.objects.filter(
-            user=request.user,
-            role__role_code='administrator'
-        ).exists()
+        return get_request_roles(request).has_role('administrator')
 
 
 class IsStudentOrTA(permissions.BasePermission):
@@ -89,10 +76,7 @@ class IsStudentOrTA(permissions.BasePermission):
         if not request.user or not request.user.is_authenticated:
             return False
         
-        return UserRole.objects.filter(
-            user=request.user,
-            role__role_code='student'
-        ).exists()
+        return get_request_roles(request).has_role('student')
 
 
 class HasPermission(permissions.BasePermission):
@@ -113,8 +97,8 @@ class HasPermission(permissions.BasePermission):
         if not required_permission:
             return True  # 如果没有定义权限要求，默认允许
         
-        # 检查用户是否拥有该权限
-        return request.user.has_permission(required_permission)
+        # 检查用户是否拥有该权限（内存中判断，不查询数据库）
+        return required_permission in get_request_permission_codes(request)
 
 
 class IsOwner(permissions.BasePermission):
@@ -173,10 +157,7 @@ class IsFacultyOrAdmin(permissions.BasePermission):
         if not request.user or not request.user.is_authenticated:
             return False
         
-        return UserRole.objects.filter(
-            user=request.user,
-            role__role_code__in=['faculty', 'administrator']
-        ).exists()
+        return get_request_roles(request).has_role('faculty', 'administrator')
 
 
 class IsAdminOrReadOnly(permissions.BasePermission):
@@ -194,7 +175,4 @@ class IsAdminOrReadOnly(permissions.BasePermission):
             return True
         
         # 写权限只允许管理员
-        return UserRole.objects.filter(
-            user=request.user,
-            role__role_code='administrator'
-        ).exists()
+        return get_request_roles(request).has_role('administrator')
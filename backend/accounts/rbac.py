@@ -0,0 +1,205 @@
+"""
+学生助教管理平台 - RBAC 角色解析器与权限集缓存
+
+权限类在每个请求里都需要判断用户角色。这里一次查询加载用户的全部角色代码
+与助教标记，结果在同一请求内复用（memoize 到 request 上），并写入共享缓存；
+UserRole / Student / Role 变更时由 accounts.signals 负责失效（推迟到事务提交后执行，
+避免并发请求在提交前读到旧角色并重新写入缓存）。
+
+失效只能清除处理写入的进程能访问到的缓存：默认的进程内 LocMemCache 在多 worker 部署中
+各自独立，其他 worker 中被撤销的角色/权限会一直有效到缓存过期，因此进程内缓存只短时缓存
+（LOCAL_CACHE_TTL），配置共享缓存后才使用完整的缓存时长。
+
+权限集按角色预先计算：一次查询读取 RolePermission 得到「角色 → 权限代码」
+映射并缓存（带版本号），用户权限为其各角色权限集的并集，判断在内存中完成。
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import User, RolePermission
+
+
+ROLE_CACHE_TTL = 600  # 秒（共享缓存）
+PERMISSION_CACHE_TTL = 3600  # 秒（共享缓存）
+LOCAL_CACHE_TTL = 5  # 秒；进程内缓存无法被其他进程的失效操作清除，撤销角色/权限最多延迟这么久生效
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+RBAC_VERSION_KEY = 'accounts:rbac:version'
+PERMISSION_VERSION_KEY = 'accounts:rbac:permission_version'
+
+
+class UserRoles:
+    """用户角色快照：角色ID、角色代码集合 + 是否为助教"""
+
+    __slots__ = ('role_ids', 'role_codes', 'is_ta')
+
+    def __init__(self, role_ids=(), role_codes=(), is_ta=False):
+        self.role_ids = frozenset(role_ids)
+        self.role_codes = frozenset(role_codes)
+        self.is_ta = bool(is_ta)
+
+    def has_role(self, *role_codes):
+        """是否拥有任一指定角色"""
+        return any(code in self.role_codes for code in role_codes)
+
+
+def cache_ttl(shared_ttl):
+    """角色/权限缓存时长：共享缓存取 shared_ttl，进程内缓存取 LOCAL_CACHE_TTL"""
+    if settings.CACHES['default']['BACKEND'] in PROCESS_LOCAL_CACHE_BACKENDS:
+        return min(shared_ttl, LOCAL_CACHE_TTL)
+    return shared_ttl
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, None)
+        version = cache.get(key, 1)
+    return version
+
+
+def _bump_version(key):
+    def bump():
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 2, None)
+
+    transaction.on_commit(bump)
+
+
+def get_rbac_version():
+    """RBAC 缓存版本号，Role 变更时递增，使所有用户的缓存同时失效"""
+    return _get_version(RBAC_VERSION_KEY)
+
+
+def bump_rbac_version():
+    """递增 RBAC 缓存版本号"""
+    _bump_version(RBAC_VERSION_KEY)
+
+
+def bump_permission_version():
+    """递增权限集缓存版本号（RolePermission / Permission 变更时调用）"""
+    _bump_version(PERMISSION_VERSION_KEY)
+
+
+def _roles_cache_key(user_id, version=None):
+    if version is None:
+        version = get_rbac_version()
+    return f'accounts:user_roles:v{version}:{user_id}'
+
+
+def load_user_roles(user_id):
+    """
+    一次查询加载用户的角色代码与助教标记
+    （user LEFT JOIN user_role/role LEFT JOIN student）
+    """
+    rows = User.objects.filter(pk=user_id).values_list(
+        'userrole__role_id',
+        'userrole__role__role_code',
+        'student__is_ta',
+    )
+    role_ids = set()
+    role_codes = set()
+    is_ta = False
+    for role_id, role_code, student_is_ta in rows:
+        if role_id is not None:
+            role_ids.add(role_id)
+            role_codes.add(role_code)
+        if student_is_ta:
+            is_ta = True
+    return UserRoles(role_ids, role_codes, is_ta)
+
+
+def get_user_roles(user):
+    """获取用户角色快照（优先读共享缓存）"""
+    key = _roles_cache_key(user.pk)
+    cached = cache.get(key)
+    if cached is not None:
+        return UserRoles(*cached)
+
+    roles = load_user_roles(user.pk)
+    cache.set(key, (tuple(roles.role_ids), tuple(roles.role_codes), roles.is_ta), cache_ttl(ROLE_CACHE_TTL))
+    return roles
+
+
+def get_request_roles(request):
+    """获取当前请求用户的角色快照，同一请求内多个权限类只解析一次"""
+    roles = getattr(request, '_cached_user_roles', None)
+    if roles is None:
+        roles = get_user_roles(request.user)
+        request._cached_user_roles = roles
+    return roles
+
+
+def invalidate_user_roles(*user_ids):
+    """使指定用户的角色缓存失效（在事务中调用时于提交后执行）"""
+    def invalidate():
+        version = get_rbac_version()
+        cache.delete_many([_roles_cache_key(user_id, version) for user_id in user_ids])
+
+    transaction.on_commit(invalidate)
+
+
+# ==============================================================================
+# 权限集缓存
+# ==============================================================================
+
+def load_role_permissions():
+    """
+    一次查询构建「角色ID → 权限代码集合」映射
+    同时记录权限代码的全局顺序（module, permission_code），便于输出保持稳定
+    """
+    rows = RolePermission.objects.order_by(
+        'permission__module', 'permission__permission_code'
+    ).values_list('role_id', 'permission__permission_code')
+
+    order = []
+    seen = set()
+    by_role = {}
+    for role_id, permission_code in rows:
+        by_role.setdefault(role_id, set()).add(permission_code)
+        if permission_code not in seen:
+            seen.add(permission_code)
+            order.append(permission_code)
+    return {
+        'order': order,
+        'roles': {role_id: frozenset(codes) for role_id, codes in by_role.items()},
+    }
+
+
+def get_role_permissions():
+    """获取角色权限映射（优先读共享缓存）"""
+    key = f'accounts:role_permissions:v{_get_version(PERMISSION_VERSION_KEY)}'
+    data = cache.get(key)
+    if data is None:
+        data = load_role_permissions()
+        cache.set(key, data, cache_ttl(PERMISSION_CACHE_TTL))
+    return data
+
+
+def get_permission_codes_for_roles(role_ids):
+    """多个角色权限集的并集，按全局顺序返回列表"""
+    data = get_role_permissions()
+    granted = set()
+    for role_id in role_ids:
+        granted |= data['roles'].get(role_id, frozenset())
+    return [code for code in data['order'] if code in granted]
+
+
+def get_user_permission_codes(user):
+    """获取用户的全部权限代码"""
+    return get_permission_codes_for_roles(get_user_roles(user).role_ids)
+
+
+def get_request_permission_codes(request):
+    """获取当前请求用户的权限代码集合，同一请求内只计算一次"""
+    codes = getattr(request, '_cached_permission_codes', None)
+    if codes is None:
+        codes = frozenset(get_permission_codes_for_roles(get_request_roles(request).role_ids))
+        request._cached_permission_codes = codes
+    return codes
@@ -8,7 +8,9 @@ from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
+from django.db.models import Prefetch
 from .models import User, Role, Permission, UserRole, Student, Faculty, Administrator
+from .rbac import get_permission_codes_for_roles
 
 
 # ==============================================================================
@@ -82,9 +84,32 @@ class UserSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['user_id', 'date_joined', 'last_login', 'created_at']
     
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        列表接口批量预取：角色（UserRole + Role）与学生/教师/管理员扩展信息，
+        使整页序列化的查询数与行数无关
+        """
+        return queryset.select_related(
+            'student', 'faculty', 'administrator'
+        ).prefetch_related(
+            Prefetch('userrole_set', queryset=UserRole.objects.select_related('role'))
+        )
+    
+    def _get_user_roles(self, obj):
+        """获取用户的 UserRole 列表（含 Role），已预取时直接复用，单次序列化内只查询一次"""
+        user_roles = getattr(obj, '_serialized_user_roles', None)
+        if user_roles is None:
+            if 'userrole_set' in getattr(obj, '_prefetched_objects_cache', {}):
+                user_roles = list(obj.userrole_set.all())
+            else:
+                user_roles = list(UserRole.objects.filter(user=obj).select_related('role'))
+            obj._serialized_user_roles = user_roles
+        return user_roles
+    
     def get_roles(self, obj):
         """获取用户的所有角色（完整对象数组）。Django 后台用户(is_staff/is_superuser)视为拥有 admin 角色以便前端跳转管理后台。"""
-        user_roles = UserRole.objects.filter(user=obj).select_related('role')
+        user_roles = self._get_user_roles(obj)
         roles_list = [
             {
                 'role_id': ur.role.role_id,
@@ -105,13 +130,12 @@ class UserSerializer(serializers.ModelSerializer):
         return roles_list
     
     def get_permissions(self, obj):
-        """获取用户的所有权限"""
-        permissions = obj.get_all_permissions_list()
-        return [p.permission_code for p in permissions]
+        """获取用户的所有权限（按角色权限集取并集，权限映射来自缓存）"""
+        return get_permission_codes_for_roles([ur.role_id for ur in self._get_user_roles(obj)])
     
     def get_primary_role(self, obj):
         """获取用户的主角色"""
-        primary_role = obj.get_primary_role()
+        primary_role = next((ur.role for ur in self._get_user_roles(obj) if ur.is_primary), None)
         if primary_role:
             return {
                 'role_id': primary_role.role_id,
@@ -439,8 +463,7 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
             token['role_name'] = primary_role.role_name
         
         # 添加权限列表
-        permissions = user.get_all_permissions_list()
-        token['permissions'] = [p.permission_code for p in permissions]
+        token['permissions'] = user.get_permission_codes()
         
         return token
     
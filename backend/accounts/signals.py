@@ -0,0 +1,40 @@
+"""
+学生助教管理平台 - 用户认证模块信号
+包含：RBAC 角色缓存、权限集缓存失效
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Role, Permission, UserRole, RolePermission, Student
+from .rbac import invalidate_user_roles, bump_rbac_version, bump_permission_version
+
+
+@receiver([post_save, post_delete], sender=UserRole)
+def on_user_role_changed(sender, instance: UserRole, **kwargs):
+    """用户角色分配/撤销时，清除该用户的角色缓存"""
+    invalidate_user_roles(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=Student)
+def on_student_changed(sender, instance: Student, **kwargs):
+    """学生信息变更（如成为助教）时，清除该用户的角色缓存"""
+    invalidate_user_roles(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=Role)
+def on_role_changed(sender, instance: Role, **kwargs):
+    """角色代码可能被修改，整体递增缓存版本"""
+    bump_rbac_version()
+
+
+@receiver([post_save, post_delete], sender=RolePermission)
+def on_role_permission_changed(sender, instance: RolePermission, **kwargs):
+    """角色授权/撤权时，递增权限集缓存版本"""
+    bump_permission_version()
+
+
+@receiver([post_save, post_delete], sender=Permission)
+def on_permission_changed(sender, instance: Permission, **kwargs):
+    """权限代码可能被修改，递增权限集缓存版本"""
+    bump_permission_version()
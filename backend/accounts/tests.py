@@ -1,3 +1,209 @@
-from django.test import TestCase
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from .models import User, Role, Permission, UserRole, RolePermission, Student, Faculty
+from .permissions import HasPermission
+from .rbac import LOCAL_CACHE_TTL, ROLE_CACHE_TTL, _roles_cache_key, cache_ttl, get_user_roles
+
+
+class UserListQueryCountTest(TestCase):
+    """用户列表接口：查询数不随每页行数增长"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student_role = Role.objects.create(role_code='student', role_name='学生')
+        cls.faculty_role = Role.objects.create(role_code='faculty', role_name='教师')
+        permission = Permission.objects.create(
+            permission_code='view_position', permission_name='浏览岗位', module='recruitment'
+        )
+        RolePermission.objects.create(role=cls.student_role, permission=permission)
+        cls.viewer = cls.create_faculty(0)
+
+    @classmethod
+    def create_student(cls, index):
+        user = User.objects.create_user(
+            f'student{index}', f'student{index}@example.com', 'pass12345',
+            user_id=f'S{index:05d}', real_name=f'学生{index}'
+        )
+        UserRole.objects.create(user=user, role=cls.student_role, is_primary=True)
+        Student.objects.create(
+            user=user, student_id=f'{index:05d}', department='计算机学院',
+            major='软件工程', grade=2022
+        )
+        return user
+
+    @classmethod
+    def create_faculty(cls, index):
+        user = User.objects.create_user(
+            f'faculty{index}', f'faculty{index}@example.com', 'pass12345',
+            user_id=f'F{index:05d}', real_name=f'教师{index}'
+        )
+        UserRole.objects.create(user=user, role=cls.faculty_role, is_primary=True)
+        Faculty.objects.create(
+            user=user, faculty_id=f'{index:05d}', department='计算机学院', title='讲师'
+        )
+        return user
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+
+    def count_list_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/auth/users/')
+        self.assertEqual(response.status_code, 200)
+        return len(ctx), response.data
+
+    def test_query_count_constant_as_page_grows(self):
+        for i in range(1, 4):
+            self.create_student(i)
+        cache.clear()
+        small_count, small_data = self.count_list_queries()
+        self.assertEqual(small_data['count'], 4)
+
+        for i in range(4, 16):
+            self.create_student(i)
+        cache.clear()
+        large_count, large_data = self.count_list_queries()
+        self.assertEqual(large_data['count'], 16)
+
+        self.assertEqual(small_count, large_count)
+
+    def test_list_payload_matches_roles_and_profiles(self):
+        self.create_student(1)
+        _, data = self.count_list_queries()
+        rows = {row['user_id']: row for row in data['results']}
+
+        student = rows['S00001']
+        self.assertEqual(student['primary_role']['role_code'], 'student')
+        self.assertEqual(student['permissions'], ['view_position'])
+        self.assertEqual(student['student_info']['student_id'], '00001')
+        self.assertIsNone(student['faculty_info'])
+
+        faculty = rows['F00000']
+        self.assertEqual(faculty['roles'][0]['role_code'], 'faculty')
+        self.assertEqual(faculty['permissions'], [])
+        self.assertEqual(faculty['faculty_info']['title'], '讲师')
+        self.assertIsNone(faculty['student_info'])
+
+
+class RoleCacheInvalidationTest(TestCase):
+    """角色缓存在事务提交后失效，提交前并发写入的旧角色不会残留"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student_role = Role.objects.create(role_code='student', role_name='学生')
+        cls.user = User.objects.create_user(
+            'student1', 'student1@example.com', 'pass12345', user_id='S00001', real_name='学生1'
+        )
+        cls.student = Student.objects.create(
+            user=cls.user, student_id='00001', department='计算机学院', major='软件工程', grade=2022
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_stale_roles_cached_before_commit_are_discarded(self):
+        self.assertFalse(get_user_roles(self.user).has_role('student'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                UserRole.objects.create(user=self.user, role=self.student_role, is_primary=True)
+                # 并发请求在提交前读到旧角色并写回缓存
+                cache.set(_roles_cache_key(self.user.pk), ((), (), False))
+                self.assertFalse(get_user_roles(self.user).has_role('student'))
+
+        self.assertTrue(get_user_roles(self.user).has_role('student'))
+
+    def test_ta_flag_refreshed_after_commit(self):
+        self.assertFalse(get_user_roles(self.user).is_ta)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.is_ta = True
+            self.student.save()
+        self.assertTrue(get_user_roles(self.user).is_ta)
+
+    def test_process_local_cache_expires_revoked_role_quickly(self):
+        user_role = UserRole.objects.create(user=self.user, role=self.student_role, is_primary=True)
+        self.assertTrue(get_user_roles(self.user).has_role('student'))
+
+        # 由另一个 worker 撤销角色：其提交后的失效操作清除不到本进程的 LocMemCache
+        user_role.delete()
+        self.assertTrue(get_user_roles(self.user).has_role('student'))
+        with mock.patch('time.time', return_value=time.time() + LOCAL_CACHE_TTL + 1):
+            self.assertFalse(get_user_roles(self.user).has_role('student'))
+
+    def test_full_ttl_only_with_shared_cache(self):
+        self.assertEqual(cache_ttl(ROLE_CACHE_TTL), LOCAL_CACHE_TTL)
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://'}}
+        with override_settings(CACHES=shared):
+            self.assertEqual(cache_ttl(ROLE_CACHE_TTL), ROLE_CACHE_TTL)
+
+
+class ViewPositionProbe(APIView):
+    """仅用于测试 HasPermission 的视图"""
+    permission_classes = [permissions.IsAuthenticated, HasPermission]
+    permission_required = 'view_position'
+
+    def get(self, request):
+        return Response({'ok': True})
+
+
+class PermissionCacheInvalidationTest(TestCase):
+    """权限集缓存：RolePermission 变更在事务提交后使缓存失效，撤权在下一个请求即生效"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student_role = Role.objects.create(role_code='student', role_name='学生')
+        cls.permission = Permission.objects.create(
+            permission_code='view_position', permission_name='浏览岗位', module='recruitment'
+        )
+        cls.user = User.objects.create_user(
+            'student1', 'student1@example.com', 'pass12345', user_id='S00001', real_name='学生1'
+        )
+        UserRole.objects.create(user=cls.user, role=cls.student_role, is_primary=True)
+
+    def setUp(self):
+        cache.clear()
+
+    def request(self):
+        request = APIRequestFactory().get('/probe/')
+        force_authenticate(request, user=self.user)
+        return ViewPositionProbe.as_view()(request).status_code
+
+    def test_revoked_permission_denied_on_next_request(self):
+        grant = RolePermission.objects.create(role=self.student_role, permission=self.permission)
+        self.assertEqual(self.request(), 200)
+        # 角色与权限集均已缓存，判断在内存中完成
+        with self.assertNumQueries(0):
+            self.assertEqual(self.request(), 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                grant.delete()
+                # 提交前缓存版本不变，并发请求仍按旧权限集判断
+                self.assertEqual(self.request(), 200)
+        self.assertEqual(self.request(), 403)
+
+    def test_granted_permission_allowed_after_commit(self):
+        self.assertEqual(self.request(), 403)
+        with self.captureOnCommitCallbacks(execute=True):
+            RolePermission.objects.create(role=self.student_role, permission=self.permission)
+        self.assertEqual(self.request(), 200)
+
+    def test_renamed_permission_code_invalidates(self):
+        RolePermission.objects.create(role=self.student_role, permission=self.permission)
+        self.assertEqual(self.request(), 200)
+        self.permission.permission_code = 'view_position_detail'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.permission.save()
+        self.assertEqual(self.request(), 403)
@@ -304,7 +304,8 @@ class UserListView(generics.ListAPIView):
         if is_active is not None:
             queryset = queryset.filter(is_active=is_active.lower() == 'true')
         
-        return queryset
+        # 批量预取角色与扩展信息，避免逐行查询
+        return UserSerializer.setup_eager_loading(queryset)
 
 
 class UserDetailView(generics.RetrieveAPIView):
@@ -314,7 +315,7 @@ class UserDetailView(generics.RetrieveAPIView):
     """
     permission_classes = [IsAuthenticated]
     serializer_class = UserSerializer
-    queryset = User.objects.all()
+    queryset = UserSerializer.setup_eager_loading(User.objects.all())
     lookup_field = 'user_id'
 
 
@@ -4,8 +4,8 @@
 
 from django.contrib import admin
 from django.utils.html import format_html
-from django.utils import timezone
 from .models import Application
+from .services import bulk_review_applications
 
 
 @admin.register(Application)
@@ -66,23 +66,21 @@ class ApplicationAdmin(admin.ModelAdmin):
     status_colored.admin_order_field = 'status'
     
     def batch_approve(self, request, queryset):
-        """批量通过申请"""
-        updated = queryset.update(
-            status='accepted',
-            reviewed_by=request.user,
-            reviewed_at=timezone.now()
-        )
-        self.message_user(request, f'成功通过 {updated} 个申请')
+        """批量通过申请（批量写入状态与通知，见 bulk_review_applications）"""
+        updated, skipped = bulk_review_applications(queryset, 'accept', request.user)
+        message = f'成功通过 {updated} 个申请'
+        if skipped:
+            message += f'，跳过 {skipped} 个（已审核或岗位名额已满）'
+        self.message_user(request, message)
     batch_approve.short_description = '✓ 批量通过选中的申请'
     
     def batch_reject(self, request, queryset):
         """批量拒绝申请"""
-        updated = queryset.update(
-            status='rejected',
-            reviewed_by=request.user,
-            reviewed_at=timezone.now()
-        )
-        self.message_user(request, f'成功拒绝 {updated} 个申请')
+        updated, skipped = bulk_review_applications(queryset, 'reject', request.user)
+        message = f'成功拒绝 {updated} 个申请'
+        if skipped:
+            message += f'，跳过 {skipped} 个（已审核或岗位名额已满）'
+        self.message_user(request, message)
     batch_reject.short_description = '✗ 批量拒绝选中的申请'
     
     def get_readonly_fields(self, request, obj=None):
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application', '0002_application_resume_text_alter_application_resume'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['applicant', 'applied_at'], name='application_applica_56ab24_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['position', 'status'], name='application_positio_c61928_idx'),
+        ),
+        # 先建复合索引再删除被其前缀覆盖的单列索引（MySQL 外键列必须始终有索引）
+        migrations.RemoveIndex(
+            model_name='application',
+            name='application_applica_715029_idx',
+        ),
+    ]
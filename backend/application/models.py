@@ -5,11 +5,15 @@
 
 from django.db import models
 from django.conf import settings
+from TeachingAssistant.mixins import FieldTrackerMixin
 from recruitment.models import Position
 
 
-class Application(models.Model):
+class Application(FieldTrackerMixin, models.Model):
     """申请表 - 记录学生申请岗位的过程"""
+
+    # 信号据此判断状态流转，无需 pre_save 再查询旧记录
+    tracked_fields = ('status',)
     
     # 申请状态选择
     STATUS_CHOICES = [
@@ -91,7 +95,10 @@ class Application(models.Model):
         unique_together = [['position', 'applicant']]
         ordering = ['-applied_at']
         indexes = [
-            models.Index(fields=['applicant']),
+            # 我的申请：applicant=? ORDER BY applied_at DESC
+            models.Index(fields=['applicant', 'applied_at']),
+            # 教师端按岗位统计/筛选各状态申请
+            models.Index(fields=['position', 'status']),
             models.Index(fields=['status']),
             models.Index(fields=['applied_at']),
         ]
@@ -26,15 +26,15 @@ class ApplicationCreateSerializer(serializers.ModelSerializer):
         if not (has_text ^ has_file):
             raise serializers.ValidationError('请在"在线填写"和"上传简历文件"中二选一。')
 
-        # 检查岗位状态
-        if position.status != 'open':
-            raise serializers.ValidationError('该岗位已关闭，无法申请。')
-        
         # 检查申请截止时间
         now = timezone.now()
         if position.application_deadline < now:
             raise serializers.ValidationError('该岗位申请已过期，无法申请。')
 
+        # 检查岗位状态（按实际状态，到期/招满但尚未被清扫的岗位同样视为关闭）
+        if position.get_effective_status() != 'open':
+            raise serializers.ValidationError('该岗位已关闭，无法申请。')
+
         # 同一岗位唯一申请
         if Application.objects.filter(position=position, applicant=user).exists():
             raise serializers.ValidationError('您已申请过该岗位。')
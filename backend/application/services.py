@@ -0,0 +1,126 @@
+"""
+学生助教管理平台 - 申请流程模块业务服务
+包含：申请状态变更通知、批量审核（Admin 批量操作）
+"""
+
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from accounts.models import Student
+from accounts.rbac import invalidate_user_roles
+from dashboard.invalidation import bump_generation
+from notifications.models import Notification
+from recruitment.models import Position
+from recruitment.services import invalidate_faculty_dashboard, invalidate_user_dashboard
+from .models import Application
+
+
+REVIEWABLE_STATUSES = ['submitted', 'reviewing']
+
+
+def status_change_notification(application):
+    """
+    申请被录用/拒绝时通知申请人（未保存的 Notification，其他状态返回 None）
+    需要 application.position 已加载
+    """
+    if application.status not in ['accepted', 'rejected']:
+        return None
+    position = application.position
+    return Notification(
+        recipient_id=application.applicant_id,
+        sender_id=position.posted_by_id,
+        notification_type=f'application_{application.status}',
+        category='application',
+        title='申请状态更新',
+        message=f'您对“{position.title}”的申请已{ "通过" if application.status == "accepted" else "被拒" }。',
+        related_model='Application',
+        related_object_id=application.application_id,
+        priority='medium',
+    )
+
+
+def _increment_num_filled(counts):
+    """按岗位增加录用人数：相同增量的岗位合并为一次 F 表达式 UPDATE，招满的开放岗位随后关闭"""
+    groups = defaultdict(list)
+    for position_id, count in counts.items():
+        groups[count].append(position_id)
+    now = timezone.now()
+    for count, position_ids in groups.items():
+        Position.objects.filter(pk__in=position_ids).update(
+            num_filled=F('num_filled') + count, updated_at=now
+        )
+    # 与 Position.save 的状态联动一致：招满视为关闭
+    Position.objects.filter(
+        pk__in=list(counts), status='open', num_filled__gte=F('num_positions')
+    ).update(status='closed', updated_at=now)
+
+
+def _mark_students_as_ta(user_ids):
+    """录用后将学生标记为助教（已是助教的保持 ta_since 不变）"""
+    updated = Student.objects.filter(user_id__in=user_ids, is_ta=False).update(
+        is_ta=True, ta_since=timezone.now().date(), updated_at=timezone.now()
+    )
+    if updated:
+        invalidate_user_roles(*user_ids)
+
+
+def bulk_review_applications(queryset, action, reviewer, notes=None):
+    """
+    批量审核申请，action 为 'accept' 或 'reject'；返回 (处理数, 跳过数)
+    - 只处理待审核（submitted/reviewing）的申请，已审核完成的跳过
+    - 录用时按岗位剩余名额依申请时间先后录用，超出名额的跳过（与单条审核的防超额一致）
+    - 状态、岗位录用人数、学生助教身份、通知均为批量写入，并在同一事务中提交
+    """
+    if action not in ('accept', 'reject'):
+        raise ValueError('action 取值应为 accept 或 reject')
+
+    with transaction.atomic():
+        applications = list(
+            queryset.filter(status__in=REVIEWABLE_STATUSES)
+            .select_for_update()
+            .select_related('position')
+            .order_by('applied_at', 'application_id')
+        )
+        total = queryset.count()
+
+        if action == 'accept':
+            remaining = {}
+            selected = []
+            for application in applications:
+                position = application.position
+                remaining.setdefault(position.pk, position.num_positions - position.num_filled)
+                if remaining[position.pk] > 0:
+                    remaining[position.pk] -= 1
+                    selected.append(application)
+            new_status = 'accepted'
+        else:
+            selected = applications
+            new_status = 'rejected'
+
+        if not selected:
+            return 0, total
+
+        now = timezone.now()
+        values = {'status': new_status, 'reviewed_by': reviewer, 'reviewed_at': now, 'updated_at': now}
+        if notes:
+            values['review_notes'] = notes
+        Application.objects.filter(pk__in=[a.pk for a in selected]).update(**values)
+
+        if action == 'accept':
+            _increment_num_filled(Counter(a.position_id for a in selected))
+            _mark_students_as_ta({a.applicant_id for a in selected})
+            bump_generation('positions')
+
+        for application in selected:
+            application.status = new_status
+        Notification.objects.bulk_create(
+            [status_change_notification(application) for application in selected]
+        )
+
+    bump_generation('applications')
+    invalidate_faculty_dashboard(*(application.position.posted_by_id for application in selected))
+    invalidate_user_dashboard(*(application.applicant_id for application in selected))
+    return len(selected), total - len(selected)
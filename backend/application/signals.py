@@ -1,7 +1,8 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_save
 from django.dispatch import receiver
 from .models import Application
 from notifications.models import Notification
+from .services import status_change_notification
 
 
 @receiver(post_save, sender=Application)
@@ -35,28 +36,12 @@ def on_application_created(sender, instance: Application, created: bool, **kwarg
     )
 
 
-@receiver(pre_save, sender=Application)
-def on_application_status_change(sender, instance: Application, **kwargs):
-    if not instance.pk:
-        return
-    try:
-        prev = Application.objects.get(pk=instance.pk)
-    except Application.DoesNotExist:
-        return
-    if prev.status == instance.status:
+@receiver(post_save, sender=Application)
+def on_application_status_change(sender, instance: Application, created: bool, **kwargs):
+    # 与加载时的原值比较（FieldTrackerMixin），不再额外查询旧记录
+    if created or not instance.has_changed('status'):
         return
-    # 状态变更通知申请人
-    if instance.status in ['accepted', 'rejected']:
-        Notification.objects.create(
-            recipient=instance.applicant,
-            sender=instance.position.posted_by,
-            notification_type=f'application_{instance.status}',
-            category='application',
-            title='申请状态更新',
-            message=f'您对“{instance.position.title}”的申请已{ "通过" if instance.status == "accepted" else "被拒" }。',
-            related_model='Application',
-            related_object_id=instance.application_id,
-            priority='medium',
-        )
-
-
+    # 状态变更通知申请人（录用/拒绝）
+    notification = status_change_notification(instance)
+    if notification is not None:
+        notification.save()
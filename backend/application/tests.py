@@ -1,3 +1,213 @@
+from datetime import timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import Student
+from accounts.rbac import get_user_roles
+from notifications.models import Notification
+from recruitment.models import Position
+from TeachingAssistant.testing import DashboardTestMixin
+from .models import Application
+from .services import bulk_review_applications
+
+
+class BulkReviewApplicationsTest(DashboardTestMixin, TestCase):
+    """批量审核申请：按剩余名额与申请先后录用，岗位人数、助教身份与通知批量写入"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_roles()
+        cls.faculty = cls.create_faculty(0)
+        cls.students = [cls.create_student(index) for index in range(4)]
+
+    def apply(self, position, students, status='submitted'):
+        """按列表顺序依次提前 1 小时申请，列表靠前的申请时间更早"""
+        now = timezone.now()
+        applications = []
+        for index, student in enumerate(students):
+            application = Application.objects.create(position=position, applicant=student, status=status)
+            Application.objects.filter(pk=application.pk).update(
+                applied_at=now - timedelta(hours=len(students) - index)
+            )
+            applications.append(application)
+        return applications
+
+    def review(self, action, queryset=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return bulk_review_applications(
+                queryset if queryset is not None else Application.objects.all(), action, self.faculty, '批量审核'
+            )
+
+    def statuses(self):
+        return dict(Application.objects.values_list('applicant_id', 'status'))
+
+    def test_accept_respects_remaining_slots_in_applied_order(self):
+        position = self.create_position(self.faculty, 0, num_positions=3, num_filled=1)
+        self.apply(position, self.students[1:] + self.students[:1])
+
+        self.assertEqual(self.review('accept'), (2, 2))
+        statuses = self.statuses()
+        # 申请时间最早的两位（students[1]、students[2]）被录用，其余保持待审核
+        self.assertEqual(statuses[self.students[1].pk], 'accepted')
+        self.assertEqual(statuses[self.students[2].pk], 'accepted')
+        self.assertEqual(statuses[self.students[3].pk], 'submitted')
+        self.assertEqual(statuses[self.students[0].pk], 'submitted')
+
+        position.refresh_from_db()
+        self.assertEqual(position.num_filled, 3)
+        # 招满的开放岗位随即关闭
+        self.assertEqual(position.status, 'closed')
+
+    def test_num_filled_grouped_per_position(self):
+        first = self.create_position(self.faculty, 1)
+        second = self.create_position(self.faculty, 2)
+        third = self.create_position(self.faculty, 3, num_positions=5, num_filled=4)
+        self.apply(first, self.students[:2])
+        self.apply(second, self.students[2:4])
+        self.apply(third, self.students[:1])
+
+        self.assertEqual(self.review('accept'), (5, 0))
+        filled = dict(Position.objects.values_list('pk', 'num_filled'))
+        self.assertEqual(filled, {first.pk: 2, second.pk: 2, third.pk: 5})
+        self.assertEqual(Position.objects.get(pk=third.pk).status, 'closed')
+        self.assertEqual(Position.objects.get(pk=first.pk).status, 'open')
+
+    def test_accept_promotes_students_and_invalidates_role_cache(self):
+        position = self.create_position(self.faculty, 0)
+        self.apply(position, self.students[:2])
+        # 审核前角色已被缓存
+        self.assertFalse(get_user_roles(self.students[0]).is_ta)
+
+        self.review('accept')
+        self.assertEqual(
+            set(Student.objects.filter(is_ta=True).values_list('user_id', flat=True)),
+            {self.students[0].pk, self.students[1].pk},
+        )
+        self.assertIsNotNone(Student.objects.get(user=self.students[0]).ta_since)
+        self.assertTrue(get_user_roles(self.students[0]).is_ta)
+
+    def test_notifications_written_in_bulk(self):
+        position = self.create_position(self.faculty, 0)
+        applications = self.apply(position, self.students[:3])
+
+        # 锁定待审核申请 1 + 总数 1 + 状态 UPDATE 1 + 通知批量插入 1 + 未读计数 2 + 保存点 2，与申请数无关
+        with self.assertNumQueries(8):
+            self.review('reject')
+
+        notifications = Notification.objects.filter(notification_type='application_rejected')
+        self.assertEqual(
+            sorted(notifications.values_list('related_object_id', flat=True)),
+            sorted(application.pk for application in applications),
+        )
+        self.assertEqual(
+            set(notifications.values_list('recipient_id', flat=True)),
+            {student.pk for student in self.students[:3]},
+        )
+        self.assertEqual(set(notifications.values_list('sender_id', flat=True)), {self.faculty.pk})
+        self.assertFalse(Student.objects.filter(is_ta=True).exists())
+
+    def test_already_reviewed_applications_are_skipped(self):
+        position = self.create_position(self.faculty, 0)
+        self.apply(position, self.students[:1], status='accepted')
+        self.apply(position, self.students[1:2])
+
+        self.assertEqual(self.review('reject'), (1, 1))
+        self.assertEqual(self.statuses()[self.students[0].pk], 'accepted')
+        self.assertEqual(Notification.objects.filter(notification_type='application_rejected').count(), 1)
+
+    def test_invalid_action(self):
+        with self.assertRaises(ValueError):
+            bulk_review_applications(Application.objects.all(), 'approve', self.faculty)
+
+
+class FieldTrackerMixinTest(DashboardTestMixin, TestCase):
+    """字段变更追踪：加载、保存、refresh_from_db 与延迟加载后的原值"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_roles()
+        cls.faculty = cls.create_faculty(0)
+        cls.other_faculty = cls.create_faculty(1)
+        cls.student = cls.create_student(0)
+        cls.position = cls.create_position(cls.faculty, 0)
+        cls.application = Application.objects.create(
+            position=cls.position, applicant=cls.student, status='submitted'
+        )
+
+    def test_new_instance_has_no_original(self):
+        position = self.create_position(self.faculty, 1)
+        application = Application(position=position, applicant=self.student, status='submitted')
+        self.assertFalse(application.has_original('status'))
+        self.assertTrue(application.has_changed('status'))
+        self.assertIsNone(application.previous_value('status'))
+
+        application.save()
+        self.assertTrue(application.has_original('status'))
+        self.assertFalse(application.has_changed('status'))
+        self.assertEqual(application.previous_value('status'), 'submitted')
+
+    def test_loaded_instance_tracks_changes_until_save(self):
+        application = Application.objects.get(pk=self.application.pk)
+        self.assertFalse(application.has_changed('status'))
+
+        application.status = 'accepted'
+        self.assertTrue(application.has_changed('status'))
+        self.assertEqual(application.previous_value('status'), 'submitted')
+
+        application.save()
+        self.assertFalse(application.has_changed('status'))
+        self.assertEqual(application.previous_value('status'), 'accepted')
+
+    def test_save_with_update_fields_only_snapshots_saved_fields(self):
+        application = Application.objects.get(pk=self.application.pk)
+        application.status = 'rejected'
+        application.review_notes = '名额已满'
+        application.save(update_fields=['review_notes'])
+        self.assertTrue(application.has_changed('status'))
+        self.assertEqual(application.previous_value('status'), 'submitted')
+
+        application.save(update_fields=['status'])
+        self.assertFalse(application.has_changed('status'))
+        self.assertEqual(application.previous_value('status'), 'rejected')
+
+    def test_refresh_from_db_resets_original(self):
+        application = Application.objects.get(pk=self.application.pk)
+        Application.objects.filter(pk=application.pk).update(status='accepted')
+        application.refresh_from_db()
+        self.assertEqual(application.status, 'accepted')
+        self.assertFalse(application.has_changed('status'))
+        self.assertEqual(application.previous_value('status'), 'accepted')
+
+        # 只刷新其他字段时保留原值
+        application.status = 'rejected'
+        application.refresh_from_db(fields=['review_notes'])
+        self.assertTrue(application.has_changed('status'))
+        self.assertEqual(application.previous_value('status'), 'accepted')
+
+    def test_foreign_key_tracked_by_attname(self):
+        position = Position.objects.get(pk=self.position.pk)
+        self.assertEqual(position.previous_value('posted_by'), self.faculty.pk)
+
+        position.posted_by = self.other_faculty
+        self.assertTrue(position.has_changed('posted_by'))
+        self.assertEqual(position.previous_value('posted_by'), self.faculty.pk)
+
+    def test_deferred_field_has_no_original(self):
+        application = Application.objects.defer('status').get(pk=self.application.pk)
+        self.assertFalse(application.has_original('status'))
+        self.assertTrue(application.has_changed('status'))
+
+        # 访问延迟字段会通过 refresh_from_db(fields=[...]) 加载并记录原值
+        self.assertEqual(application.status, 'submitted')
+        self.assertTrue(application.has_original('status'))
+        self.assertFalse(application.has_changed('status'))
 
-# Create your tests here.
+        # 不带 fields 的 refresh_from_db 只刷新已加载的字段，延迟字段仍没有原值
+        application = Application.objects.only('review_notes').get(pk=self.application.pk)
+        application.refresh_from_db()
+        self.assertFalse(application.has_original('status'))
+        self.assertTrue(application.has_changed('status'))
+        application.refresh_from_db(fields=['status'])
+        self.assertFalse(application.has_changed('status'))
+        self.assertEqual(application.previous_value('status'), 'submitted')
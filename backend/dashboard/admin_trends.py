@@ -3,7 +3,7 @@ from django.contrib import admin
 from django.template.response import TemplateResponse
 from django.utils import timezone
 
-from .views import get_trends_data
+from .stats import get_trends_data
 
 
 METRIC_LABELS = {
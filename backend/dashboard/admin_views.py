@@ -4,14 +4,8 @@
 """
 
 from django.contrib import admin
-from django.db.models import Sum, Count, Q
-from django.utils import timezone
-from datetime import datetime
 
-from accounts.models import User
-from recruitment.models import Position
-from application.models import Application
-from timesheet.models import Timesheet, Salary
+from .stats import get_current_month_stats
 
 
 class CustomAdminSite(admin.AdminSite):
@@ -31,41 +25,26 @@ class CustomAdminSite(admin.AdminSite):
         extra_context = extra_context or {}
         
         try:
-            # 用户统计
-            extra_context['user_count'] = User.objects.count()
-            extra_context['student_count'] = User.objects.filter(
-                userrole__role__role_code='student'
-            ).distinct().count()
-            extra_context['faculty_count'] = User.objects.filter(
-                userrole__role__role_code='faculty'
-            ).distinct().count()
+            # 与 /api/admin/reports/monthly/ 共用统计引擎（每表一次条件聚合，带缓存）
+            stats = get_current_month_stats()
+            extra_context['user_count'] = stats['total_users']
+            extra_context['student_count'] = stats['students']
+            extra_context['faculty_count'] = stats['faculty']
             
             # 岗位统计
-            extra_context['position_count'] = Position.objects.count()
-            extra_context['open_positions'] = Position.objects.filter(status='open').count()
+            extra_context['position_count'] = stats['total_positions']
+            extra_context['open_positions'] = stats['open_positions']
             
-            # 申请统计
-            extra_context['application_count'] = Application.objects.count()
-            # 修复：待审核= submitted/reviewing 两种状态
-            extra_context['pending_applications'] = Application.objects.filter(
-                status__in=['submitted', 'reviewing']
-            ).count()
-            extra_context['accepted_applications'] = Application.objects.filter(
-                status='accepted'
-            ).count()
+            # 申请统计（待审核 = submitted/reviewing 两种状态）
+            extra_context['application_count'] = stats['total_applications']
+            extra_context['pending_applications'] = stats['pending_applications']
+            extra_context['accepted_applications'] = stats['accepted_applications']
             
             # 工时统计
-            extra_context['pending_timesheets'] = Timesheet.objects.filter(
-                status='pending'
-            ).count()
+            extra_context['pending_timesheets'] = stats['pending_timesheets']
             
-            # 本月薪酬统计
-            now = datetime.now()
-            monthly_salary = Salary.objects.filter(
-                timesheet__month__year=now.year,
-                timesheet__month__month=now.month,
-            ).aggregate(total=Sum('amount'))['total'] or 0
-            extra_context['monthly_salary'] = f"{monthly_salary:,.0f}"
+            # 本月薪酬统计（按工时月份）
+            extra_context['monthly_salary'] = f"{stats['work_month_salary_total']:,.0f}"
             
         except Exception as e:
             print(f"统计数据获取失败: {e}")
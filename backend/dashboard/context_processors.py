@@ -3,13 +3,7 @@ Context Processors
 为Admin模板添加全局上下文数据
 """
 
-from django.db.models import Sum, Count
-from datetime import datetime
-
-from accounts.models import User
-from recruitment.models import Position
-from application.models import Application
-from timesheet.models import Timesheet, Salary
+from .stats import get_current_month_stats
 
 
 def admin_stats(request):
@@ -22,32 +16,16 @@ def admin_stats(request):
         return {}
     
     try:
-        # 用户统计
-        user_count = User.objects.count()
-        
-        # 岗位统计
-        position_count = Position.objects.count()
-        
-        # 申请统计
-        application_count = Application.objects.count()
-        # 修复：待审核= submitted/reviewing 两种状态
-        pending_applications = Application.objects.filter(
-            status__in=['submitted', 'reviewing']
-        ).count()
-        
-        # 本月薪酬（按工时月份 timesheet.month 统计）
-        now = datetime.now()
-        monthly_salary = Salary.objects.filter(
-            timesheet__month__year=now.year,
-            timesheet__month__month=now.month,
-        ).aggregate(total=Sum('amount'))['total'] or 0
-        
+        # 与月度报表共用统计引擎（每表一次条件聚合，带缓存）
+        stats = get_current_month_stats()
         return {
-            'user_count': user_count,
-            'position_count': position_count,
-            'application_count': application_count,
-            'pending_applications': pending_applications,
-            'monthly_salary': f"{monthly_salary:,.0f}",
+            'user_count': stats['total_users'],
+            'position_count': stats['total_positions'],
+            'application_count': stats['total_applications'],
+            # 待审核 = submitted/reviewing 两种状态
+            'pending_applications': stats['pending_applications'],
+            # 本月薪酬（按工时月份 timesheet.month 统计）
+            'monthly_salary': f"{stats['work_month_salary_total']:,.0f}",
         }
     except Exception as e:
         print(f"统计数据获取失败: {e}")
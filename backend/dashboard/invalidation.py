@@ -0,0 +1,94 @@
+"""
+学生助教管理平台 - 数据看板缓存失效
+
+按指标维护缓存代数（generation）：
+- 业务数据变更时递增对应指标的代数（信号 + 批量 update 的调用方）；
+  在事务中调用时推迟到提交后递增，否则并发请求可能在提交前按旧数据回源，
+  并以新代数写入缓存，旧数据会一直保留到缓存过期
+- 报表缓存键包含其依赖指标的当前代数，代数变化后旧键自然失效
+- 缓存未命中时通过 cache.add 加锁，只有一个请求回源计算，其余请求等待结果（single-flight）
+
+本模块不依赖任何业务模型，可被各应用直接导入。
+"""
+
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+METRICS = ('users', 'positions', 'applications', 'timesheets', 'salaries')
+
+GENERATION_KEY = 'dashboard:gen:{metric}'
+LOCK_TIMEOUT = 30          # 秒，回源计算锁的最长持有时间
+LOCK_WAIT_TIMEOUT = 5      # 秒，等待其他请求回源结果的最长时间
+LOCK_POLL_INTERVAL = 0.05  # 秒
+
+
+def _initial_generation():
+    # 代数键被淘汰后以时间戳重新起步，避免与仍在缓存中的旧报表键重号
+    return int(time.time() * 1000)
+
+
+def get_generations(metrics=METRICS):
+    """返回 {指标: 当前代数}（1 次 get_many）"""
+    keys = {GENERATION_KEY.format(metric=metric): metric for metric in metrics}
+    found = cache.get_many(list(keys))
+    generations = {}
+    for key, metric in keys.items():
+        value = found.get(key)
+        if value is None:
+            cache.add(key, _initial_generation(), None)
+            value = cache.get(key)
+        generations[metric] = value
+    return generations
+
+
+def _bump_now(metrics):
+    for metric in metrics:
+        key = GENERATION_KEY.format(metric=metric)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, _initial_generation(), None)
+
+
+def bump_generation(*metrics):
+    """递增指标代数，使依赖这些指标的报表缓存失效（在事务中调用时于提交后执行）"""
+    if metrics:
+        transaction.on_commit(lambda: _bump_now(metrics))
+
+
+def versioned_key(prefix, metrics=METRICS):
+    """拼接包含依赖指标代数的缓存键"""
+    generations = get_generations(metrics)
+    suffix = '.'.join(str(generations[metric]) for metric in metrics)
+    return f'{prefix}:g{suffix}'
+
+
+def get_or_compute(cache_key, compute, timeout):
+    """
+    读取缓存；未命中时单飞回源：
+    获得锁的请求计算并写入缓存，其余请求短暂轮询等待，超时后自行计算
+    timeout 为秒数，或接收计算结果、返回秒数的函数（过期时间取决于数据本身时使用）
+    """
+    value = cache.get(cache_key)
+    if value is not None:
+        return value
+
+    lock_key = f'{cache_key}:lock'
+    if cache.add(lock_key, 1, LOCK_TIMEOUT):
+        try:
+            value = compute()
+            cache.set(cache_key, value, timeout(value) if callable(timeout) else timeout)
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    deadline = time.monotonic() + LOCK_WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        value = cache.get(cache_key)
+        if value is not None:
+            return value
+    return compute()
@@ -0,0 +1,33 @@
+"""
+回填月度统计快照：为已结束月份生成 MonthlyStatSnapshot
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from dashboard.snapshots import data_start_month, current_month, iter_months, build_snapshots
+
+
+class Command(BaseCommand):
+    help = '回填已结束月份的月度统计快照（--rebuild 重算已存在的快照）'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='重算已存在的快照'
+        )
+
+    def handle(self, *args, **options):
+        start = data_start_month()
+        if start is None:
+            self.stdout.write(self.style.WARNING('暂无业务数据，无需生成快照'))
+            return
+
+        months = list(iter_months(start, current_month()))
+        with transaction.atomic():
+            snapshots = build_snapshots(months, rebuild=options['rebuild'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ 月度统计快照已就绪：{len(snapshots)} 个月（{start[0]}-{start[1]:02d} 起）'
+        ))
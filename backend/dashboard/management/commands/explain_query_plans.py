@@ -0,0 +1,107 @@
+"""
+列表接口热点查询的执行计划基准：输出每条查询的 EXPLAIN 与耗时
+对比索引调整前后：
+    python manage.py migrate recruitment 0002 && python manage.py migrate application 0002 \\
+        && python manage.py migrate timesheet 0001 && python manage.py migrate notifications 0005
+    python manage.py explain_query_plans --output before.json
+    python manage.py migrate
+    python manage.py explain_query_plans --compare before.json
+"""
+
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from django.utils import timezone
+
+from recruitment.models import Position
+from application.models import Application
+from timesheet.models import Timesheet
+from notifications.models import Notification
+
+
+PAGE = 20
+
+
+def _busiest(queryset, field):
+    """数据量最大的用户/教师，作为查询样本"""
+    return queryset.values(field).annotate(n=Count('pk')).order_by('-n').values_list(field, flat=True).first()
+
+
+def hot_queries():
+    """返回 {名称: QuerySet}，与各列表接口的过滤/排序口径一致"""
+    now = timezone.now()
+    faculty = _busiest(Position.objects.all(), 'posted_by')
+    student = _busiest(Application.objects.all(), 'applicant')
+    ta = _busiest(Timesheet.objects.all(), 'ta')
+    recipient = _busiest(Notification.objects.all(), 'recipient')
+    return {
+        'student_position_catalog': Position.objects.filter_effective_status('open').order_by('-created_at')[:PAGE],
+        'position_status_sweep': Position.objects.filter(status='open', application_deadline__lt=now),
+        'faculty_positions': Position.objects.filter(posted_by=faculty).order_by('-created_at')[:PAGE],
+        'my_applications': Application.objects.filter(applicant=student).order_by('-applied_at')[:PAGE],
+        'faculty_pending_applications': Application.objects.filter(
+            position__posted_by=faculty, status__in=['submitted', 'reviewing']
+        ).order_by('-applied_at')[:PAGE],
+        'my_timesheets': Timesheet.objects.filter(ta=ta).order_by('-month', '-submitted_at')[:PAGE],
+        'faculty_pending_timesheets': Timesheet.objects.filter(
+            position__posted_by=faculty, status='pending'
+        ).order_by('-month', '-submitted_at')[:PAGE],
+        'my_notifications': Notification.objects.filter(recipient=recipient).order_by('-created_at')[:PAGE],
+        'my_unread_notifications': Notification.objects.filter(
+            recipient=recipient, is_read=False
+        ).order_by('-created_at')[:PAGE],
+    }
+
+
+def measure(queryset, repeat):
+    """执行计划与耗时中位数（毫秒）"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        list(queryset.all())
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        'sql': str(queryset.query),
+        'plan': queryset.explain(),
+        'median_ms': round(statistics.median(timings), 3),
+    }
+
+
+class Command(BaseCommand):
+    help = '输出列表接口热点查询的执行计划与耗时（--output 保存结果，--compare 与保存的结果对比）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='每条查询执行次数（取中位数），默认 5')
+        parser.add_argument('--output', help='将结果保存为 JSON 文件')
+        parser.add_argument('--compare', help='与之前保存的 JSON 结果对比')
+
+    def handle(self, *args, **options):
+        results = {
+            name: measure(queryset, max(options['repeat'], 1))
+            for name, queryset in hot_queries().items()
+        }
+        baseline = {}
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as f:
+                baseline = json.load(f)
+
+        for name, result in results.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f'== {name}'))
+            before = baseline.get(name)
+            if before:
+                changed = '计划已变化' if before['plan'] != result['plan'] else '计划未变化'
+                self.stdout.write(f'耗时：{before["median_ms"]} ms → {result["median_ms"]} ms（{changed}）')
+                self.stdout.write('-- 之前：')
+                self.stdout.write(before['plan'])
+                self.stdout.write('-- 现在：')
+            else:
+                self.stdout.write(f'耗时：{result["median_ms"]} ms')
+            self.stdout.write(result['plan'])
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'✅ 已保存 {len(results)} 条查询的执行计划：{options["output"]}'))
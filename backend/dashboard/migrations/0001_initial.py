@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyStatSnapshot',
+            fields=[
+                ('snapshot_id', models.AutoField(primary_key=True, serialize=False, verbose_name='快照ID')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='年份')),
+                ('month', models.PositiveSmallIntegerField(verbose_name='月份')),
+                ('positions_created', models.IntegerField(default=0, verbose_name='新发布岗位数')),
+                ('applications_submitted', models.IntegerField(default=0, verbose_name='新提交申请数')),
+                ('timesheets_submitted', models.IntegerField(default=0, help_text='按提交时间 submitted_at 统计', verbose_name='提交工时表数')),
+                ('timesheets_worked', models.IntegerField(default=0, help_text='按工作月份 month 统计，用于趋势分析', verbose_name='工时表数（按工作月份）')),
+                ('salaries_generated', models.IntegerField(default=0, verbose_name='生成薪酬条数')),
+                ('salaries_paid', models.IntegerField(default=0, verbose_name='已支付薪酬条数')),
+                ('salary_total', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='生成薪酬总额（元）')),
+                ('work_month_salary_total', models.DecimalField(decimal_places=2, default=0, help_text='按工时月份 timesheet.month 统计', max_digits=14, verbose_name='工时月份薪酬总额（元）')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+            ],
+            options={
+                'verbose_name': '月度统计快照',
+                'verbose_name_plural': '月度统计快照',
+                'db_table': 'monthly_stat_snapshot',
+                'ordering': ['year', 'month'],
+                'unique_together': {('year', 'month')},
+            },
+        ),
+    ]
@@ -1,3 +1,89 @@
+"""
+学生助教管理平台 - 数据看板模块模型
+包含：MonthlyStatSnapshot（月度统计快照表）
+"""
+
 from django.db import models
 
-# Create your models here.
+
+class MonthlyStatSnapshot(models.Model):
+    """
+    月度统计快照表 - 已结束月份的按月汇总
+    由 build_monthly_snapshots 命令回填，并由业务信号按月增量刷新
+    """
+
+    snapshot_id = models.AutoField(
+        primary_key=True,
+        verbose_name='快照ID'
+    )
+    year = models.PositiveSmallIntegerField(
+        verbose_name='年份'
+    )
+    month = models.PositiveSmallIntegerField(
+        verbose_name='月份'
+    )
+    positions_created = models.IntegerField(
+        default=0,
+        verbose_name='新发布岗位数'
+    )
+    applications_submitted = models.IntegerField(
+        default=0,
+        verbose_name='新提交申请数'
+    )
+    timesheets_submitted = models.IntegerField(
+        default=0,
+        verbose_name='提交工时表数',
+        help_text='按提交时间 submitted_at 统计'
+    )
+    timesheets_worked = models.IntegerField(
+        default=0,
+        verbose_name='工时表数（按工作月份）',
+        help_text='按工作月份 month 统计，用于趋势分析'
+    )
+    salaries_generated = models.IntegerField(
+        default=0,
+        verbose_name='生成薪酬条数'
+    )
+    salaries_paid = models.IntegerField(
+        default=0,
+        verbose_name='已支付薪酬条数'
+    )
+    salary_total = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name='生成薪酬总额（元）'
+    )
+    work_month_salary_total = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name='工时月份薪酬总额（元）',
+        help_text='按工时月份 timesheet.month 统计'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='更新时间'
+    )
+
+    class Meta:
+        db_table = 'monthly_stat_snapshot'
+        verbose_name = '月度统计快照'
+        verbose_name_plural = '月度统计快照'
+        unique_together = [['year', 'month']]
+        ordering = ['year', 'month']
+
+    def __str__(self):
+        return f'{self.year}年{self.month:02d}月统计快照'
+
+    def as_statistics(self):
+        """转换为月度报表 statistics 中按月统计的字段"""
+        return {
+            'positions_created_this_month': self.positions_created,
+            'applications_submitted_this_month': self.applications_submitted,
+            'timesheets_submitted_this_month': self.timesheets_submitted,
+            'salaries_generated_this_month': self.salaries_generated,
+            'monthly_salary_total': float(self.salary_total),
+            'paid_salary_count_this_month': self.salaries_paid,
+            'work_month_salary_total': float(self.work_month_salary_total),
+        }
@@ -0,0 +1,84 @@
+"""
+学生助教管理平台 - 数据看板模块信号
+包含：业务数据变更时增量刷新已结束月份的统计快照、递增报表缓存代数、使教师/学生/助教看板缓存失效
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from accounts.models import User, UserRole
+from recruitment.models import Position
+from application.models import Application
+from timesheet.models import Timesheet, Salary
+from recruitment.services import (
+    invalidate_faculty_dashboard,
+    invalidate_user_dashboard,
+    position_owner_id,
+)
+
+from .invalidation import bump_generation
+from .snapshots import snapshot_dates, refresh_snapshot
+
+
+SENDER_METRICS = {
+    Position: 'positions',
+    Application: 'applications',
+    Timesheet: 'timesheets',
+    Salary: 'salaries',
+}
+
+
+@receiver([post_save, post_delete], sender=Position)
+@receiver([post_save, post_delete], sender=Application)
+@receiver([post_save, post_delete], sender=Timesheet)
+@receiver([post_save, post_delete], sender=Salary)
+def on_snapshot_source_changed(sender, instance, **kwargs):
+    """
+    岗位/申请/工时/薪酬变更时：
+    - 重算其所在已结束月份的快照指标（当前月份实时统计，无需处理）
+    - 递增对应指标的缓存代数，使相关报表缓存失效
+    """
+    for metric, value_date in snapshot_dates(instance):
+        refresh_snapshot(metric, value_date)
+    bump_generation(SENDER_METRICS[sender])
+
+
+@receiver([post_save, post_delete], sender=Position)
+@receiver([post_save, post_delete], sender=Application)
+@receiver([post_save, post_delete], sender=Timesheet)
+def on_faculty_dashboard_source_changed(sender, instance, **kwargs):
+    """岗位及其申请/工时变更时，使该岗位发布教师的看板缓存失效；岗位改由其他教师发布时原教师一并失效"""
+    faculty_ids = [position_owner_id(instance)]
+    if isinstance(instance, Position) and instance.has_original('posted_by') and instance.has_changed('posted_by'):
+        faculty_ids.append(instance.previous_value('posted_by'))
+    invalidate_faculty_dashboard(*faculty_ids)
+
+
+@receiver([post_save, post_delete], sender=Application)
+@receiver([post_save, post_delete], sender=Timesheet)
+@receiver([post_save, post_delete], sender=Salary)
+def on_user_dashboard_source_changed(sender, instance, **kwargs):
+    """申请/工时/薪酬变更时，使申请人（助教）的学生/助教看板缓存失效"""
+    if isinstance(instance, Application):
+        user_id = instance.applicant_id
+    elif isinstance(instance, Timesheet):
+        user_id = instance.ta_id
+    elif Salary.timesheet.is_cached(instance):
+        user_id = instance.timesheet.ta_id
+    else:
+        user_id = Timesheet.objects.filter(pk=instance.timesheet_id).values_list('ta_id', flat=True).first()
+    invalidate_user_dashboard(user_id)
+
+
+@receiver(post_save, sender=User)
+def on_user_created(sender, instance: User, created: bool, **kwargs):
+    """新用户注册时递增用户统计代数（登录等更新不影响报表）"""
+    if created:
+        bump_generation('users')
+
+
+@receiver(post_delete, sender=User)
+@receiver([post_save, post_delete], sender=UserRole)
+def on_user_roles_changed(sender, instance, **kwargs):
+    """用户删除或角色分配变化时递增用户统计代数"""
+    bump_generation('users')
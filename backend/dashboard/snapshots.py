@@ -0,0 +1,259 @@
+"""
+学生助教管理平台 - 月度统计快照
+
+已结束月份的按月统计不会再频繁变化，物化到 MonthlyStatSnapshot 后，
+月度报表与趋势分析只需实时计算当前月份：
+- 缺失的快照在首次读取时按月分组批量生成（也可用 build_monthly_snapshots 命令回填）
+- 业务数据变更时由 dashboard.signals 按月重算受影响的指标（增量维护）
+"""
+
+from datetime import datetime, date
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Sum, Min, Q
+from django.db.models.functions import ExtractYear, ExtractMonth
+
+from recruitment.models import Position
+from application.models import Application
+from timesheet.models import Timesheet, Salary
+
+from .models import MonthlyStatSnapshot
+
+
+DATA_START_CACHE_KEY = 'dashboard:snapshot:data_start'
+# 尚无业务数据时只短时缓存（写入时也会清除，TTL 兜底绕过信号的写入）
+DATA_START_EMPTY_TTL = 300  # 秒
+
+
+def _sources():
+    """
+    快照数据来源：(指标, 模型, 日期字段, 是否为 DateField, 聚合表达式)
+    同一指标可能按不同日期字段统计多个快照字段
+    """
+    return [
+        ('positions', Position, 'created_at', False, {
+            'positions_created': Count('position_id'),
+        }),
+        ('applications', Application, 'applied_at', False, {
+            'applications_submitted': Count('application_id'),
+        }),
+        ('timesheets', Timesheet, 'submitted_at', False, {
+            'timesheets_submitted': Count('timesheet_id'),
+        }),
+        ('timesheets', Timesheet, 'month', True, {
+            'timesheets_worked': Count('timesheet_id'),
+        }),
+        ('salaries', Salary, 'generated_at', False, {
+            'salaries_generated': Count('salary_id'),
+            'salaries_paid': Count('salary_id', filter=Q(payment_status='paid')),
+            'salary_total': Sum('amount'),
+        }),
+        ('salaries', Salary, 'timesheet__month', True, {
+            'work_month_salary_total': Sum('amount'),
+        }),
+    ]
+
+
+SNAPSHOT_METRICS = ('positions', 'applications', 'timesheets', 'salaries')
+
+
+def current_month():
+    """当前自然月 (year, month)"""
+    now = datetime.now()
+    return now.year, now.month
+
+
+def is_closed_month(year, month):
+    """是否为已结束的月份"""
+    return (year, month) < current_month()
+
+
+def next_month(year, month):
+    """下一个月 (year, month)"""
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def iter_months(start, end):
+    """遍历 [start, end) 区间内的 (year, month)"""
+    year, month = start
+    while (year, month) < end:
+        yield year, month
+        year, month = next_month(year, month)
+
+
+def _range_filter(date_field, is_date, start, end):
+    start_value = datetime(*start, 1)
+    end_value = datetime(*end, 1)
+    if is_date:
+        start_value, end_value = start_value.date(), end_value.date()
+    return {f'{date_field}__gte': start_value, f'{date_field}__lt': end_value}
+
+
+def rollup(start, end, metrics=SNAPSHOT_METRICS):
+    """
+    按月分组统计 [start, end) 区间：每个数据来源一次 GROUP BY 查询
+    返回 {(year, month): {快照字段: 值}}
+    """
+    result = {}
+    for metric, model, date_field, is_date, aggregates in _sources():
+        if metric not in metrics:
+            continue
+        rows = model.objects.filter(
+            **_range_filter(date_field, is_date, start, end)
+        ).annotate(
+            _year=ExtractYear(date_field),
+            _month=ExtractMonth(date_field),
+        ).values('_year', '_month').annotate(**aggregates).order_by()
+        for row in rows:
+            values = result.setdefault((row.pop('_year'), row.pop('_month')), {})
+            values.update({key: value or 0 for key, value in row.items()})
+    return result
+
+
+def _empty_values(metrics=SNAPSHOT_METRICS):
+    values = {}
+    for metric, _model, _field, _is_date, aggregates in _sources():
+        if metric in metrics:
+            values.update({key: 0 for key in aggregates})
+    return values
+
+
+def data_start_month():
+    """最早一条业务数据所在月份；在此之前的月份统计恒为 0，无需物化"""
+    cached = cache.get(DATA_START_CACHE_KEY)
+    if cached is not None:
+        return tuple(cached) if cached else None
+
+    # 各表的时间字段有 date 也有 datetime，按 (年, 月) 比较
+    start = None
+    for _metric, model, date_field, _is_date, _aggregates in _sources():
+        value = model.objects.aggregate(first=Min(date_field))['first']
+        if value is not None and (start is None or (value.year, value.month) < start):
+            start = (value.year, value.month)
+    cache.set(DATA_START_CACHE_KEY, start or (), None if start else DATA_START_EMPTY_TTL)
+    return start
+
+
+def reset_data_start(value_date):
+    """
+    写入数据时，若已缓存的起点为空或晚于写入日期所在月份，清除数据起点缓存
+    （不论写入哪个月份；于事务提交后执行，避免并发请求在提交前按旧数据重新写入）
+    """
+    cached = cache.get(DATA_START_CACHE_KEY)
+    if cached is None:
+        return
+    if not cached or (value_date.year, value_date.month) < tuple(cached):
+        transaction.on_commit(lambda: cache.delete(DATA_START_CACHE_KEY))
+
+
+def build_snapshots(months, rebuild=False):
+    """
+    为给定的已结束月份生成快照（分组查询后批量写入）
+    rebuild=True 时同时重算已存在的快照
+    """
+    months = sorted({m for m in months if is_closed_month(*m)})
+    if not months:
+        return {}
+
+    existing = {
+        (s.year, s.month): s
+        for s in MonthlyStatSnapshot.objects.filter(
+            year__gte=months[0][0], year__lte=months[-1][0]
+        )
+    }
+    targets = [m for m in months if rebuild or m not in existing]
+    if not targets:
+        return {m: existing[m] for m in months}
+
+    values_by_month = rollup(targets[0], next_month(*targets[-1]))
+    to_create, to_update = [], []
+    for key in targets:
+        values = {**_empty_values(), **values_by_month.get(key, {})}
+        snapshot = existing.get(key)
+        if snapshot is None:
+            snapshot = MonthlyStatSnapshot(year=key[0], month=key[1], **values)
+            to_create.append(snapshot)
+            existing[key] = snapshot
+        else:
+            for field, value in values.items():
+                setattr(snapshot, field, value)
+            to_update.append(snapshot)
+
+    if to_create:
+        MonthlyStatSnapshot.objects.bulk_create(to_create, ignore_conflicts=True)
+    if to_update:
+        MonthlyStatSnapshot.objects.bulk_update(to_update, list(_empty_values()))
+    return {m: existing[m] for m in months}
+
+
+def get_snapshots(start, end):
+    """
+    获取 [start, end) 区间内已结束月份的快照 {(year, month): snapshot}
+    早于数据起点的月份不生成快照（视为 0）；缺失的快照按需生成
+    """
+    data_start = data_start_month()
+    if data_start is None:
+        return {}
+    start = max(start, data_start)
+    end = min(end, current_month())
+    months = list(iter_months(start, end))
+    if not months:
+        return {}
+    return build_snapshots(months)
+
+
+def get_snapshot(year, month):
+    """获取单个已结束月份的快照（不存在时生成）"""
+    snapshot = MonthlyStatSnapshot.objects.filter(year=year, month=month).first()
+    if snapshot is None:
+        snapshot = get_snapshots((year, month), next_month(year, month)).get((year, month))
+    return snapshot or MonthlyStatSnapshot(year=year, month=month)
+
+
+def refresh_snapshot(metric, value_date):
+    """
+    增量维护：按需重置数据起点，并重算某指标在 value_date 所在月份的快照字段
+    仅重算已存在快照的已结束月份；不存在的快照会在读取时生成
+    """
+    if value_date is None:
+        return
+    reset_data_start(value_date)
+    key = (value_date.year, value_date.month)
+    if not is_closed_month(*key):
+        return
+    values = {**_empty_values([metric]), **rollup(key, next_month(*key), [metric]).get(key, {})}
+    MonthlyStatSnapshot.objects.filter(year=key[0], month=key[1]).update(**values)
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return None
+
+
+def snapshot_dates(instance):
+    """返回实例影响的 (指标, 日期) 列表，供信号增量刷新使用"""
+    if isinstance(instance, Position):
+        return [('positions', _as_date(instance.created_at))]
+    if isinstance(instance, Application):
+        return [('applications', _as_date(instance.applied_at))]
+    if isinstance(instance, Timesheet):
+        dates = [
+            ('timesheets', _as_date(instance.submitted_at)),
+            ('timesheets', _as_date(instance.month)),
+        ]
+        # 工作月份被修改时，原月份的快照同样需要重算
+        if instance.has_original('month') and instance.has_changed('month'):
+            dates.append(('timesheets', _as_date(instance.previous_value('month'))))
+        return dates
+    if isinstance(instance, Salary):
+        dates = [('salaries', _as_date(instance.generated_at))]
+        timesheet_month = Timesheet.objects.filter(
+            timesheet_id=instance.timesheet_id
+        ).values_list('month', flat=True).first()
+        dates.append(('salaries', timesheet_month))
+        return dates
+    return []
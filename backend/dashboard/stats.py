@@ -0,0 +1,258 @@
+"""
+学生助教管理平台 - 数据看板统计引擎
+
+每张表只执行一次条件聚合查询（Count/Sum + filter=Q(...)），
+月度报表、导出、Admin 首页与 context processor 共用同一套口径。
+已结束月份的按月统计读取 MonthlyStatSnapshot，仅当前月份实时计算。
+"""
+
+from datetime import datetime, timedelta
+
+from django.db.models import Count, Min, Sum, Q
+from django.utils import timezone
+
+from accounts.models import User
+from recruitment.models import Position, effective_open_q, status_change_at
+from application.models import Application
+from timesheet.models import Timesheet, Salary
+
+from .invalidation import versioned_key, get_or_compute
+from .snapshots import current_month, is_closed_month, get_snapshot, get_snapshots, rollup
+
+
+# 报表缓存由指标代数失效（见 invalidation.py），TTL 仅作兜底；
+# 月度报表含随时间变化的开放岗位数，缓存另受下一个岗位到期时间点限制
+MONTHLY_REPORT_CACHE_TTL = 3600  # 秒
+TRENDS_CACHE_TTL = 3600  # 秒
+
+# statistics 输出字段顺序（与导出报表一致）
+STATISTICS_FIELDS = [
+    'total_users', 'students', 'faculty', 'administrators',
+    'positions_created_this_month', 'total_positions', 'open_positions',
+    'applications_submitted_this_month', 'total_applications',
+    'pending_applications', 'accepted_applications',
+    'timesheets_submitted_this_month', 'total_timesheets',
+    'pending_timesheets', 'approved_timesheets',
+    'salaries_generated_this_month', 'monthly_salary_total',
+    'paid_salary_count_this_month', 'total_salary', 'work_month_salary_total',
+]
+
+# 趋势指标 -> (快照计数字段, 快照金额字段)
+TREND_FIELDS = {
+    'positions': ('positions_created', None),
+    'applications': ('applications_submitted', None),
+    'timesheets': ('timesheets_worked', None),
+    'salaries': ('salaries_generated', 'salary_total'),
+}
+
+
+def month_bounds(year, month):
+    """返回 [当月1日, 次月1日) 的 datetime 区间，用于范围过滤（可走索引）"""
+    start = datetime(year, month, 1)
+    if month == 12:
+        end = datetime(year + 1, 1, 1)
+    else:
+        end = datetime(year, month + 1, 1)
+    return start, end
+
+
+def user_statistics():
+    """用户总数与各角色人数（1 次查询）"""
+    return User.objects.aggregate(
+        total_users=Count('user_id', distinct=True),
+        students=Count('user_id', filter=Q(userrole__role__role_code='student'), distinct=True),
+        faculty=Count('user_id', filter=Q(userrole__role__role_code='faculty'), distinct=True),
+        administrators=Count('user_id', filter=Q(userrole__role__role_code='administrator'), distinct=True),
+    )
+
+
+def position_statistics(start=None, end=None):
+    """
+    岗位统计（1 次查询）；未传入月份区间时不统计本月指标
+    next_status_change：开放岗位中最早因时间到期而关闭的时间点（无开放岗位时为 None）
+    """
+    aggregates = {}
+    if start is not None:
+        aggregates['positions_created_this_month'] = Count(
+            'position_id', filter=Q(created_at__gte=start, created_at__lt=end)
+        )
+    open_q = effective_open_q()
+    stats = Position.objects.aggregate(
+        **aggregates,
+        total_positions=Count('position_id'),
+        open_positions=Count('position_id', filter=open_q),
+        next_deadline=Min('application_deadline', filter=open_q),
+        next_end_date=Min('end_date', filter=open_q),
+    )
+    stats['next_status_change'] = status_change_at(stats.pop('next_deadline'), stats.pop('next_end_date'))
+    return stats
+
+
+def application_statistics(start=None, end=None):
+    """申请统计（1 次查询）；未传入月份区间时不统计本月指标"""
+    aggregates = {}
+    if start is not None:
+        aggregates['applications_submitted_this_month'] = Count(
+            'application_id', filter=Q(applied_at__gte=start, applied_at__lt=end)
+        )
+    return Application.objects.aggregate(
+        **aggregates,
+        total_applications=Count('application_id'),
+        pending_applications=Count('application_id', filter=Q(status__in=['submitted', 'reviewing'])),
+        accepted_applications=Count('application_id', filter=Q(status='accepted')),
+    )
+
+
+def timesheet_statistics(start=None, end=None):
+    """工时统计（1 次查询）；未传入月份区间时不统计本月指标"""
+    aggregates = {}
+    if start is not None:
+        aggregates['timesheets_submitted_this_month'] = Count(
+            'timesheet_id', filter=Q(submitted_at__gte=start, submitted_at__lt=end)
+        )
+    return Timesheet.objects.aggregate(
+        **aggregates,
+        total_timesheets=Count('timesheet_id'),
+        pending_timesheets=Count('timesheet_id', filter=Q(status='pending')),
+        approved_timesheets=Count('timesheet_id', filter=Q(status='approved')),
+    )
+
+
+def salary_statistics(start=None, end=None):
+    """
+    薪酬统计（1 次查询）；未传入月份区间时不统计本月指标
+    - *_this_month：按薪酬生成时间 generated_at 统计
+    - work_month_salary_total：按工时月份 timesheet.month 统计（Admin 首页口径）
+    """
+    aggregates = {}
+    if start is not None:
+        generated = Q(generated_at__gte=start, generated_at__lt=end)
+        aggregates.update(
+            salaries_generated_this_month=Count('salary_id', filter=generated),
+            monthly_salary_total=Sum('amount', filter=generated),
+            paid_salary_count_this_month=Count('salary_id', filter=generated & Q(payment_status='paid')),
+            work_month_salary_total=Sum(
+                'amount', filter=Q(timesheet__month__gte=start.date(), timesheet__month__lt=end.date())
+            ),
+        )
+    stats = Salary.objects.aggregate(**aggregates, total_salary=Sum('amount'))
+    for key in ('monthly_salary_total', 'total_salary', 'work_month_salary_total'):
+        if key in stats:
+            stats[key] = float(stats[key] or 0)
+    return stats
+
+
+def compute_monthly_statistics(year, month):
+    """
+    按年月计算全部统计指标，返回 (统计字典, 下一个岗位到期时间点)
+    - 当前及未来月份：每张表 1 次查询，共 5 次
+    - 已结束月份：本月指标读取快照，另外只实时统计累计值
+    """
+    statistics = {}
+    statistics.update(user_statistics())
+    if is_closed_month(year, month):
+        statistics.update(get_snapshot(year, month).as_statistics())
+        start = end = None
+    else:
+        start, end = month_bounds(year, month)
+    statistics.update(position_statistics(start, end))
+    statistics.update(application_statistics(start, end))
+    statistics.update(timesheet_statistics(start, end))
+    statistics.update(salary_statistics(start, end))
+    return {key: statistics[key] for key in STATISTICS_FIELDS}, statistics['next_status_change']
+
+
+def _monthly_stats_timeout(result):
+    """有开放岗位时，缓存不超过最早的到期时间点（到期后开放岗位数随之变化，而代数不会递增）"""
+    _data, next_change = result
+    if next_change is None:
+        return MONTHLY_REPORT_CACHE_TTL
+    remaining = (next_change - timezone.now()).total_seconds()
+    return max(1, min(MONTHLY_REPORT_CACHE_TTL, int(remaining)))
+
+
+def get_monthly_stats(year, month):
+    """公共：按年月计算统计，返回 period + statistics 字典。"""
+    def compute():
+        start, end = month_bounds(year, month)
+        statistics, next_change = compute_monthly_statistics(year, month)
+        data = {
+            'period': {
+                'year': year,
+                'month': month,
+                'start_date': start.date().isoformat(),
+                'end_date': (end - timedelta(days=1)).date().isoformat(),
+            },
+            'statistics': statistics,
+        }
+        return data, next_change
+
+    cache_key = versioned_key(f'dashboard:monthly_stats:{year}:{month}')
+    data, _next_change = get_or_compute(cache_key, compute, _monthly_stats_timeout)
+    return data
+
+
+def get_current_month_stats():
+    """当前自然月的统计（Admin 首页与 context processor 使用）"""
+    now = datetime.now()
+    return get_monthly_stats(now.year, now.month)['statistics']
+
+
+def _trend_row(year, month, count, total, metric):
+    row = {'year': year}
+    if month is not None:
+        row['month'] = month
+    row['count'] = count
+    if metric == 'salaries':
+        row['total'] = float(total or 0)
+    return row
+
+
+def get_trends_data(metric, group_by, start_year, end_year):
+    """
+    公共：按指标与时间维度聚合趋势数据
+    metric: positions|applications|timesheets|salaries
+    group_by: month|year
+    已结束月份读取快照，当前月份起实时分组统计；无数据的月份不输出
+    """
+    if metric not in TREND_FIELDS:
+        raise ValueError('metric_invalid')
+
+    cache_key = versioned_key(f'dashboard:trends:{metric}:{group_by}:{start_year}:{end_year}', [metric])
+    return get_or_compute(
+        cache_key,
+        lambda: _compute_trends(metric, group_by, start_year, end_year),
+        TRENDS_CACHE_TTL,
+    )
+
+
+def _compute_trends(metric, group_by, start_year, end_year):
+    count_field, total_field = TREND_FIELDS[metric]
+    start, end = (start_year, 1), (end_year + 1, 1)
+
+    monthly = {}
+    for key, snapshot in get_snapshots(start, end).items():
+        monthly[key] = (
+            getattr(snapshot, count_field),
+            getattr(snapshot, total_field) if total_field else None,
+        )
+    live_start = max(start, current_month())
+    if live_start < end:
+        for key, values in rollup(live_start, end, [metric]).items():
+            monthly[key] = (values.get(count_field, 0), values.get(total_field) if total_field else None)
+
+    result = []
+    if group_by == 'year':
+        yearly = {}
+        for (year, _month), (count, total) in sorted(monthly.items()):
+            if not count:
+                continue
+            year_count, year_total = yearly.get(year, (0, 0))
+            yearly[year] = (year_count + count, year_total + (total or 0))
+        for year, (count, total) in yearly.items():
+            result.append(_trend_row(year, None, count, total, metric))
+    else:
+        for (year, month), (count, total) in sorted(monthly.items()):
+            if count:
+                result.append(_trend_row(year, month, count, total, metric))
+    return result
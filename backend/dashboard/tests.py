@@ -1,3 +1,268 @@
+import json
+import os
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import transaction
 from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import User
+from recruitment.models import Position
+from timesheet.models import Timesheet
+from .management.commands.explain_query_plans import hot_queries
+from .invalidation import get_generations, versioned_key
+from .models import MonthlyStatSnapshot
+from .snapshots import current_month, data_start_month, get_snapshots, next_month
+from .stats import MONTHLY_REPORT_CACHE_TTL, get_monthly_stats, get_trends_data
+
+
+def months_ago(count):
+    """count 个月前的 (year, month)"""
+    year, month = current_month()
+    month -= count
+    while month < 1:
+        year, month = year - 1, month + 12
+    return year, month
+
+
+def create_position(faculty, index):
+    now = timezone.now()
+    return Position.objects.create(
+        title=f'数据结构助教{index}', course_name='数据结构', course_code=f'CS{index:03d}',
+        description='批改作业', requirements='成绩优良', num_positions=2,
+        work_hours_per_week=6, hourly_rate=Decimal('30.00'),
+        start_date=now.date(), end_date=now.date() + timedelta(days=90),
+        application_deadline=now + timedelta(days=14), posted_by=faculty,
+    )
+
+
+class MonthlySnapshotTest(TestCase):
+    """月度快照：数据来源同时有 date（工作月份）与 datetime（创建/提交时间）字段"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.faculty = User.objects.create_user(
+            'faculty0', 'faculty0@example.com', 'pass12345', user_id='F00000', real_name='教师0'
+        )
+        cls.ta = User.objects.create_user(
+            'student0', 'student0@example.com', 'pass12345', user_id='S00000', real_name='学生0'
+        )
+        cls.position = create_position(cls.faculty, 0)
+
+    def setUp(self):
+        cache.clear()
+
+    def create_timesheet(self, year, month):
+        return Timesheet.objects.create(
+            ta=self.ta, position=self.position, month=date(year, month, 1),
+            hours_worked=Decimal('10.00'), work_description='答疑'
+        )
+
+    def worked(self, year, month):
+        snapshot = MonthlyStatSnapshot.objects.get(year=year, month=month)
+        return snapshot.timesheets_worked
+
+    def test_snapshots_over_mixed_date_and_datetime_sources(self):
+        # 岗位按 created_at（datetime，本月）统计，工时按 month（date，三个月前）统计
+        start = months_ago(3)
+        self.create_timesheet(*start)
+
+        self.assertEqual(data_start_month(), start)
+        snapshots = get_snapshots(start, current_month())
+        self.assertEqual(sorted(snapshots), [start, months_ago(2), months_ago(1)])
+        self.assertEqual(snapshots[start].timesheets_worked, 1)
+        self.assertEqual(snapshots[start].positions_created, 0)
+        self.assertEqual(snapshots[months_ago(1)].timesheets_worked, 0)
+
+    def test_moving_timesheet_month_refreshes_both_months(self):
+        old, new = months_ago(3), months_ago(2)
+        timesheet = self.create_timesheet(*old)
+        get_snapshots(old, current_month())
+        self.assertEqual(self.worked(*old), 1)
+
+        timesheet.month = date(*new, 1)
+        timesheet.save()
+        self.assertEqual(self.worked(*old), 0)
+        self.assertEqual(self.worked(*new), 1)
+        self.assertEqual(self.worked(*next_month(*new)), 0)
+
+
+def month_later():
+    """替换 dashboard.snapshots.datetime，使“当前月份”变为下一个月"""
+    moment = datetime(*next_month(*current_month()), 1, 12)
+
+    class NextMonthDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return moment
+
+    return mock.patch('dashboard.snapshots.datetime', NextMonthDatetime)
+
+
+class DataStartCacheTest(TestCase):
+    """数据起点缓存：空库时的空起点不会长期缓存，任何月份的写入都会清除过晚的起点"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.faculty = User.objects.create_user(
+            'faculty0', 'faculty0@example.com', 'pass12345', user_id='F00000', real_name='教师0'
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_current_month_write_on_empty_db_survives_month_rollover(self):
+        year, month = current_month()
+        # 空库时读取报表，数据起点缓存为空
+        self.assertEqual(get_monthly_stats(year, month)['statistics']['positions_created_this_month'], 0)
+        self.assertIsNone(data_start_month())
+
+        # 当前月份写入数据（不触发已结束月份的快照刷新）
+        with self.captureOnCommitCallbacks(execute=True):
+            create_position(self.faculty, 0)
+
+        # 跨月后本月成为已结束月份，读取快照
+        with month_later():
+            self.assertEqual(data_start_month(), (year, month))
+            statistics = get_monthly_stats(year, month)['statistics']
+            self.assertEqual(statistics['positions_created_this_month'], 1)
+            trend = get_trends_data('positions', 'month', year, year + 1)
+            self.assertIn({'year': year, 'month': month, 'count': 1}, trend)
+
+    def test_empty_start_is_not_cached_forever(self):
+        with mock.patch.object(cache, 'set', wraps=cache.set) as cache_set:
+            self.assertIsNone(data_start_month())
+        _key, value, timeout = cache_set.call_args.args
+        self.assertEqual(value, ())
+        self.assertIsNotNone(timeout)
+
+    def test_earlier_write_resets_cached_start_after_commit(self):
+        create_position(self.faculty, 0)
+        self.assertEqual(data_start_month(), current_month())
+
+        earlier = months_ago(2)
+        with self.captureOnCommitCallbacks(execute=True):
+            Timesheet.objects.create(
+                ta=self.faculty, position=Position.objects.get(), month=date(*earlier, 1),
+                hours_worked=Decimal('10.00'), work_description='答疑'
+            )
+            # 提交前缓存仍在
+            self.assertEqual(data_start_month(), current_month())
+        self.assertEqual(data_start_month(), earlier)
+
+
+class GenerationInvalidationTest(TestCase):
+    """缓存代数在事务提交后递增：提交前按旧数据写入的缓存不会在提交后被读到"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.faculty = User.objects.create_user(
+            'faculty0', 'faculty0@example.com', 'pass12345', user_id='F00000', real_name='教师0'
+        )
+        create_position(cls.faculty, 0)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_generation_bumped_on_commit_only(self):
+        before = get_generations(['positions'])['positions']
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                create_position(self.faculty, 1)
+                self.assertEqual(get_generations(['positions'])['positions'], before)
+        self.assertGreater(get_generations(['positions'])['positions'], before)
+
+    def test_report_cached_before_commit_is_not_served_after_commit(self):
+        year, month = current_month()
+        stale = get_monthly_stats(year, month)
+        self.assertEqual(stale['statistics']['total_positions'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                create_position(self.faculty, 1)
+                # 并发请求在提交前按旧数据回源，并写入此刻的代数键
+                cache.set(versioned_key(f'dashboard:monthly_stats:{year}:{month}'), (stale, None))
+
+        fresh = get_monthly_stats(year, month)
+        self.assertEqual(fresh['statistics']['total_positions'], 2)
+
+
+class MonthlyReportExpiryTest(TestCase):
+    """月度报表中的开放岗位数随岗位到期变化：缓存不跨越下一个到期时间点"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.faculty = User.objects.create_user(
+            'faculty0', 'faculty0@example.com', 'pass12345', user_id='F00000', real_name='教师0'
+        )
+        create_position(cls.faculty, 0)
+        cls.expiring = create_position(cls.faculty, 1)
+        Position.objects.filter(pk=cls.expiring.pk).update(
+            application_deadline=timezone.now() + timedelta(minutes=2)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def open_positions(self):
+        return get_monthly_stats(*current_month())['statistics']['open_positions']
+
+    def test_open_positions_refreshed_after_deadline(self):
+        self.assertEqual(self.open_positions(), 2)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.open_positions(), 2)
+
+        # 截止时间已过：没有任何写入，也没有清扫任务运行
+        later = timedelta(minutes=3)
+        with mock.patch('django.utils.timezone.now', return_value=timezone.now() + later), \
+                mock.patch('time.time', return_value=time.time() + later.total_seconds()):
+            self.assertEqual(self.open_positions(), 1)
+
+    def test_timeout_without_open_positions(self):
+        Position.objects.update(status='closed')
+        with mock.patch.object(cache, 'set', wraps=cache.set) as cache_set:
+            self.assertEqual(self.open_positions(), 0)
+        timeouts = [
+            call.args[2] for call in cache_set.call_args_list if call.args[0].startswith('dashboard:monthly_stats:')
+        ]
+        self.assertEqual(timeouts, [MONTHLY_REPORT_CACHE_TTL])
+
+
+class ExplainQueryPlansCommandTest(TestCase):
+    """explain_query_plans 在 SQLite 上可运行：输出每条热点查询的计划，--output/--compare 往返一致"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.faculty = User.objects.create_user(
+            'faculty0', 'faculty0@example.com', 'pass12345', user_id='F00000', real_name='教师0'
+        )
+        create_position(cls.faculty, 0)
+
+    def run_command(self, *args):
+        out = StringIO()
+        call_command('explain_query_plans', '--repeat', '1', *args, stdout=out)
+        return out.getvalue()
+
+    def test_outputs_plan_for_each_hot_query(self):
+        output = self.run_command()
+        for name in hot_queries():
+            self.assertIn(f'== {name}', output)
+
+    def test_output_then_compare(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'before.json')
+            self.run_command('--output', path)
+            with open(path, encoding='utf-8') as f:
+                saved = json.load(f)
+            self.assertEqual(set(saved), set(hot_queries()))
+            self.assertTrue(all(result['plan'] for result in saved.values()))
 
-# Create your tests here.
+            output = self.run_command('--compare', path)
+        self.assertEqual(output.count('计划未变化'), len(saved))
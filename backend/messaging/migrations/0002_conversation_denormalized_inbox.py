@@ -0,0 +1,56 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_inbox_state(apps, schema_editor):
+    """按现有消息回填最近消息与双方未读数"""
+    Conversation = apps.get_model('messaging', 'Conversation')
+    Message = apps.get_model('messaging', 'Message')
+    conversations = []
+    for conv in Conversation.objects.all().iterator():
+        messages = Message.objects.filter(conversation_id=conv.pk)
+        last = messages.order_by('-created_at', '-message_id').first()
+        conv.last_message_id = last.pk if last else None
+        conv.last_message_at = last.created_at if last else None
+        unread = messages.filter(is_read=False)
+        conv.teacher_unread = unread.exclude(sender_id=conv.teacher_id).count()
+        conv.student_unread = unread.exclude(sender_id=conv.student_id).count()
+        conversations.append(conv)
+    Conversation.objects.bulk_update(
+        conversations,
+        ['last_message', 'last_message_at', 'teacher_unread', 'student_unread'],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='messaging.message', verbose_name='最近消息'),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='最近消息时间'),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='student_unread',
+            field=models.IntegerField(default=0, verbose_name='学生未读数'),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='teacher_unread',
+            field=models.IntegerField(default=0, verbose_name='教师未读数'),
+        ),
+        migrations.RunPython(backfill_inbox_state, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0002_conversation_denormalized_inbox'),
+    ]
+
+    operations = [
+        # 先建复合索引再删旧索引（MySQL 外键列需始终有可用索引）
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', 'created_at'], name='message_convers_5aa82f_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='message',
+            name='message_convers_eb8893_idx',
+        ),
+    ]
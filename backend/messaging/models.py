@@ -33,6 +33,18 @@ class Conversation(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+    # 冗余字段：发送消息时以 F 表达式原子维护，会话列表无需再查询 message 表
+    last_message = models.ForeignKey(
+        'Message',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='最近消息'
+    )
+    last_message_at = models.DateTimeField(null=True, blank=True, verbose_name='最近消息时间')
+    teacher_unread = models.IntegerField(default=0, verbose_name='教师未读数')
+    student_unread = models.IntegerField(default=0, verbose_name='学生未读数')
 
     class Meta:
         db_table = 'conversation'
@@ -49,6 +61,20 @@ class Conversation(models.Model):
     def __str__(self):
         return f'{self.teacher.real_name} - {self.student.real_name}'
 
+    def unread_field_for(self, user_id):
+        """user 作为接收方时对应的未读计数字段"""
+        return 'teacher_unread' if user_id == self.teacher_id else 'student_unread'
+
+    def unread_count_for(self, user_id):
+        """user 在该会话中的未读消息数"""
+        return getattr(self, self.unread_field_for(user_id))
+
+
+class MessageQuerySet(models.QuerySet):
+    def unread_for(self, conversation, user_id):
+        """会话中 user 尚未读的消息（对方发送且未读），命中 (conversation, is_read, sender) 索引"""
+        return self.filter(conversation=conversation, is_read=False).exclude(sender_id=user_id)
+
 
 class Message(models.Model):
     """消息表"""
@@ -70,13 +96,18 @@ class Message(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='发送时间')
     read_at = models.DateTimeField(null=True, blank=True, verbose_name='已读时间')
 
+    objects = MessageQuerySet.as_manager()
+
     class Meta:
         db_table = 'message'
         verbose_name = '消息'
         verbose_name_plural = '消息'
         ordering = ['created_at']
         indexes = [
-            models.Index(fields=['conversation']),
+            # 消息列表键集分页：按会话定位后沿 created_at 扫描（InnoDB 二级索引隐含主键 message_id）
+            models.Index(fields=['conversation', 'created_at']),
+            # 已读回执批量 UPDATE 与未读数统计只走索引
+            models.Index(fields=['conversation', 'is_read', 'sender']),
             models.Index(fields=['created_at']),
         ]
 
@@ -0,0 +1,105 @@
+"""
+学生助教管理平台 - 聊天消息游标分页
+
+消息列表按 (created_at, message_id) 键集分页，不做 COUNT(*)、不使用 OFFSET，
+任意深度的历史页与首页代价相同（走 (conversation, created_at) 复合索引）：
+- 无游标：最新一页
+- ?before=<游标>：早于游标的一页（向上滚动加载历史）
+- ?after=<游标>：晚于游标的一页（轮询增量拉取新消息）
+每页结果统一按时间正序返回
+"""
+
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+
+def encode_cursor(message):
+    """(created_at, message_id) -> 不透明游标字符串"""
+    raw = f'{message.created_at.isoformat()}|{message.message_id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """游标字符串 -> (created_at, message_id)，格式非法时返回 None"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, message_id = base64.urlsafe_b64decode(padded.encode()).decode().rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(message_id)
+    except (ValueError, TypeError, UnicodeDecodeError, binascii.Error):
+        return None
+
+
+class MessageCursorPagination(BasePagination):
+    """聊天消息键集分页"""
+    page_size = 30
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    before_query_param = 'before'
+    after_query_param = 'after'
+    invalid_cursor_message = '无效的游标'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def _decode(self, request, param):
+        value = request.query_params.get(param)
+        if not value:
+            return None
+        position = decode_cursor(value)
+        if position is None:
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        before = self._decode(request, self.before_query_param)
+        after = self._decode(request, self.after_query_param)
+        self.request_after = request.query_params.get(self.after_query_param) or None
+        self.direction = 'after' if after and not before else 'before'
+
+        if self.direction == 'after':
+            created_at, message_id = after
+            queryset = queryset.filter(
+                Q(created_at__gt=created_at) | Q(created_at=created_at, message_id__gt=message_id)
+            ).order_by('created_at', 'message_id')
+        else:
+            if before:
+                created_at, message_id = before
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, message_id__lt=message_id)
+                )
+            queryset = queryset.order_by('-created_at', '-message_id')
+
+        # 多取一条用于判断是否还有下一页
+        rows = list(queryset[:page_size + 1])
+        self.has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if self.direction == 'before':
+            rows.reverse()
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        page = self.page
+        if self.direction == 'after':
+            # 增量拉取时 before_cursor 仅用于定位，本页之前必然还有消息
+            before_cursor = encode_cursor(page[0]) if page else None
+        else:
+            before_cursor = encode_cursor(page[0]) if page and self.has_more else None
+        after_cursor = encode_cursor(page[-1]) if page else self.request_after
+        return Response({
+            'before_cursor': before_cursor,
+            'after_cursor': after_cursor,
+            'has_more': self.has_more,
+            'results': data,
+        })
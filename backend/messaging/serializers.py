@@ -25,14 +25,15 @@ class ConversationListSerializer(serializers.ModelSerializer):
         return obj.position.title if obj.position else None
 
     def get_last_message(self, obj):
-        last = obj.messages.order_by('-created_at').first()
+        # 读取会话上的冗余字段（列表查询 select_related('last_message')）
+        last = obj.last_message
         if not last:
             return None
         return {'content': last.content[:50], 'created_at': last.created_at, 'sender_id': last.sender_id}
 
     def get_unread_count(self, obj):
         user = self.context.get('request').user
-        return obj.messages.filter(is_read=False).exclude(sender=user).count()
+        return obj.unread_count_for(user.pk)
 
 
 class MessageSerializer(serializers.ModelSerializer):
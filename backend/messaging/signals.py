@@ -1,10 +1,11 @@
 """
-新聊天消息 -> 为会话对方创建站内通知（与 notifications 模块联动）
+新聊天消息 -> 为会话对方创建站内通知（与 notifications 模块联动），并推送实时事件
 """
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
 from notifications.models import Notification
+from notifications.events import publish_event
 
 from .models import Message
 
@@ -37,3 +38,16 @@ def notify_recipient_on_new_message(sender, instance: Message, created: bool, **
     except Exception:
         # 聊天消息已落库，通知失败不应阻断发送流程
         pass
+
+
+@receiver(post_save, sender=Message)
+def push_new_message(sender, instance: Message, created: bool, **kwargs):
+    """事务提交后推送给会话双方（发送方的其他标签页同步显示）"""
+    if not created:
+        return
+    conv = instance.conversation
+    publish_event([conv.teacher_id, conv.student_id], 'message', {
+        'conversation_id': conv.conversation_id,
+        'message_id': instance.message_id,
+        'sender': instance.sender_id,
+    })
@@ -0,0 +1,179 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from TeachingAssistant.testing import DashboardTestMixin
+from .models import Conversation, Message
+
+
+class ChatTestMixin:
+    """聊天测试数据：一位教师与两位学生各一个会话"""
+
+    @classmethod
+    def create_user(cls, username, user_id):
+        return User.objects.create_user(
+            username, f'{username}@example.com', 'pass12345', user_id=user_id, real_name=username
+        )
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = cls.create_user('faculty0', 'F00000')
+        cls.student = cls.create_user('student0', 'S00000')
+        cls.other_student = cls.create_user('student1', 'S00001')
+        cls.conversation = Conversation.objects.create(teacher=cls.teacher, student=cls.student)
+        cls.other_conversation = Conversation.objects.create(teacher=cls.teacher, student=cls.other_student)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def send(self, user, content, conversation=None):
+        conversation = conversation or self.conversation
+        self.client.force_authenticate(user)
+        response = self.client.post(
+            f'/api/chat/conversations/{conversation.pk}/send/', {'content': content}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.data['message_id']
+
+
+class MarkConversationReadTest(ChatTestMixin, TestCase):
+    """已读回执：只标记对方发来的、不晚于 message_id 的消息，并回写剩余未读数"""
+
+    def mark_read(self, user, body, conversation=None):
+        conversation = conversation or self.conversation
+        self.client.force_authenticate(user)
+        return self.client.post(f'/api/chat/conversations/{conversation.pk}/read/', body, format='json')
+
+    def test_marks_messages_up_to_message_id(self):
+        ids = [self.send(self.teacher, f'消息{index}') for index in range(3)]
+        self.send(self.student, '收到')
+
+        response = self.mark_read(self.student, {'message_id': ids[1]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated_count'], 2)
+        self.assertEqual(response.data['unread_count'], 1)
+        self.assertEqual(
+            list(Message.objects.filter(is_read=True).order_by('message_id').values_list('message_id', flat=True)),
+            ids[:2],
+        )
+        self.conversation.refresh_from_db()
+        self.assertEqual(self.conversation.student_unread, 1)
+        # 自己发送的消息不影响对方的未读数
+        self.assertEqual(self.conversation.teacher_unread, 1)
+
+    def test_without_message_id_marks_all(self):
+        for index in range(3):
+            self.send(self.teacher, f'消息{index}')
+        response = self.mark_read(self.student, {})
+        self.assertEqual(response.data['updated_count'], 3)
+        self.assertEqual(response.data['unread_count'], 0)
+        self.conversation.refresh_from_db()
+        self.assertEqual(self.conversation.student_unread, 0)
+
+    def test_rejects_message_from_another_conversation(self):
+        self.send(self.teacher, '消息')
+        foreign_id = self.send(self.teacher, '其他会话', self.other_conversation)
+
+        response = self.mark_read(self.student, {'message_id': foreign_id})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Message.objects.filter(is_read=True).exists())
+        self.conversation.refresh_from_db()
+        self.assertEqual(self.conversation.student_unread, 1)
+
+    def test_rejects_invalid_message_id_and_outsiders(self):
+        message_id = self.send(self.teacher, '消息')
+        self.assertEqual(self.mark_read(self.student, {'message_id': 'abc'}).status_code, 400)
+        self.assertEqual(self.mark_read(self.other_student, {'message_id': message_id}).status_code, 403)
+
+
+class MessageCursorPaginationTest(ChatTestMixin, TestCase):
+    """消息游标分页：(created_at, message_id) 键集，同一时刻的消息也不重复、不遗漏"""
+
+    def setUp(self):
+        super().setUp()
+        # 5 条消息，其中后 4 条 created_at 完全相同，只能靠 message_id 区分先后
+        self.ids = [self.send(self.teacher, f'消息{index}') for index in range(5)]
+        first = Message.objects.get(pk=self.ids[0]).created_at
+        Message.objects.filter(pk__in=self.ids[1:]).update(created_at=first + timedelta(seconds=1))
+        self.client.force_authenticate(self.student)
+
+    def get_page(self, **params):
+        return self.client.get(f'/api/chat/conversations/{self.conversation.pk}/messages/', params)
+
+    def page_ids(self, response):
+        self.assertEqual(response.status_code, 200)
+        return [row['message_id'] for row in response.data['results']]
+
+    def test_before_cursor_walks_history_across_equal_timestamps(self):
+        latest = self.get_page(page_size=2)
+        self.assertEqual(self.page_ids(latest), self.ids[3:])
+        self.assertTrue(latest.data['has_more'])
+
+        older = self.get_page(page_size=2, before=latest.data['before_cursor'])
+        self.assertEqual(self.page_ids(older), self.ids[1:3])
+
+        oldest = self.get_page(page_size=2, before=older.data['before_cursor'])
+        self.assertEqual(self.page_ids(oldest), self.ids[:1])
+        self.assertFalse(oldest.data['has_more'])
+        self.assertIsNone(oldest.data['before_cursor'])
+
+    def test_after_cursor_pulls_new_messages_with_equal_timestamps(self):
+        oldest = self.get_page(page_size=2, before=self.get_page(page_size=3).data['before_cursor'])
+        self.assertEqual(self.page_ids(oldest), self.ids[:2])
+
+        newer = self.get_page(page_size=2, after=oldest.data['after_cursor'])
+        self.assertEqual(self.page_ids(newer), self.ids[2:4])
+        self.assertTrue(newer.data['has_more'])
+
+        newest = self.get_page(page_size=2, after=newer.data['after_cursor'])
+        self.assertEqual(self.page_ids(newest), self.ids[4:])
+        self.assertFalse(newest.data['has_more'])
+
+        # 没有新消息时沿用请求的游标，便于客户端继续轮询
+        empty = self.get_page(after=newest.data['after_cursor'])
+        self.assertEqual(self.page_ids(empty), [])
+        self.assertEqual(empty.data['after_cursor'], newest.data['after_cursor'])
+
+    def test_malformed_cursor_returns_404(self):
+        for cursor in ['not-a-cursor', 'bWlzc2luZy1zZXBhcmF0b3I', '%%%']:
+            self.assertEqual(self.get_page(before=cursor).status_code, 404)
+            self.assertEqual(self.get_page(after=cursor).status_code, 404)
+
+
+class ConversationListQueryCountTest(ChatTestMixin, TestCase):
+    """会话列表：对方姓名、岗位、最近消息、未读数均来自同一查询，查询数不随会话数增长"""
+
+    # 分页 COUNT + 会话列表（关联教师、学生、岗位、最近消息）
+    EXPECTED_QUERIES = 2
+
+    def add_conversations(self, start, count):
+        for index in range(start, start + count):
+            student = self.create_user(f'student{index}', f'S{index:05d}')
+            position = DashboardTestMixin.create_position(self.teacher, index)
+            conversation = Conversation.objects.create(teacher=self.teacher, student=student, position=position)
+            self.send(student, f'老师好{index}', conversation)
+
+    def get_conversations(self):
+        self.client.force_authenticate(self.teacher)
+        response = self.client.get('/api/chat/conversations/')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_query_count_fixed_as_conversations_grow(self):
+        self.add_conversations(10, 2)
+        with self.assertNumQueries(self.EXPECTED_QUERIES):
+            small = self.get_conversations()
+        self.assertEqual(small['count'], 4)
+
+        self.add_conversations(12, 8)
+        with self.assertNumQueries(self.EXPECTED_QUERIES):
+            large = self.get_conversations()
+        self.assertEqual(large['count'], 12)
+
+        row = large['results'][0]
+        self.assertEqual(row['other_name'], 'student19')
+        self.assertEqual(row['position_title'], '数据结构助教19')
+        self.assertEqual(row['last_message']['content'], '老师好19')
+        self.assertEqual(row['unread_count'], 1)
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import ConversationList, StartConversation, MessageList, SendMessage
+from .views import ConversationList, StartConversation, MessageList, SendMessage, MarkConversationRead
 
 app_name = 'messaging'
 
@@ -8,4 +8,5 @@ urlpatterns = [
     path('start/', StartConversation.as_view(), name='start-conversation'),
     path('conversations/<int:conversation_id>/messages/', MessageList.as_view(), name='message-list'),
     path('conversations/<int:conversation_id>/send/', SendMessage.as_view(), name='send-message'),
+    path('conversations/<int:conversation_id>/read/', MarkConversationRead.as_view(), name='mark-conversation-read'),
 ]
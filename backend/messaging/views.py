@@ -2,6 +2,7 @@
 师生聊天 API
 - GET/POST /api/chat/conversations/  列表、发起会话
 - GET/POST /api/chat/conversations/<id>/messages/  消息列表、发送
+- POST /api/chat/conversations/<id>/read/  标记已读
 """
 from rest_framework import permissions
 from rest_framework.views import APIView
@@ -9,15 +10,25 @@ from rest_framework.response import Response
 from rest_framework.generics import ListAPIView
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 
 from .models import Conversation, Message
 from .serializers import ConversationListSerializer, MessageSerializer, SendMessageSerializer
+from .pagination import MessageCursorPagination
 from recruitment.models import Position
 from application.models import Application
 from timesheet.models import Timesheet
 
 
+def lock_conversation(conversation_id):
+    """
+    锁定会话行（须在事务内调用）
+    发送消息与标记已读都先锁会话、再写 message 表，加锁顺序一致，避免 MySQL 上相互死锁
+    """
+    list(Conversation.objects.select_for_update().filter(pk=conversation_id).values_list('pk', flat=True))
+
+
 class ConversationList(ListAPIView):
     """GET /api/chat/conversations/  当前用户参与的会话列表"""
     permission_classes = [permissions.IsAuthenticated]
@@ -26,7 +37,7 @@ class ConversationList(ListAPIView):
     def get_queryset(self):
         return Conversation.objects.filter(
             models.Q(teacher=self.request.user) | models.Q(student=self.request.user)
-        ).select_related('teacher', 'student', 'position').order_by('-updated_at')
+        ).select_related('teacher', 'student', 'position', 'last_message').order_by('-updated_at')
 
 
 class StartConversation(APIView):
@@ -69,28 +80,31 @@ class StartConversation(APIView):
         else:
             return Response({'detail': '请提供 position_id、application_id 或 timesheet_id'}, status=400)
 
-        conv, _ = Conversation.objects.get_or_create(
+        conv, _ = Conversation.objects.select_related('last_message').get_or_create(
             teacher=teacher,
             student=student,
             position=position,
             defaults={}
         )
-        conv.save()  # 更新 updated_at
         serializer = ConversationListSerializer(conv, context={'request': request})
         return Response(serializer.data, status=201)
 
 
 class MessageList(ListAPIView):
-    """GET /api/chat/conversations/<conversation_id>/messages/"""
+    """
+    GET /api/chat/conversations/<conversation_id>/messages/
+    游标分页：无参数返回最新一页，?before= 加载更早消息，?after= 增量拉取新消息
+    """
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = MessageSerializer
+    pagination_class = MessageCursorPagination
 
     def get_queryset(self):
         cid = self.kwargs['conversation_id']
         conv = get_object_or_404(Conversation, conversation_id=cid)
         if conv.teacher != self.request.user and conv.student != self.request.user:
             return Message.objects.none()
-        return Message.objects.filter(conversation=conv).select_related('sender').order_by('created_at')
+        return Message.objects.filter(conversation=conv).select_related('sender')
 
 
 class SendMessage(APIView):
@@ -103,11 +117,60 @@ class SendMessage(APIView):
             return Response({'detail': '无权在此会话发消息'}, status=403)
         ser = SendMessageSerializer(data=request.data)
         ser.is_valid(raise_exception=True)
-        msg = Message.objects.create(
-            conversation=conv,
-            sender=request.user,
-            content=ser.validated_data['content'],
-        )
-        conv.updated_at = timezone.now()
-        conv.save(update_fields=['updated_at'])
+        with transaction.atomic():
+            lock_conversation(conv.pk)
+            msg = Message.objects.create(
+                conversation=conv,
+                sender=request.user,
+                content=ser.validated_data['content'],
+            )
+            # 原子维护冗余字段：最近消息 + 对方未读数 +1（F 表达式，避免并发覆盖）
+            recipient_unread = conv.unread_field_for(
+                conv.student_id if request.user.pk == conv.teacher_id else conv.teacher_id
+            )
+            Conversation.objects.filter(pk=conv.pk).update(
+                last_message=msg,
+                last_message_at=msg.created_at,
+                updated_at=timezone.now(),
+                **{recipient_unread: F(recipient_unread) + 1},
+            )
         return Response(MessageSerializer(msg).data, status=201)
+
+
+class MarkConversationRead(APIView):
+    """
+    POST /api/chat/conversations/<conversation_id>/read/
+    body: 可选 { "message_id": 123 }  只标记该消息及之前的消息；省略时标记对方发来的全部消息
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, conversation_id):
+        conv = get_object_or_404(Conversation, conversation_id=conversation_id)
+        if conv.teacher != request.user and conv.student != request.user:
+            return Response({'detail': '无权操作该会话'}, status=403)
+        up_to = request.data.get('message_id')
+        if up_to is not None:
+            try:
+                up_to = int(up_to)
+            except (TypeError, ValueError):
+                return Response({'detail': 'message_id 必须为整数'}, status=400)
+            if not Message.objects.filter(conversation=conv, message_id=up_to).exists():
+                return Response({'detail': 'message_id 不属于该会话'}, status=400)
+
+        unread_field = conv.unread_field_for(request.user.pk)
+        with transaction.atomic():
+            # 锁定会话行，与 SendMessage 的未读数 +1 串行，避免重算结果覆盖并发新消息
+            lock_conversation(conv.pk)
+            unread = Message.objects.unread_for(conv, request.user.pk)
+            if up_to is None:
+                updated = unread.update(is_read=True, read_at=timezone.now())
+                unread_count = 0
+            else:
+                updated = unread.filter(message_id__lte=up_to).update(is_read=True, read_at=timezone.now())
+                unread_count = unread.count()
+            Conversation.objects.filter(pk=conv.pk).update(**{unread_field: unread_count})
+        return Response({
+            'conversation_id': conv.conversation_id,
+            'updated_count': updated,
+            'unread_count': unread_count,
+        })
@@ -3,7 +3,8 @@
 """
 
 from django.contrib import admin
-from .models import Notification
+from .models import Notification, BroadcastNotification
+from .counters import recount_users
 
 
 @admin.register(Notification)
@@ -57,23 +58,60 @@ class NotificationAdmin(admin.ModelAdmin):
             return self.readonly_fields + ['recipient', 'created_at']
         return self.readonly_fields
     
+    def save_model(self, request, obj, form, change):
+        """编辑可能修改已读状态或分类，保存后重算该用户的未读计数"""
+        super().save_model(request, obj, form, change)
+        if change:
+            recount_users([obj.recipient_id])
+    
     actions = ['mark_as_read', 'mark_as_unread']
     
     def mark_as_read(self, request, queryset):
         """批量标记为已读"""
         from django.utils import timezone
-        updated = queryset.filter(is_read=False).update(
+        unread = queryset.filter(is_read=False)
+        user_ids = set(unread.values_list('recipient_id', flat=True))
+        updated = unread.update(
             is_read=True,
             read_at=timezone.now()
         )
+        # 批量 update 不触发信号，重算受影响用户的未读计数
+        recount_users(user_ids)
         self.message_user(request, f'成功标记 {updated} 条通知为已读')
     mark_as_read.short_description = '标记为已读'
     
     def mark_as_unread(self, request, queryset):
         """批量标记为未读"""
-        updated = queryset.filter(is_read=True).update(
+        read = queryset.filter(is_read=True)
+        user_ids = set(read.values_list('recipient_id', flat=True))
+        updated = read.update(
             is_read=False,
             read_at=None
         )
+        recount_users(user_ids)
         self.message_user(request, f'成功标记 {updated} 条通知为未读')
     mark_as_unread.short_description = '标记为未读'
+
+
+@admin.register(BroadcastNotification)
+class BroadcastNotificationAdmin(admin.ModelAdmin):
+    """广播通知管理（面向全体用户或某一角色，只存一行）"""
+
+    list_display = [
+        'broadcast_id', 'title', 'audience_role', 'notification_type',
+        'category', 'priority', 'get_read_count', 'created_at'
+    ]
+    list_filter = ['audience_role', 'category', 'notification_type', 'created_at']
+    search_fields = ['title', 'message']
+    ordering = ['-created_at']
+    date_hierarchy = 'created_at'
+    readonly_fields = ['created_at']
+
+    def get_queryset(self, request):
+        from django.db.models import Count
+        return super().get_queryset(request).annotate(read_count=Count('receipts'))
+
+    def get_read_count(self, obj):
+        return obj.read_count
+    get_read_count.short_description = '已读人数'
+    get_read_count.admin_order_field = 'read_count'
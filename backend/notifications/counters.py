@@ -0,0 +1,152 @@
+"""
+学生助教管理平台 - 通知未读计数
+
+UnreadCount 接口被前端高频轮询，不再每次对 notification 表计数：
+- 个人通知：NotificationUnreadCounter 表按 (用户, 分类) 增量维护
+  （创建/批量创建/标记已读/全部已读/Admin 批量操作），reconcile_unread_counters 命令修复偏差
+- 广播通知：按用户缓存各分类未读数，新广播发布时递增代数整体失效，用户产生已读回执时单独失效；
+  两者都在事务提交后执行，避免并发请求在提交前按旧数据重新写入缓存
+"""
+
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Value
+from django.db.models.functions import Greatest
+
+from .models import Notification, NotificationUnreadCounter, BroadcastNotification
+
+
+BROADCAST_GENERATION_KEY = 'notifications:broadcast_gen'
+BROADCAST_UNREAD_CACHE_TTL = 600  # 秒
+
+
+def adjust_unread(deltas):
+    """
+    批量调整未读数：deltas 为 {(user_id, category): 增量}
+    相同 (分类, 增量) 的用户合并为一次 UPDATE；增加前先插入缺失的计数行（冲突忽略）
+    """
+    groups = defaultdict(list)
+    for (user_id, category), delta in deltas.items():
+        if delta:
+            groups[(category, delta)].append(user_id)
+
+    for (category, delta), user_ids in groups.items():
+        if delta > 0:
+            NotificationUnreadCounter.objects.bulk_create(
+                [NotificationUnreadCounter(user_id=user_id, category=category) for user_id in user_ids],
+                ignore_conflicts=True,
+            )
+        NotificationUnreadCounter.objects.filter(
+            user_id__in=user_ids,
+            category=category,
+        ).update(unread=Greatest(F('unread') + delta, Value(0)))
+
+
+def increment_unread(user_id, category, count=1):
+    adjust_unread({(user_id, category): count})
+
+
+def decrement_unread(user_id, category, count=1):
+    adjust_unread({(user_id, category): -count})
+
+
+def increment_for_notifications(notifications):
+    """新建通知（含 bulk_create）后累加接收人的未读数"""
+    deltas = defaultdict(int)
+    for notification in notifications:
+        if not notification.is_read:
+            deltas[(notification.recipient_id, notification.category)] += 1
+    adjust_unread(deltas)
+
+
+def recount_users(user_ids):
+    """按 notification 表重算指定用户的未读计数，返回修正的计数行数"""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return 0
+
+    actual = {
+        (recipient_id, category): count
+        for recipient_id, category, count in Notification.objects.filter(
+            recipient_id__in=user_ids,
+            is_read=False,
+        ).values_list('recipient_id', 'category').annotate(
+            count=Count('notification_id')
+        ).order_by()
+    }
+    existing = {
+        (counter.user_id, counter.category): counter
+        for counter in NotificationUnreadCounter.objects.filter(user_id__in=user_ids)
+    }
+
+    to_update = []
+    for key, counter in existing.items():
+        expected = actual.get(key, 0)
+        if counter.unread != expected:
+            counter.unread = expected
+            to_update.append(counter)
+    to_create = [
+        NotificationUnreadCounter(user_id=user_id, category=category, unread=count)
+        for (user_id, category), count in actual.items()
+        if (user_id, category) not in existing
+    ]
+
+    if to_update:
+        NotificationUnreadCounter.objects.bulk_update(to_update, ['unread'])
+    if to_create:
+        NotificationUnreadCounter.objects.bulk_create(to_create, ignore_conflicts=True)
+    return len(to_update) + len(to_create)
+
+
+def personal_unread_counts(user):
+    """个人通知各分类未读数 {category: count}（1 次按用户的索引查询）"""
+    return dict(
+        NotificationUnreadCounter.objects.filter(
+            user=user, unread__gt=0
+        ).values_list('category', 'unread')
+    )
+
+
+def _broadcast_generation():
+    generation = cache.get(BROADCAST_GENERATION_KEY)
+    if generation is None:
+        cache.add(BROADCAST_GENERATION_KEY, 1, None)
+        generation = cache.get(BROADCAST_GENERATION_KEY)
+    return generation
+
+
+def _bump_broadcast_generation_now():
+    try:
+        cache.incr(BROADCAST_GENERATION_KEY)
+    except ValueError:
+        cache.add(BROADCAST_GENERATION_KEY, 1, None)
+
+
+def bump_broadcast_generation():
+    """广播发布/删除后，使所有用户的广播未读数缓存失效（于事务提交后执行）"""
+    transaction.on_commit(_bump_broadcast_generation_now)
+
+
+def _broadcast_unread_key(user_id):
+    return f'notifications:broadcast_unread:g{_broadcast_generation()}:{user_id}'
+
+
+def invalidate_broadcast_unread(user_id):
+    """用户新增已读回执后，清除其广播未读数缓存（于事务提交后执行）"""
+    transaction.on_commit(lambda: cache.delete(_broadcast_unread_key(user_id)))
+
+
+def broadcast_unread_counts(user, role_codes):
+    """广播通知各分类未读数 {category: count}（按用户缓存）"""
+    cache_key = _broadcast_unread_key(user.pk)
+    counts = cache.get(cache_key)
+    if counts is None:
+        counts = dict(
+            BroadcastNotification.objects.visible_to(user, role_codes).unread_by(
+                user
+            ).values_list('category').annotate(count=Count('broadcast_id')).order_by()
+        )
+        cache.set(cache_key, counts, BROADCAST_UNREAD_CACHE_TTL)
+    return counts
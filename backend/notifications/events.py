@@ -0,0 +1,154 @@
+"""
+学生助教管理平台 - 实时事件总线
+
+新聊天消息、新通知、新广播在事务提交后发布到事件总线，
+ASGI 下的 SSE 接口（stream.py）为每个在线用户订阅并推送，前端无需高频轮询：
+- publish_event(user_ids, type, data)：推送给指定用户
+- publish_broadcast(type, data, audience_role)：推送给全部在线用户（按角色过滤）
+- 后端由 settings.REALTIME_EVENT_BACKEND 指定，默认 InProcessEventBackend
+  只在单进程内有效；多 worker 部署时替换为共享实现（如 Redis 发布订阅），接口保持不变
+"""
+
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EVENT_BACKEND = 'notifications.events.InProcessEventBackend'
+SUBSCRIPTION_QUEUE_SIZE = 100  # 单个连接积压上限，超出时丢弃最旧事件（客户端会按需重新拉取）
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+class BaseEventBackend:
+    """事件后端接口"""
+
+    def publish(self, user_ids, event):
+        """user_ids 为 None 时推送给所有订阅者"""
+        raise NotImplementedError
+
+    def subscribe(self, user_id):
+        """订阅某用户的事件，返回 Subscription（须在事件循环中调用）"""
+        raise NotImplementedError
+
+
+class Subscription:
+    """单个连接的订阅：事件经 call_soon_threadsafe 投递到所属事件循环的队列"""
+
+    def __init__(self, backend, user_id):
+        self.backend = backend
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=SUBSCRIPTION_QUEUE_SIZE)
+
+    def deliver(self, event):
+        """可在任意线程调用"""
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout=None):
+        """等待下一条事件，超时返回 None"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.backend.unsubscribe(self)
+
+
+class InProcessEventBackend(BaseEventBackend):
+    """进程内事件后端（开发环境、单 worker 部署）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+
+    def subscribe(self, user_id):
+        subscription = Subscription(self, user_id)
+        with self._lock:
+            self._subscriptions[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+    def publish(self, user_ids, event):
+        with self._lock:
+            if user_ids is None:
+                targets = [s for subscriptions in self._subscriptions.values() for s in subscriptions]
+            else:
+                targets = [s for user_id in set(user_ids) for s in self._subscriptions.get(user_id, ())]
+        for subscription in targets:
+            try:
+                subscription.deliver(event)
+            except RuntimeError:
+                # 所属事件循环已关闭（连接异常断开），移除该订阅
+                self.unsubscribe(subscription)
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+
+def get_event_backend():
+    """当前进程的事件后端（单例）"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                path = getattr(settings, 'REALTIME_EVENT_BACKEND', DEFAULT_EVENT_BACKEND)
+                _backend = import_string(path)()
+    return _backend
+
+
+def _publish_on_commit(user_ids, event):
+    def publish():
+        try:
+            get_event_backend().publish(user_ids, event)
+        except Exception as e:
+            # 推送失败不影响业务写入，客户端会在重连后重新拉取
+            logger.warning(f'实时事件推送失败: {e}')
+
+    transaction.on_commit(publish)
+
+
+def publish_event(user_ids, event_type, data):
+    """事务提交后推送事件给指定用户"""
+    user_ids = list(user_ids)
+    if user_ids:
+        _publish_on_commit(user_ids, {'type': event_type, 'data': data})
+
+
+def publish_broadcast(event_type, data, audience_role=''):
+    """事务提交后推送事件给全部在线用户；audience_role 非空时只推送给该角色"""
+    _publish_on_commit(None, {'type': event_type, 'data': data, 'audience_role': audience_role})
+
+
+def publish_notifications(notifications):
+    """
+    新建通知（含 bulk_create）后推送给各接收人；
+    同分类同标题的通知合并为一条事件（群发时一批只登记一次提交回调）
+    """
+    groups = defaultdict(list)
+    for notification in notifications:
+        groups[(notification.category, notification.title)].append(notification.recipient_id)
+    for (category, title), recipient_ids in groups.items():
+        publish_event(recipient_ids, 'notification', {'category': category, 'title': title})
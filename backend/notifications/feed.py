@@ -0,0 +1,129 @@
+"""
+学生助教管理平台 - 通知流
+
+个人通知（Notification）与广播通知（BroadcastNotification + BroadcastReceipt）合并展示：
+- 列表：两侧各自过滤后 UNION ALL，由数据库统一排序与分页
+- 未读数：个人通知读计数表、广播读按用户缓存（见 counters.py）后相加
+- 全部已读：个人通知按分类各 1 次 UPDATE（按实际更新行数扣减未读数）+ 广播回执 1 次批量插入
+"""
+
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Subquery, Value, BooleanField, IntegerField
+from django.utils import timezone
+
+from .models import Notification, BroadcastNotification, BroadcastReceipt
+from .counters import (
+    personal_unread_counts, broadcast_unread_counts, adjust_unread, invalidate_broadcast_unread,
+)
+
+
+# UNION 两侧按相同顺序选取：先是两张表同名的字段，再是按相同顺序添加的同名注解
+FEED_FIELDS = [
+    'notification_type', 'category', 'title', 'message', 'priority',
+    'related_model', 'related_object_id', 'created_at',
+]
+FEED_ANNOTATIONS = ['personal_id', 'broadcast_ref', 'sender_name', 'read_flag', 'read_time', 'is_broadcast']
+
+FEED_FILTER_FIELDS = ['category', 'notification_type']
+
+
+def _parse_bool(value):
+    if value is None or value == '':
+        return None
+    return str(value).lower() in ('true', '1')
+
+
+def _apply_filters(queryset, params):
+    for field in FEED_FILTER_FIELDS:
+        value = params.get(field)
+        if value:
+            queryset = queryset.filter(**{field: value})
+    return queryset
+
+
+def personal_notifications(user, params=None):
+    """个人通知侧（values 查询集）"""
+    params = params or {}
+    queryset = _apply_filters(Notification.objects.filter(recipient=user), params)
+    is_read = _parse_bool(params.get('is_read'))
+    if is_read is not None:
+        queryset = queryset.filter(is_read=is_read)
+    return queryset.annotate(
+        personal_id=F('notification_id'),
+        broadcast_ref=Value(None, output_field=IntegerField()),
+        sender_name=F('sender__real_name'),
+        read_flag=F('is_read'),
+        read_time=F('read_at'),
+        is_broadcast=Value(False, output_field=BooleanField()),
+    ).values(*FEED_FIELDS, *FEED_ANNOTATIONS).order_by()
+
+
+def broadcast_notifications(user, role_codes, params=None):
+    """广播通知侧（values 查询集）"""
+    params = params or {}
+    queryset = _apply_filters(
+        BroadcastNotification.objects.visible_to(user, role_codes), params
+    )
+    is_read = _parse_bool(params.get('is_read'))
+    if is_read is False:
+        queryset = queryset.unread_by(user)
+    elif is_read:
+        queryset = queryset.filter(receipts__user=user)
+    receipts = BroadcastReceipt.objects.filter(broadcast=OuterRef('pk'), user=user)
+    # 注解需与个人通知侧按相同顺序添加（UNION 按位置对齐列）
+    return queryset.annotate(
+        personal_id=Value(None, output_field=IntegerField()),
+        broadcast_ref=F('broadcast_id'),
+        sender_name=F('sender__real_name'),
+        read_flag=Exists(receipts),
+        read_time=Subquery(receipts.values('read_at')[:1]),
+        is_broadcast=Value(True, output_field=BooleanField()),
+    ).values(*FEED_FIELDS, *FEED_ANNOTATIONS).order_by()
+
+
+def notification_feed(user, role_codes, params=None):
+    """合并后的通知流（按 created_at 排序，默认倒序）"""
+    params = params or {}
+    ordering = params.get('ordering') or '-created_at'
+    if ordering not in ('created_at', '-created_at'):
+        ordering = '-created_at'
+    return personal_notifications(user, params).union(
+        broadcast_notifications(user, role_codes, params),
+        all=True,
+    ).order_by(ordering)
+
+
+def unread_counts(user, role_codes):
+    """按分类统计未读数（个人通知计数表 + 广播未读缓存），返回 {category: count}"""
+    counts = personal_unread_counts(user)
+    for category, count in broadcast_unread_counts(user, role_codes).items():
+        counts[category] = counts.get(category, 0) + count
+    return counts
+
+
+def mark_all_read(user, role_codes):
+    """将个人通知与可见广播全部标记为已读，返回标记条数"""
+    # 按实际标记的行数扣减（而非清零），并发新建的通知仍计入未读数
+    unread = Notification.objects.filter(recipient=user, is_read=False)
+    now = timezone.now()
+    updated = 0
+    deltas = {}
+    with transaction.atomic():
+        for category in unread.values_list('category', flat=True).distinct().order_by():
+            count = unread.filter(category=category).update(is_read=True, read_at=now)
+            deltas[(user.pk, category)] = -count
+            updated += count
+        adjust_unread(deltas)
+
+    unread_ids = list(
+        BroadcastNotification.objects.visible_to(user, role_codes).unread_by(
+            user
+        ).values_list('broadcast_id', flat=True)
+    )
+    if unread_ids:
+        BroadcastReceipt.objects.bulk_create(
+            [BroadcastReceipt(broadcast_id=broadcast_id, user=user) for broadcast_id in unread_ids],
+            ignore_conflicts=True,
+        )
+        invalidate_broadcast_unread(user.pk)
+    return updated + len(unread_ids)
@@ -0,0 +1,38 @@
+"""
+修复通知未读计数：按 notification 表重算 NotificationUnreadCounter
+"""
+
+from django.core.management.base import BaseCommand
+
+from accounts.models import User
+from notifications.counters import recount_users
+
+
+class Command(BaseCommand):
+    help = '按通知表重算用户未读计数，修复增量维护产生的偏差'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            action='append',
+            dest='user_ids',
+            help='只重算指定用户ID（可多次指定）'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='每批处理的用户数，默认 500'
+        )
+
+    def handle(self, *args, **options):
+        if options['user_ids']:
+            fixed = recount_users(options['user_ids'])
+        else:
+            fixed = 0
+            batch_size = options['batch_size']
+            user_ids = list(User.objects.order_by('user_id').values_list('user_id', flat=True))
+            for start in range(0, len(user_ids), batch_size):
+                fixed += recount_users(user_ids[start:start + batch_size])
+
+        self.stdout.write(self.style.SUCCESS(f'✅ 未读计数校对完成，修正 {fixed} 条'))
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:08
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('notifications', '0002_alter_notification_category_and_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BroadcastNotification',
+            fields=[
+                ('broadcast_id', models.AutoField(primary_key=True, serialize=False, verbose_name='广播ID')),
+                ('audience_role', models.CharField(blank=True, default='', help_text='角色代码，如 student；留空表示全体用户', max_length=50, verbose_name='接收角色')),
+                ('notification_type', models.CharField(choices=[('system_announcement', '系统公告'), ('system_maintenance', '系统维护通知'), ('account_activated', '账号激活'), ('password_changed', '密码修改'), ('position_published', '新岗位发布'), ('position_updated', '岗位信息更新'), ('position_closed', '岗位关闭'), ('position_deadline_soon', '申请截止提醒'), ('application_submitted', '收到新申请'), ('application_reviewing', '申请审核中'), ('application_accepted', '申请通过'), ('application_rejected', '申请被拒'), ('application_withdrawn', '申请已撤回'), ('timesheet_submitted', '收到工时表'), ('timesheet_approved', '工时已批准'), ('timesheet_rejected', '工时被驳回'), ('timesheet_reminder', '工时提交提醒'), ('salary_generated', '薪酬已生成'), ('salary_paid', '薪酬已发放'), ('salary_delayed', '薪酬延迟通知'), ('role_granted', '角色授予'), ('role_revoked', '角色撤销'), ('became_ta', '成为助教'), ('evaluation_received', '收到工作评价'), ('evaluation_reminder', '评价提醒'), ('chat_new_message', '收到聊天消息')], max_length=50, verbose_name='通知类型')),
+                ('category', models.CharField(choices=[('system', '系统通知'), ('application', '申请相关'), ('timesheet', '工时相关'), ('salary', '薪酬相关'), ('chat', '师生聊天')], max_length=20, verbose_name='通知分类')),
+                ('title', models.CharField(max_length=200, verbose_name='标题')),
+                ('message', models.TextField(verbose_name='消息内容')),
+                ('priority', models.CharField(choices=[('low', '低'), ('medium', '中'), ('high', '高'), ('urgent', '紧急')], default='medium', max_length=10, verbose_name='优先级')),
+                ('related_model', models.CharField(blank=True, max_length=50, null=True, verbose_name='关联模型')),
+                ('related_object_id', models.IntegerField(blank=True, null=True, verbose_name='关联对象ID')),
+                ('expires_at', models.DateTimeField(blank=True, null=True, verbose_name='过期时间')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='创建时间')),
+                ('sender', models.ForeignKey(blank=True, help_text='系统通知时为NULL', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sent_broadcasts', to=settings.AUTH_USER_MODEL, verbose_name='发送人')),
+            ],
+            options={
+                'verbose_name': '广播通知',
+                'verbose_name_plural': '广播通知',
+                'db_table': 'broadcast_notification',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='BroadcastReceipt',
+            fields=[
+                ('receipt_id', models.AutoField(primary_key=True, serialize=False, verbose_name='回执ID')),
+                ('read_at', models.DateTimeField(auto_now_add=True, verbose_name='阅读时间')),
+                ('broadcast', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='receipts', to='notifications.broadcastnotification', verbose_name='广播通知')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='broadcast_receipts', to=settings.AUTH_USER_MODEL, verbose_name='用户')),
+            ],
+            options={
+                'verbose_name': '广播已读回执',
+                'verbose_name_plural': '广播已读回执',
+                'db_table': 'broadcast_receipt',
+                'unique_together': {('broadcast', 'user')},
+            },
+        ),
+        migrations.AddIndex(
+            model_name='broadcastnotification',
+            index=models.Index(fields=['audience_role', 'created_at'], name='broadcast_n_audienc_c8e262_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:10
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_unread_counters(apps, schema_editor):
+    """按现有未读通知初始化计数表"""
+    Notification = apps.get_model('notifications', 'Notification')
+    NotificationUnreadCounter = apps.get_model('notifications', 'NotificationUnreadCounter')
+    rows = Notification.objects.filter(is_read=False).values_list(
+        'recipient_id', 'category'
+    ).annotate(count=models.Count('notification_id')).order_by()
+    NotificationUnreadCounter.objects.bulk_create(
+        [
+            NotificationUnreadCounter(user_id=user_id, category=category, unread=count)
+            for user_id, category, count in rows
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('notifications', '0003_broadcastnotification_broadcastreceipt_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationUnreadCounter',
+            fields=[
+                ('counter_id', models.AutoField(primary_key=True, serialize=False, verbose_name='计数ID')),
+                ('category', models.CharField(choices=[('system', '系统通知'), ('application', '申请相关'), ('timesheet', '工时相关'), ('salary', '薪酬相关'), ('chat', '师生聊天')], max_length=20, verbose_name='通知分类')),
+                ('unread', models.IntegerField(default=0, verbose_name='未读数')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notification_unread_counters', to=settings.AUTH_USER_MODEL, verbose_name='用户')),
+            ],
+            options={
+                'verbose_name': '通知未读计数',
+                'verbose_name_plural': '通知未读计数',
+                'db_table': 'notification_unread_counter',
+                'unique_together': {('user', 'category')},
+            },
+        ),
+        migrations.RunPython(backfill_unread_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0004_notificationunreadcounter'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', 'is_read', 'created_at'], name='notificatio_recipie_779c41_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', 'created_at'], name='notificatio_recipie_04e032_idx'),
+        ),
+        # 先建复合索引再删除被其前缀覆盖的单列索引（MySQL 外键列必须始终有索引）
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='notificatio_recipie_201701_idx',
+        ),
+    ]
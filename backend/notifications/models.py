@@ -1,12 +1,25 @@
 """
 学生助教管理平台 - 通知系统模块模型
-包含：Notification（通知表）
+包含：Notification（通知表）、BroadcastNotification（广播通知表）、BroadcastReceipt（广播已读回执表）、
+      NotificationUnreadCounter（未读计数表）
 """
 
 from django.db import models
 from django.conf import settings
 
 
+class NotificationQuerySet(models.QuerySet):
+    """通知查询集：批量创建时同步维护未读计数并推送实时事件"""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        from .counters import increment_for_notifications
+        from .events import publish_notifications
+        increment_for_notifications(objs)
+        publish_notifications(objs)
+        return objs
+
+
 class Notification(models.Model):
     """通知表 - 系统消息和通知记录"""
     
@@ -146,13 +159,17 @@ class Notification(models.Model):
         verbose_name='创建时间'
     )
     
+    objects = NotificationQuerySet.as_manager()
+
     class Meta:
         db_table = 'notification'
         verbose_name = '通知'
         verbose_name_plural = '通知'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['recipient', 'is_read']),
+            # 通知列表：recipient=? [AND is_read=?] ORDER BY created_at DESC
+            models.Index(fields=['recipient', 'is_read', 'created_at']),
+            models.Index(fields=['recipient', 'created_at']),
             models.Index(fields=['notification_type']),
             models.Index(fields=['category']),
             models.Index(fields=['created_at']),
@@ -163,12 +180,18 @@ class Notification(models.Model):
         return f'[{read_status}] {self.title} → {self.recipient.real_name}'
     
     def mark_as_read(self):
-        """标记为已读"""
+        """标记为已读（条件 UPDATE：并发标记同一通知时只有实际更新的请求扣减未读数）"""
         if not self.is_read:
-            self.is_read = True
             from django.utils import timezone
-            self.read_at = timezone.now()
-            self.save(update_fields=['is_read', 'read_at'])
+            read_at = timezone.now()
+            updated = Notification.objects.filter(
+                pk=self.pk, is_read=False
+            ).update(is_read=True, read_at=read_at)
+            self.is_read = True
+            self.read_at = read_at
+            if updated == 1:
+                from .counters import decrement_unread
+                decrement_unread(self.recipient_id, self.category)
     
     def is_expired(self):
         """判断通知是否过期"""
@@ -176,3 +199,192 @@ class Notification(models.Model):
             return False
         from django.utils import timezone
         return timezone.now() > self.expires_at
+
+
+class BroadcastNotificationQuerySet(models.QuerySet):
+    """广播通知查询集"""
+
+    def visible_to(self, user, role_codes):
+        """
+        用户可见的广播：面向全体或面向其所属角色，且发布于用户注册之后
+        role_codes 由调用方传入（通常来自 accounts.rbac 的缓存）
+        """
+        return self.filter(
+            models.Q(audience_role='') | models.Q(audience_role__in=list(role_codes)),
+            created_at__gte=user.date_joined,
+        )
+
+    def with_read_state(self, user):
+        """注解当前用户的已读状态 read_flag / read_time"""
+        receipts = BroadcastReceipt.objects.filter(
+            broadcast=models.OuterRef('pk'),
+            user=user,
+        )
+        return self.annotate(
+            read_flag=models.Exists(receipts),
+            read_time=models.Subquery(receipts.values('read_at')[:1]),
+        )
+
+    def unread_by(self, user):
+        """当前用户未读的广播"""
+        return self.exclude(receipts__user=user)
+
+
+class BroadcastNotification(models.Model):
+    """
+    广播通知表 - 面向全体用户或某一角色的通知只存一行
+    用户是否已读记录在 BroadcastReceipt 中，通知列表/未读数与个人通知合并展示
+    """
+
+    broadcast_id = models.AutoField(
+        primary_key=True,
+        verbose_name='广播ID'
+    )
+    audience_role = models.CharField(
+        max_length=50,
+        blank=True,
+        default='',
+        verbose_name='接收角色',
+        help_text='角色代码，如 student；留空表示全体用户'
+    )
+    sender = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='sent_broadcasts',
+        verbose_name='发送人',
+        help_text='系统通知时为NULL'
+    )
+    notification_type = models.CharField(
+        max_length=50,
+        choices=Notification.TYPE_CHOICES,
+        verbose_name='通知类型'
+    )
+    category = models.CharField(
+        max_length=20,
+        choices=Notification.CATEGORY_CHOICES,
+        verbose_name='通知分类'
+    )
+    title = models.CharField(
+        max_length=200,
+        verbose_name='标题'
+    )
+    message = models.TextField(
+        verbose_name='消息内容'
+    )
+    priority = models.CharField(
+        max_length=10,
+        choices=Notification.PRIORITY_CHOICES,
+        default='medium',
+        verbose_name='优先级'
+    )
+    related_model = models.CharField(
+        max_length=50,
+        null=True,
+        blank=True,
+        verbose_name='关联模型'
+    )
+    related_object_id = models.IntegerField(
+        null=True,
+        blank=True,
+        verbose_name='关联对象ID'
+    )
+    expires_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='过期时间'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='创建时间'
+    )
+
+    objects = BroadcastNotificationQuerySet.as_manager()
+
+    class Meta:
+        db_table = 'broadcast_notification'
+        verbose_name = '广播通知'
+        verbose_name_plural = '广播通知'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['audience_role', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f'{self.title} → {self.audience_role or "全体用户"}'
+
+    def mark_as_read(self, user):
+        """为用户记录已读回执（幂等）"""
+        receipt, _created = BroadcastReceipt.objects.get_or_create(broadcast=self, user=user)
+        return receipt
+
+
+class BroadcastReceipt(models.Model):
+    """广播已读回执表 - 每个用户读过的广播各一行"""
+
+    receipt_id = models.AutoField(
+        primary_key=True,
+        verbose_name='回执ID'
+    )
+    broadcast = models.ForeignKey(
+        BroadcastNotification,
+        on_delete=models.CASCADE,
+        related_name='receipts',
+        verbose_name='广播通知'
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='broadcast_receipts',
+        verbose_name='用户'
+    )
+    read_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='阅读时间'
+    )
+
+    class Meta:
+        db_table = 'broadcast_receipt'
+        verbose_name = '广播已读回执'
+        verbose_name_plural = '广播已读回执'
+        unique_together = [['broadcast', 'user']]
+
+    def __str__(self):
+        return f'{self.user_id} 已读 {self.broadcast_id}'
+
+
+class NotificationUnreadCounter(models.Model):
+    """
+    未读计数表 - 每个用户每个分类一行，UnreadCount 接口直接读取
+    在通知创建、标记已读/未读时增量维护；reconcile_unread_counters 命令修复偏差
+    """
+
+    counter_id = models.AutoField(
+        primary_key=True,
+        verbose_name='计数ID'
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='notification_unread_counters',
+        verbose_name='用户'
+    )
+    category = models.CharField(
+        max_length=20,
+        choices=Notification.CATEGORY_CHOICES,
+        verbose_name='通知分类'
+    )
+    unread = models.IntegerField(
+        default=0,
+        verbose_name='未读数'
+    )
+
+    class Meta:
+        db_table = 'notification_unread_counter'
+        verbose_name = '通知未读计数'
+        verbose_name_plural = '通知未读计数'
+        unique_together = [['user', 'category']]
+
+    def __str__(self):
+        return f'{self.user_id} [{self.category}] 未读 {self.unread}'
@@ -3,7 +3,7 @@
 """
 
 from rest_framework import serializers
-from .models import Notification
+from .models import Notification, BroadcastNotification
 
 
 class NotificationSerializer(serializers.ModelSerializer):
@@ -66,8 +66,36 @@ class NotificationSerializer(serializers.ModelSerializer):
         ]
 
 
-class NotificationListSerializer(serializers.ModelSerializer):
-    """通知列表序列化器（简化版）"""
+class NotificationFeedSerializer(serializers.Serializer):
+    """
+    通知流序列化器：个人通知与广播通知合并后的行（notifications.feed 产出的字典）
+    个人通知 is_broadcast=False 且带 notification_id；广播通知 is_broadcast=True 且带 broadcast_id
+    """
+    notification_id = serializers.IntegerField(source='personal_id', allow_null=True)
+    broadcast_id = serializers.IntegerField(source='broadcast_ref', allow_null=True)
+    is_broadcast = serializers.BooleanField()
+    sender_name = serializers.CharField(allow_null=True)
+    notification_type = serializers.CharField()
+    notification_type_display = serializers.SerializerMethodField()
+    category = serializers.CharField()
+    category_display = serializers.SerializerMethodField()
+    title = serializers.CharField()
+    message = serializers.CharField()
+    is_read = serializers.BooleanField(source='read_flag')
+    read_at = serializers.DateTimeField(source='read_time', allow_null=True)
+    related_model = serializers.CharField(allow_null=True)
+    related_object_id = serializers.IntegerField(allow_null=True)
+    created_at = serializers.DateTimeField()
+
+    def get_notification_type_display(self, obj):
+        return dict(Notification.TYPE_CHOICES).get(obj['notification_type'], obj['notification_type'])
+
+    def get_category_display(self, obj):
+        return dict(Notification.CATEGORY_CHOICES).get(obj['category'], obj['category'])
+
+
+class BroadcastNotificationSerializer(serializers.ModelSerializer):
+    """广播通知详情序列化器（字段与 NotificationSerializer 对齐）"""
     sender_name = serializers.CharField(
         source='sender.real_name',
         read_only=True,
@@ -81,11 +109,20 @@ class NotificationListSerializer(serializers.ModelSerializer):
         source='get_category_display',
         read_only=True
     )
-    
+    priority_display = serializers.CharField(
+        source='get_priority_display',
+        read_only=True
+    )
+    is_broadcast = serializers.SerializerMethodField()
+    is_read = serializers.BooleanField(source='read_flag', read_only=True)
+    read_at = serializers.DateTimeField(source='read_time', read_only=True)
+
     class Meta:
-        model = Notification
+        model = BroadcastNotification
         fields = [
-            'notification_id',
+            'broadcast_id',
+            'is_broadcast',
+            'sender',
             'sender_name',
             'notification_type',
             'notification_type_display',
@@ -93,10 +130,16 @@ class NotificationListSerializer(serializers.ModelSerializer):
             'category_display',
             'title',
             'message',
+            'priority',
+            'priority_display',
             'is_read',
             'read_at',
             'related_model',
             'related_object_id',
+            'expires_at',
             'created_at',
         ]
+        read_only_fields = fields
 
+    def get_is_broadcast(self, obj):
+        return True
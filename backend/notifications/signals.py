@@ -0,0 +1,46 @@
+"""
+学生助教管理平台 - 通知系统模块信号
+包含：未读计数增量维护、广播未读缓存失效、实时事件推送
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Notification, BroadcastNotification, BroadcastReceipt
+from .counters import (
+    increment_unread, decrement_unread, bump_broadcast_generation, invalidate_broadcast_unread,
+)
+from .events import publish_notifications, publish_broadcast
+
+
+@receiver(post_save, sender=Notification)
+def on_notification_created(sender, instance: Notification, created: bool, **kwargs):
+    """新通知（未读）计入接收人的未读数；已读状态变化由 mark_as_read 等调用方维护"""
+    if created and not instance.is_read:
+        increment_unread(instance.recipient_id, instance.category)
+        publish_notifications([instance])
+
+
+@receiver(post_delete, sender=Notification)
+def on_notification_deleted(sender, instance: Notification, **kwargs):
+    """删除未读通知时扣减未读数"""
+    if not instance.is_read:
+        decrement_unread(instance.recipient_id, instance.category)
+
+
+@receiver([post_save, post_delete], sender=BroadcastNotification)
+def on_broadcast_changed(sender, instance: BroadcastNotification, **kwargs):
+    """广播发布/删除后，所有用户的广播未读数缓存失效；新广播推送给对应角色的在线用户"""
+    bump_broadcast_generation()
+    if kwargs.get('created'):
+        publish_broadcast('broadcast', {
+            'broadcast_id': instance.broadcast_id,
+            'category': instance.category,
+            'title': instance.title,
+        }, instance.audience_role)
+
+
+@receiver([post_save, post_delete], sender=BroadcastReceipt)
+def on_broadcast_receipt_changed(sender, instance: BroadcastReceipt, **kwargs):
+    """用户已读回执变化后，清除其广播未读数缓存"""
+    invalidate_broadcast_unread(instance.user_id)
@@ -0,0 +1,119 @@
+"""
+学生助教管理平台 - 实时事件推送（Server-Sent Events）
+
+GET /api/notifications/stream/?ticket=<stream_ticket>
+- 仅在 ASGI 部署下可用（TeachingAssistant/asgi.py），WSGI 下返回 501，前端退回轮询
+- EventSource 无法设置请求头；为避免访问令牌出现在代理与访问日志中，浏览器先以 JWT 调用
+  POST /api/notifications/stream/ticket/ 换取短时一次性票据，再以票据建立连接
+  （非浏览器客户端也可直接使用 Authorization 头）
+- 连接空闲时只发送注释心跳，不查询数据库；超过最长时长后服务端主动断开，客户端换取新票据后重连
+"""
+
+import json
+import secrets
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+
+from accounts.models import User
+from accounts.rbac import get_user_roles
+from .events import get_event_backend
+
+
+KEEPALIVE_SECONDS = getattr(settings, 'REALTIME_STREAM_KEEPALIVE', 20)
+MAX_STREAM_SECONDS = getattr(settings, 'REALTIME_STREAM_MAX_SECONDS', 300)
+RETRY_MILLISECONDS = 3000
+STREAM_TICKET_TTL = getattr(settings, 'REALTIME_STREAM_TICKET_TTL', 30)  # 秒
+STREAM_TICKET_KEY = 'notifications:stream_ticket:{ticket}'
+
+
+def issue_stream_ticket(user):
+    """签发一次性连接票据（随机串，缓存中只保存用户ID），返回 (票据, 有效秒数)"""
+    ticket = secrets.token_urlsafe(32)
+    cache.set(STREAM_TICKET_KEY.format(ticket=ticket), user.pk, STREAM_TICKET_TTL)
+    return ticket, STREAM_TICKET_TTL
+
+
+def redeem_stream_ticket(ticket):
+    """兑换票据并立即作废，返回用户ID；无效、过期或已被使用时返回 None"""
+    key = STREAM_TICKET_KEY.format(ticket=ticket)
+    user_id = cache.get(key)
+    # delete 返回是否真正删除：并发兑换同一票据时只有一个请求成功
+    if user_id is None or not cache.delete(key):
+        return None
+    return user_id
+
+
+def _bearer_token(request):
+    parts = request.META.get('HTTP_AUTHORIZATION', '').split()
+    if len(parts) == 2 and parts[0] == 'Bearer':
+        return parts[1]
+    return None
+
+
+def _authenticate(ticket, raw_token):
+    """校验票据（或 JWT）并返回 (用户, 角色代码集合)，失败返回 (None, None)"""
+    if ticket:
+        user_id = redeem_stream_ticket(ticket)
+        user = User.objects.filter(pk=user_id).first() if user_id is not None else None
+    else:
+        authentication = JWTAuthentication()
+        try:
+            user = authentication.get_user(authentication.get_validated_token(raw_token))
+        except (InvalidToken, TokenError, AuthenticationFailed):
+            return None, None
+    if user is None or not user.is_active:
+        return None, None
+    return user, get_user_roles(user).role_codes
+
+
+def _format_event(event_type, data):
+    return f'event: {event_type}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n'
+
+
+async def _event_stream(user, role_codes):
+    subscription = get_event_backend().subscribe(user.pk)
+    loop = subscription.loop
+    deadline = loop.time() + MAX_STREAM_SECONDS
+    try:
+        yield f'retry: {RETRY_MILLISECONDS}\n\n'
+        yield _format_event('ready', {'user_id': user.pk})
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            event = await subscription.get(timeout=min(KEEPALIVE_SECONDS, remaining))
+            if event is None:
+                yield ': keepalive\n\n'
+                continue
+            audience_role = event.get('audience_role')
+            if audience_role and audience_role not in role_codes:
+                continue
+            yield _format_event(event['type'], event['data'])
+    finally:
+        subscription.close()
+
+
+async def event_stream(request):
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'detail': '实时推送需要以 ASGI 方式部署，请使用轮询接口'}, status=501)
+
+    ticket = request.GET.get('ticket')
+    raw_token = _bearer_token(request)
+    if not ticket and not raw_token:
+        return JsonResponse({'detail': '身份认证信息未提供。'}, status=401)
+    user, role_codes = await sync_to_async(_authenticate)(ticket, raw_token)
+    if user is None:
+        return JsonResponse({'detail': '票据或令牌无效、已过期或已被使用'}, status=401)
+
+    response = StreamingHttpResponse(_event_stream(user, role_codes), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # 关闭 Nginx 代理缓冲
+    return response
@@ -1,3 +1,293 @@
-from django.test import TestCase
+import asyncio
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+from django.test import AsyncClient, SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from TeachingAssistant.testing import DashboardTestMixin
+from .counters import (
+    _broadcast_unread_key, adjust_unread, broadcast_unread_counts, personal_unread_counts, recount_users,
+)
+from .events import SUBSCRIPTION_QUEUE_SIZE, InProcessEventBackend, get_event_backend
+from .feed import mark_all_read
+from .models import BroadcastNotification, BroadcastReceipt, Notification
+
+
+class UnreadCounterTest(TestCase):
+    """未读计数表按实际状态变化增减，并发标记已读/新建通知后仍与 notification 表一致"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'student0', 'student0@example.com', 'pass12345', user_id='S00000', real_name='学生0'
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def notify(self, category='system', title='系统公告'):
+        return Notification.objects.create(
+            recipient=self.user, notification_type='system_announcement',
+            category=category, title=title, message='内容'
+        )
+
+    def assertCountersConsistent(self):
+        # recount_users 返回需要修正的计数行数
+        self.assertEqual(recount_users([self.user.pk]), 0)
+
+    def test_concurrent_mark_as_read_decrements_once(self):
+        notification = self.notify()
+        self.notify()
+        # 两个请求各自加载了同一条未读通知
+        first = Notification.objects.get(pk=notification.pk)
+        second = Notification.objects.get(pk=notification.pk)
+        first.mark_as_read()
+        second.mark_as_read()
+
+        self.assertEqual(personal_unread_counts(self.user), {'system': 1})
+        self.assertCountersConsistent()
+
+    def test_mark_all_read_keeps_notifications_created_concurrently(self):
+        self.notify('system')
+        self.notify('application', '申请状态更新')
+
+        def insert_then_adjust(deltas):
+            # 批量标记已读之后、扣减计数之前，另一个请求新建了一条通知
+            self.notify('system', '新通知')
+            adjust_unread(deltas)
+
+        with mock.patch('notifications.feed.adjust_unread', side_effect=insert_then_adjust):
+            updated = mark_all_read(self.user, set())
+
+        self.assertEqual(updated, 2)
+        self.assertEqual(personal_unread_counts(self.user), {'system': 1})
+        self.assertCountersConsistent()
+
+    def test_read_all_endpoint_counts_by_category(self):
+        self.notify('system')
+        self.notify('timesheet', '工时审核')
+        self.notify('timesheet', '工时审核')
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.post('/api/notifications/read-all/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated_count'], 3)
+        self.assertEqual(personal_unread_counts(self.user), {})
+        self.assertCountersConsistent()
+
+    def test_broadcast_counts_invalidated_after_commit(self):
+        self.assertEqual(broadcast_unread_counts(self.user, {'student'}), {})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                BroadcastNotification.objects.create(
+                    audience_role='student', notification_type='system_announcement',
+                    category='system', title='系统公告', message='内容'
+                )
+                # 并发请求在提交前按旧数据回源，并写入此刻的缓存键
+                cache.set(_broadcast_unread_key(self.user.pk), {})
+        self.assertEqual(broadcast_unread_counts(self.user, {'student'}), {'system': 1})
+
+        # 已读回执同样在提交后清除该用户的缓存
+        with self.captureOnCommitCallbacks(execute=True):
+            mark_all_read(self.user, {'student'})
+        self.assertEqual(broadcast_unread_counts(self.user, {'student'}), {})
+
+
+class NotificationFeedApiTest(DashboardTestMixin, TestCase):
+    """通知列表/未读数/全部已读接口合并个人通知与广播，广播按角色可见"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_roles()
+        cls.student = cls.create_student(0)
+        cls.faculty = cls.create_faculty(0)
+        cls.personal = [
+            Notification.objects.create(
+                recipient=cls.student, notification_type='system_announcement',
+                category=category, title=f'个人通知{index}', message='内容'
+            )
+            for index, category in enumerate(['application', 'timesheet'])
+        ]
+        cls.everyone = cls.broadcast('', '全体公告')
+        cls.to_students = cls.broadcast('student', '学生公告')
+        cls.to_faculty = cls.broadcast('faculty', '教师公告')
+
+    @classmethod
+    def broadcast(cls, audience_role, title):
+        return BroadcastNotification.objects.create(
+            audience_role=audience_role, notification_type='system_announcement',
+            category='system', title=title, message='内容'
+        )
+
+    def feed(self, user, **params):
+        self.client.force_authenticate(user)
+        response = self.client.get('/api/notifications/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def unread(self, user):
+        self.client.force_authenticate(user)
+        response = self.client.get('/api/notifications/unread-count/')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_feed_unions_personal_and_broadcast_rows(self):
+        data = self.feed(self.student)
+        self.assertEqual(data['count'], 4)
+        rows = data['results']
+        self.assertEqual(
+            {row['notification_id'] for row in rows if not row['is_broadcast']},
+            {notification.pk for notification in self.personal},
+        )
+        self.assertEqual(
+            {row['broadcast_id'] for row in rows if row['is_broadcast']},
+            {self.everyone.pk, self.to_students.pk},
+        )
+        created = [row['created_at'] for row in rows]
+        self.assertEqual(created, sorted(created, reverse=True))
+        self.assertFalse(any(row['is_read'] for row in rows))
+
+        # 筛选条件同时作用于两侧
+        self.assertEqual(self.feed(self.student, category='system')['count'], 2)
+        self.to_students.mark_as_read(self.student)
+        unread_rows = self.feed(self.student, is_read='false')['results']
+        self.assertEqual(len(unread_rows), 3)
+        self.assertNotIn(self.to_students.pk, {row['broadcast_id'] for row in unread_rows})
+
+    def test_unread_count_includes_broadcasts(self):
+        data = self.unread(self.student)
+        self.assertEqual(data['total_unread'], 4)
+        self.assertEqual(
+            data['by_category'], {'system': 2, 'application': 1, 'timesheet': 1, 'salary': 0}
+        )
+
+    def test_read_all_creates_broadcast_receipts(self):
+        self.assertEqual(self.unread(self.student)['total_unread'], 4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/notifications/read-all/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated_count'], 4)
+        self.assertEqual(
+            set(BroadcastReceipt.objects.filter(user=self.student).values_list('broadcast_id', flat=True)),
+            {self.everyone.pk, self.to_students.pk},
+        )
+        self.assertEqual(self.unread(self.student)['total_unread'], 0)
+        self.assertTrue(all(row['is_read'] for row in self.feed(self.student)['results']))
+
+        # 再次调用不会重复插入回执
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/notifications/read-all/')
+        self.assertEqual(response.data['updated_count'], 0)
+        self.assertEqual(BroadcastReceipt.objects.filter(user=self.student).count(), 2)
+
+    def test_role_targeted_broadcast_hidden_from_other_roles(self):
+        rows = self.feed(self.faculty)['results']
+        self.assertEqual({row['broadcast_id'] for row in rows}, {self.everyone.pk, self.to_faculty.pk})
+        self.assertEqual(self.unread(self.faculty)['total_unread'], 2)
+
+        path = f'/api/notifications/broadcasts/{self.to_students.pk}/'
+        self.assertEqual(self.client.get(path).status_code, 404)
+        self.assertEqual(self.client.post(f'{path}read/').status_code, 404)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/notifications/read-all/')
+        self.assertEqual(response.data['updated_count'], 2)
+        self.assertFalse(BroadcastReceipt.objects.filter(broadcast=self.to_students).exists())
+
+
+class EventBackendTest(SimpleTestCase):
+    """进程内事件总线：按用户投递、全体广播、积压溢出时丢弃最旧事件"""
+
+    async def test_publish_to_user_and_everyone(self):
+        backend = InProcessEventBackend()
+        alice, bob = backend.subscribe(1), backend.subscribe(2)
+
+        backend.publish([1], {'type': 'message', 'data': {'id': 1}})
+        backend.publish(None, {'type': 'broadcast', 'data': {'id': 2}})
+        self.assertEqual((await alice.get(timeout=1))['type'], 'message')
+        self.assertEqual((await alice.get(timeout=1))['type'], 'broadcast')
+        self.assertEqual((await bob.get(timeout=1))['type'], 'broadcast')
+        self.assertIsNone(await bob.get(timeout=0.01))
+
+        bob.close()
+        self.assertEqual(backend.subscriber_count(), 1)
+        alice.close()
+        self.assertEqual(backend.subscriber_count(), 0)
+
+    async def test_overflow_drops_oldest_events(self):
+        backend = InProcessEventBackend()
+        subscription = backend.subscribe(1)
+        for index in range(SUBSCRIPTION_QUEUE_SIZE + 5):
+            backend.publish([1], {'type': 'notification', 'data': {'index': index}})
+        # 投递经 call_soon_threadsafe 排入事件循环，让出一次使其执行
+        await asyncio.sleep(0)
+
+        received = []
+        while (event := await subscription.get(timeout=0.01)) is not None:
+            received.append(event['data']['index'])
+        self.assertEqual(received, list(range(5, SUBSCRIPTION_QUEUE_SIZE + 5)))
+        subscription.close()
+
+
+class EventStreamTest(TestCase):
+    """SSE 接口：WSGI 下返回 501；浏览器以一次性票据连接，访问令牌不放在 URL 中"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'student0', 'student0@example.com', 'pass12345', user_id='S00000', real_name='学生0'
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def issue_ticket(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post('/api/notifications/stream/ticket/')
+        self.assertEqual(response.status_code, 200)
+        return response.data['ticket']
+
+    def test_wsgi_returns_501(self):
+        response = self.client.get('/api/notifications/stream/', {'ticket': self.issue_ticket()})
+        self.assertEqual(response.status_code, 501)
+
+    def test_ticket_requires_authentication(self):
+        self.assertEqual(APIClient().post('/api/notifications/stream/ticket/').status_code, 401)
+
+    async def test_ticket_is_single_use(self):
+        ticket = await sync_to_async(self.issue_ticket)()
+        client = AsyncClient()
+
+        response = await client.get('/api/notifications/stream/', {'ticket': ticket})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = response.streaming_content
+        self.assertTrue((await anext(stream)).startswith(b'retry:'))
+        self.assertIn(b'event: ready', await anext(stream))
+        await stream.aclose()
+
+        reused = await client.get('/api/notifications/stream/', {'ticket': ticket})
+        self.assertEqual(reused.status_code, 401)
+
+    async def test_access_token_in_query_string_is_rejected(self):
+        response = await AsyncClient().get('/api/notifications/stream/', {'token': 'any-access-token'})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_published_events_reach_the_stream(self):
+        ticket = await sync_to_async(self.issue_ticket)()
+        response = await AsyncClient().get('/api/notifications/stream/', {'ticket': ticket})
+        stream = response.streaming_content
+        await anext(stream)
+        await anext(stream)
+
+        get_event_backend().publish([self.user.pk], {'type': 'message', 'data': {'conversation_id': 1}})
+        self.assertIn(b'event: message', await anext(stream))
+        await stream.aclose()
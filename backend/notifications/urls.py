@@ -9,7 +9,11 @@ from .views import (
     MarkAsRead,
     MarkAllAsRead,
     UnreadCount,
+    BroadcastDetail,
+    MarkBroadcastAsRead,
+    StreamTicket,
 )
+from .stream import event_stream
 
 app_name = 'notifications'
 
@@ -28,5 +32,13 @@ urlpatterns = [
     
     # 未读数量
     path('api/notifications/unread-count/', UnreadCount.as_view(), name='unread-count'),
+    
+    # 广播通知详情（查看时自动标记为已读）与标记已读
+    path('api/notifications/broadcasts/<int:broadcast_id>/', BroadcastDetail.as_view(), name='broadcast-detail'),
+    path('api/notifications/broadcasts/<int:broadcast_id>/read/', MarkBroadcastAsRead.as_view(), name='mark-broadcast-as-read'),
+
+    # 实时事件推送（SSE，需 ASGI 部署）：先换取一次性票据，再以票据建立连接
+    path('api/notifications/stream/ticket/', StreamTicket.as_view(), name='stream-ticket'),
+    path('api/notifications/stream/', event_stream, name='event-stream'),
 ]
 
@@ -2,43 +2,34 @@
 学生助教管理平台 - 通知系统模块视图
 """
 
-from rest_framework import generics, permissions, filters
+from rest_framework import generics, permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q, Count
-from django.utils import timezone
-from django.db import transaction
-from .models import Notification
-from .serializers import NotificationSerializer, NotificationListSerializer
+from django.shortcuts import get_object_or_404
+from accounts.rbac import get_request_roles
+from .models import Notification, BroadcastNotification
+from .serializers import NotificationSerializer, NotificationFeedSerializer, BroadcastNotificationSerializer
+from .feed import notification_feed, unread_counts, mark_all_read
+from .stream import issue_stream_ticket
 
 
 class NotificationList(generics.ListAPIView):
     """
-    通知列表
+    通知列表（个人通知与广播通知合并）
     GET /api/notifications/
     支持筛选：is_read, category, notification_type
     支持排序：-created_at
     """
     permission_classes = [permissions.IsAuthenticated]
-    serializer_class = NotificationListSerializer
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
-    filterset_fields = ['is_read', 'category', 'notification_type']
-    ordering_fields = ['created_at']
-    ordering = ['-created_at']
+    serializer_class = NotificationFeedSerializer
     
     def get_queryset(self):
-        """获取当前用户的通知列表"""
-        queryset = Notification.objects.filter(
-            recipient=self.request.user
-        ).select_related('sender')
-        
-        # 过滤过期通知（可选，根据需求决定是否显示过期通知）
-        # queryset = queryset.filter(
-        #     Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now())
-        # )
-        
-        return queryset
+        """获取当前用户的通知流（筛选条件分别作用于两侧后 UNION）"""
+        return notification_feed(
+            self.request.user,
+            get_request_roles(self.request).role_codes,
+            self.request.query_params,
+        )
 
 
 class NotificationDetail(generics.RetrieveAPIView):
@@ -103,15 +94,8 @@ class MarkAllAsRead(APIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def post(self, request):
-        """将当前用户的所有未读通知标记为已读"""
-        now = timezone.now()
-        updated_count = Notification.objects.filter(
-            recipient=request.user,
-            is_read=False
-        ).update(
-            is_read=True,
-            read_at=now
-        )
+        """将当前用户的所有未读通知（含广播）标记为已读"""
+        updated_count = mark_all_read(request.user, get_request_roles(request).role_codes)
         
         return Response({
             'updated_count': updated_count,
@@ -127,24 +111,12 @@ class UnreadCount(APIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get(self, request):
-        """获取当前用户的未读通知数量"""
-        count = Notification.objects.filter(
-            recipient=request.user,
-            is_read=False
-        ).count()
-        
+        """获取当前用户的未读通知数量（含广播）"""
         # 按分类统计未读数量
-        category_counts = Notification.objects.filter(
-            recipient=request.user,
-            is_read=False
-        ).values('category').annotate(
-            count=Count('notification_id')
-        )
-        
-        category_dict = {item['category']: item['count'] for item in category_counts}
+        category_dict = unread_counts(request.user, get_request_roles(request).role_codes)
         
         return Response({
-            'total_unread': count,
+            'total_unread': sum(category_dict.values()),
             'by_category': {
                 'system': category_dict.get('system', 0),
                 'application': category_dict.get('application', 0),
@@ -152,3 +124,59 @@ class UnreadCount(APIView):
                 'salary': category_dict.get('salary', 0),
             },
         })
+
+
+class BroadcastDetail(APIView):
+    """
+    广播通知详情（查看时自动标记为已读）
+    GET /api/notifications/broadcasts/{broadcast_id}/
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, broadcast_id):
+        broadcasts = BroadcastNotification.objects.visible_to(
+            request.user, get_request_roles(request).role_codes
+        ).select_related('sender')
+        broadcast = get_object_or_404(broadcasts, broadcast_id=broadcast_id)
+        broadcast.mark_as_read(request.user)
+        broadcast = broadcasts.with_read_state(request.user).get(broadcast_id=broadcast_id)
+        return Response(BroadcastNotificationSerializer(broadcast).data)
+
+
+class MarkBroadcastAsRead(APIView):
+    """
+    标记广播通知为已读
+    POST /api/notifications/broadcasts/{broadcast_id}/read/
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, broadcast_id):
+        broadcast = BroadcastNotification.objects.visible_to(
+            request.user, get_request_roles(request).role_codes
+        ).filter(broadcast_id=broadcast_id).first()
+
+        if not broadcast:
+            return Response(
+                {'detail': '通知不存在或无权访问'},
+                status=404
+            )
+
+        receipt = broadcast.mark_as_read(request.user)
+        return Response({
+            'broadcast_id': broadcast.broadcast_id,
+            'is_read': True,
+            'read_at': receipt.read_at,
+        })
+
+
+class StreamTicket(APIView):
+    """
+    实时推送连接票据（短时、一次性）
+    POST /api/notifications/stream/ticket/
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        """以当前 JWT 换取票据，前端随后以 ?ticket= 建立 SSE 连接（访问令牌不出现在 URL 中）"""
+        ticket, expires_in = issue_stream_ticket(request.user)
+        return Response({'ticket': ticket, 'expires_in': expires_in})
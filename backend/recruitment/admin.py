@@ -4,7 +4,9 @@
 
 from django.contrib import admin
 from django.utils.html import format_html
+from dashboard.invalidation import bump_generation
 from .models import Position
+from .services import invalidate_faculty_dashboard
 
 
 @admin.register(Position)
@@ -71,13 +73,22 @@ class PositionAdmin(admin.ModelAdmin):
     
     def batch_close(self, request, queryset):
         """批量关闭岗位"""
+        faculty_ids = set(queryset.values_list('posted_by_id', flat=True))
         updated = queryset.update(status='closed')
+        if updated:
+            bump_generation('positions')
+            invalidate_faculty_dashboard(*faculty_ids)
         self.message_user(request, f'成功关闭 {updated} 个岗位')
     batch_close.short_description = '关闭选中的岗位'
     
     def batch_reopen(self, request, queryset):
         """批量重新开放岗位"""
+        faculty_ids = set(queryset.values_list('posted_by_id', flat=True))
         updated = queryset.update(status='open')
+        if updated:
+            bump_generation('positions')
+            invalidate_faculty_dashboard(*faculty_ids)
+            Position.reset_status_watermark()
         self.message_user(request, f'成功重新开放 {updated} 个岗位')
     batch_reopen.short_description = '重新开放选中的岗位'
     
@@ -0,0 +1,84 @@
+"""
+学生助教管理平台 - 学生端岗位目录读缓存
+
+岗位列表/详情按"目录版本"缓存，版本由两部分组成：
+- positions 指标代数：岗位任何写入（信号、批量 update 的调用方）都会递增，见 dashboard.invalidation
+- 到期水位线：实际开放岗位中最早因时间到期而关闭的时间点；越过该时间点后即使没有写入，
+  列表中的岗位状态也会变化，因此水位线同样参与版本号
+
+响应带强 ETag（由版本号与请求参数得出，无需查询数据库或序列化即可计算）与 Last-Modified，
+客户端携带 If-None-Match / If-Modified-Since 重新验证时直接返回 304。
+"""
+
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, urlencode
+from rest_framework.response import Response
+
+from dashboard.invalidation import get_generations
+from .models import Position
+
+
+CATALOG_CACHE_TTL = 300          # 秒，兜底过期时间（代数已覆盖写入失效）
+WATERMARK_CACHE_TTL = 24 * 3600  # 秒
+CATALOG_KEY = 'recruitment:catalog:{digest}'
+WATERMARK_KEY = 'recruitment:catalog:watermark:{generation}'
+
+
+def catalog_version():
+    """当前目录版本号；同一代数内只有越过水位线时才查询一次数据库"""
+    generation = get_generations(['positions'])['positions']
+    key = WATERMARK_KEY.format(generation=generation)
+    watermark = cache.get(key)
+    # 空字符串表示当前没有开放岗位
+    if watermark is None or (watermark and timezone.now() >= watermark):
+        watermark = Position.compute_status_watermark(
+            Position.objects.filter_effective_status('open')
+        ) or ''
+        cache.set(key, watermark, WATERMARK_CACHE_TTL)
+    stamp = int(watermark.timestamp()) if watermark else 0
+    return f'{generation}.{stamp}'
+
+
+class CatalogCacheMixin:
+    """
+    GET 响应按目录版本缓存（只缓存 200），并支持条件请求
+    缓存键包含视图、路径与全部查询参数（筛选、检索、排序、分页），与用户无关
+    """
+
+    catalog_cache_timeout = CATALOG_CACHE_TTL
+
+    def catalog_cache_key(self, request):
+        params = urlencode(sorted(request.query_params.lists()), doseq=True)
+        raw = ':'.join([
+            type(self).__name__, catalog_version(), request.get_host(), request.path, params,
+        ])
+        return CATALOG_KEY.format(digest=hashlib.sha1(raw.encode('utf-8')).hexdigest())
+
+    def get(self, request, *args, **kwargs):
+        key = self.catalog_cache_key(request)
+        etag = f'"{key.rsplit(":", 1)[1]}"'
+        cached = cache.get(key)
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=cached['last_modified'] if cached else None
+        )
+        if not_modified is not None:
+            return not_modified
+
+        if cached is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            cached = {'data': response.data, 'last_modified': int(time.time())}
+            cache.set(key, cached, self.catalog_cache_timeout)
+
+        response = Response(cached['data'])
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(cached['last_modified'])
+        # 浏览器可缓存，但每次使用前须重新验证（命中时为 304）
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
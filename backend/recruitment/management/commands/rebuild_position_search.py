@@ -0,0 +1,20 @@
+"""
+重建岗位全文索引
+岗位保存/删除时索引由信号自动同步；绕过信号的批量写入（如 QuerySet.update 修改标题）或
+手工导入数据后执行本命令全量重建。MySQL FULLTEXT 索引由数据库自动维护，无需重建
+"""
+
+from django.core.management.base import BaseCommand
+
+from recruitment.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = '重建岗位全文索引（SQLite FTS5）'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        count = backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ 检索后端 {type(backend).__name__}：已索引 {count} 个岗位'
+        ))
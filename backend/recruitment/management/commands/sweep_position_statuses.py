@@ -0,0 +1,26 @@
+"""
+清扫到期岗位：将申请截止/结束日期已过或已招满的岗位置为 closed
+建议由 cron 等定时任务每分钟执行；未到下一个到期时间点时不访问数据库
+"""
+
+from django.core.management.base import BaseCommand
+
+from recruitment.models import Position
+
+
+class Command(BaseCommand):
+    help = '清扫到期岗位状态（--force 忽略水位线强制刷新）'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='忽略水位线，强制刷新全部岗位状态'
+        )
+
+    def handle(self, *args, **options):
+        updated = Position.sweep_statuses(force=options['force'])
+        if updated is None:
+            self.stdout.write('未到下一个岗位到期时间，跳过')
+            return
+        self.stdout.write(self.style.SUCCESS(f'✅ 已关闭 {updated} 个到期岗位'))
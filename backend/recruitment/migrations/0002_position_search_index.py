@@ -0,0 +1,52 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:40
+
+from django.db import migrations
+from django.db.utils import OperationalError
+
+
+def create_search_index(apps, schema_editor):
+    """
+    按数据库创建岗位全文索引（与 recruitment.search 中的检索后端对应）：
+    - SQLite：FTS5 trigram 虚拟表 position_search，并以现有岗位回填
+    - MySQL：position 表上的 FULLTEXT ngram 索引
+    SQLite 不支持 FTS5/trigram（3.34 以下）时跳过，检索自动退回模糊匹配
+    """
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            try:
+                cursor.execute(
+                    "CREATE VIRTUAL TABLE position_search USING fts5("
+                    "title, course_name, description, tokenize='trigram')"
+                )
+            except OperationalError:
+                return
+            cursor.execute(
+                'INSERT INTO position_search (rowid, title, course_name, description) '
+                'SELECT position_id, title, course_name, description FROM position'
+            )
+        elif connection.vendor == 'mysql':
+            cursor.execute(
+                'ALTER TABLE position ADD FULLTEXT INDEX position_fulltext '
+                '(title, course_name, description) WITH PARSER ngram'
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('DROP TABLE IF EXISTS position_search')
+        elif connection.vendor == 'mysql':
+            cursor.execute('ALTER TABLE position DROP INDEX position_fulltext')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0002_position_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='position',
+            index=models.Index(fields=['status', 'application_deadline'], name='position_status_693a78_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='position',
+            index=models.Index(fields=['posted_by', 'created_at'], name='position_posted__3ce7b4_idx'),
+        ),
+        # 先建复合索引再删除被其前缀覆盖的单列索引（MySQL 外键列必须始终有索引）
+        migrations.RemoveIndex(
+            model_name='position',
+            name='position_status_62178f_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='position',
+            name='position_posted__1edb08_idx',
+        ),
+    ]
@@ -3,14 +3,89 @@
 包含：Position（岗位表）
 """
 
+from datetime import datetime, time, timedelta
+
 from django.db import models
+from django.core.cache import cache
 from django.core.validators import MinValueValidator
 from django.conf import settings
 from django.utils import timezone
 
+from dashboard.invalidation import bump_generation
+from TeachingAssistant.mixins import FieldTrackerMixin
+
+
+# 下一次需要关闭岗位的时间点（状态清扫水位线）
+NEXT_STATUS_CHANGE_CACHE_KEY = 'recruitment:position:next_status_change'
+
+
+def _now_and_today():
+    now = timezone.now()
+    # 兼容 USE_TZ=False（timezone.localdate 会对 naive datetime 抛错）
+    return now, now.date()
+
+
+def expired_q(now=None, today=None):
+    """
+    应视为已关闭的岗位条件（与 refresh_statuses 口径一致）：
+    - open 且申请截止时间已过或结束日期已过
+    - open/filled 且已招满
+    """
+    if now is None:
+        now, today = _now_and_today()
+    return (
+        models.Q(status='open', application_deadline__lt=now)
+        | models.Q(status='open', end_date__lt=today)
+        | models.Q(status__in=['open', 'filled'], num_filled__gte=models.F('num_positions'))
+    )
+
+
+def status_change_at(application_deadline, end_date):
+    """开放岗位因时间到期而关闭的时间点：申请截止时间与结束日期次日零点中较早者"""
+    candidates = [application_deadline]
+    if end_date:
+        candidates.append(datetime.combine(end_date + timedelta(days=1), time.min))
+    candidates = [c for c in candidates if c is not None]
+    return min(candidates) if candidates else None
+
+
+def effective_open_q(now=None, today=None):
+    """当前实际开放中的岗位条件（可直接走索引过滤）"""
+    if now is None:
+        now, today = _now_and_today()
+    return models.Q(
+        status='open',
+        application_deadline__gte=now,
+        end_date__gte=today,
+        num_filled__lt=models.F('num_positions'),
+    )
+
+
+class PositionQuerySet(models.QuerySet):
+    """岗位查询集：在查询时计算实际状态，读接口无需先批量写库"""
+
+    def with_effective_status(self):
+        """注解 effective_status：到期/招满的岗位即使尚未被清扫也视为 closed"""
+        return self.annotate(
+            effective_status=models.Case(
+                models.When(expired_q(), then=models.Value('closed')),
+                default=models.F('status'),
+                output_field=models.CharField(max_length=20),
+            )
+        )
+
+    def filter_effective_status(self, status):
+        """按实际状态过滤"""
+        if status == 'open':
+            return self.filter(effective_open_q())
+        return self.with_effective_status().filter(effective_status=status)
+
 
-class Position(models.Model):
+class Position(FieldTrackerMixin, models.Model):
     """岗位表 - 存储教师发布的助教岗位信息"""
+
+    # 发布教师变更时原发布教师的看板缓存同样需要失效
+    tracked_fields = ('posted_by',)
     
     # 岗位状态选择
     STATUS_CHOICES = [
@@ -90,14 +165,18 @@ class Position(models.Model):
         verbose_name='更新时间'
     )
     
+    objects = PositionQuerySet.as_manager()
+
     class Meta:
         db_table = 'position'
         verbose_name = '岗位'
         verbose_name_plural = '岗位'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['status']),
-            models.Index(fields=['posted_by']),
+            # 学生端目录 / 到期清扫 / 水位线：status='open' AND application_deadline 范围
+            models.Index(fields=['status', 'application_deadline']),
+            # 教师端岗位列表与看板：posted_by=? ORDER BY created_at DESC
+            models.Index(fields=['posted_by', 'created_at']),
             models.Index(fields=['course_code']),
             models.Index(fields=['application_deadline']),
         ]
@@ -112,13 +191,29 @@ class Position(models.Model):
     def is_open(self):
         """判断岗位是否开放申请"""
         return self.status == 'open'
+
+    def get_effective_status(self):
+        """
+        实际状态：与 with_effective_status() 注解口径一致
+        已注解时直接使用注解值，否则按当前时间在内存中计算
+        """
+        if hasattr(self, 'effective_status'):
+            return self.effective_status
+        now, today = _now_and_today()
+        if self.status in ('open', 'filled') and self.is_full():
+            return 'closed'
+        if self.status == 'open' and (self.application_deadline < now or self.end_date < today):
+            return 'closed'
+        return self.status
     
     def save(self, *args, **kwargs):
         """
-        重写save方法，尽量保持状态与业务一致。
+        重写save方法，保存时按当前时间校正状态（招满或到期即关闭）。
 
-        注意：岗位“到期”属于时间触发事件，单靠 save 无法自动发生；
-        需配合 `refresh_statuses()` 在查询/定时任务中批量刷新。
+        注意：岗位“到期”属于时间触发事件，单靠 save 无法自动发生。读接口通过
+        `with_effective_status()` / `filter_effective_status()` 在查询时计算实际状态，不写库；
+        数据库中的 status 由定时任务调用 `sweep_statuses()` 批量刷新。
+        保存后仍开放的岗位若比清扫水位线更早到期，则清除水位线。
         """
         if self.status == 'open':
             # 1) 招满：统一视为关闭（避免教师端仍显示 open）
@@ -134,23 +229,71 @@ class Position(models.Model):
                 elif self.end_date and self.end_date < today:
                     self.status = 'closed'
         super().save(*args, **kwargs)
+        if self.status == 'open':
+            self.lower_status_watermark(self.next_status_change_at())
 
     @classmethod
     def refresh_statuses(cls):
         """
-        批量刷新岗位状态（无副作用查询前可调用）：
+        批量刷新岗位状态（由 sweep_position_statuses 定时调用，读接口不再调用）：
         - 申请截止时间已过 → closed
         - 结束日期已过 → closed
         - 招满（num_filled >= num_positions）→ closed
         - 历史遗留 filled → closed（统一口径）
+        返回更新的行数
         """
-        now = timezone.now()
-        # 兼容 USE_TZ=False（timezone.localdate 会对 naive datetime 抛错）
-        today = now.date()
+        now, today = _now_and_today()
 
         # 截止时间已过
-        cls.objects.filter(status='open', application_deadline__lt=now).update(status='closed')
+        updated = cls.objects.filter(status='open', application_deadline__lt=now).update(status='closed')
         # 结束日期已过
-        cls.objects.filter(status='open', end_date__lt=today).update(status='closed')
+        updated += cls.objects.filter(status='open', end_date__lt=today).update(status='closed')
         # 招满（open 或历史 filled）
-        cls.objects.filter(status__in=['open', 'filled'], num_filled__gte=models.F('num_positions')).update(status='closed')
+        updated += cls.objects.filter(status__in=['open', 'filled'], num_filled__gte=models.F('num_positions')).update(status='closed')
+        # 批量 update 不触发信号，手动使看板缓存失效
+        if updated:
+            bump_generation('positions')
+        return updated
+
+    def next_status_change_at(self):
+        """该岗位因时间到期而关闭的时间点"""
+        return status_change_at(self.application_deadline, self.end_date)
+
+    @classmethod
+    def compute_status_watermark(cls, queryset=None):
+        """开放岗位中最早的到期时间点（无开放岗位时为 None）；默认取 status 为 open 的岗位"""
+        if queryset is None:
+            queryset = cls.objects.filter(status='open')
+        row = queryset.aggregate(
+            deadline=models.Min('application_deadline'),
+            end_date=models.Min('end_date'),
+        )
+        return status_change_at(row['deadline'], row['end_date'])
+
+    @classmethod
+    def lower_status_watermark(cls, moment):
+        """新开放/修改的岗位到期更早时，清除水位线，下次清扫重新计算"""
+        watermark = cache.get(NEXT_STATUS_CHANGE_CACHE_KEY)
+        if watermark is not None and (not watermark or moment < watermark):
+            cache.delete(NEXT_STATUS_CHANGE_CACHE_KEY)
+
+    @classmethod
+    def reset_status_watermark(cls):
+        """批量重新开放岗位等绕过 save 的写入后调用"""
+        cache.delete(NEXT_STATUS_CHANGE_CACHE_KEY)
+
+    @classmethod
+    def sweep_statuses(cls, force=False):
+        """
+        清扫到期岗位：未到水位线时直接返回 None（不访问数据库）
+        否则刷新状态并重新计算水位线，返回更新的行数
+        """
+        now, _today = _now_and_today()
+        watermark = cache.get(NEXT_STATUS_CHANGE_CACHE_KEY)
+        if not force and watermark is not None and (not watermark or now < watermark):
+            return None
+
+        updated = cls.refresh_statuses()
+        # 空字符串表示当前没有开放岗位
+        cache.set(NEXT_STATUS_CHANGE_CACHE_KEY, cls.compute_status_watermark() or '', None)
+        return updated
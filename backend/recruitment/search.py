@@ -0,0 +1,204 @@
+"""
+学生助教管理平台 - 岗位全文检索
+按数据库选择检索后端：
+- SQLite：FTS5 虚拟表 position_search（trigram 分词，适用于中文），由 Position 保存/删除信号同步
+- MySQL：position 表上的 FULLTEXT 索引（ngram 分词），由 MySQL 自动维护
+- 其他情况（全文索引不可用）：退回 icontains 模糊匹配
+检索结果带有 search_rank 注解（数值越大越相关）
+"""
+
+import threading
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+from rest_framework import filters
+
+
+SQLITE_SEARCH_TABLE = 'position_search'
+# 参与检索的字段及其在相关度中的权重（标题 > 课程名 > 描述）
+SEARCH_FIELDS = (('title', 10.0), ('course_name', 5.0), ('description', 1.0))
+SEARCH_FIELD_NAMES = frozenset(name for name, _weight in SEARCH_FIELDS)
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def _like_q(terms, fields):
+    """每个检索词须出现在任一字段中（与 DRF SearchFilter 的 icontains 语义一致）"""
+    condition = Q()
+    for term in terms:
+        term_q = Q()
+        for field in fields:
+            term_q |= Q(**{f'{field}__icontains': term})
+        condition &= term_q
+    return condition
+
+
+class BaseSearchBackend:
+    """检索后端接口"""
+
+    # 全文索引能匹配的最短检索词长度，更短的检索词退回模糊匹配
+    min_term_length = 1
+
+    def search(self, queryset, terms):
+        """按检索词过滤岗位并注解 search_rank"""
+        raise NotImplementedError
+
+    def index(self, position):
+        """新增/更新岗位后同步索引"""
+
+    def remove(self, position_id):
+        """删除岗位后同步索引"""
+
+    def rebuild(self):
+        """重建全部索引，返回索引的岗位数"""
+        return 0
+
+    def split_terms(self, terms):
+        """拆分为可走全文索引的检索词与需要模糊匹配的短检索词"""
+        indexed = [term for term in terms if len(term) >= self.min_term_length]
+        short = [term for term in terms if len(term) < self.min_term_length]
+        return indexed, short
+
+
+class LikeSearchBackend(BaseSearchBackend):
+    """无全文索引时的回退：icontains 模糊匹配（全表扫描，不排序）"""
+
+    def search(self, queryset, terms):
+        fields = [name for name, _weight in SEARCH_FIELDS]
+        return queryset.filter(_like_q(terms, fields)).annotate(
+            search_rank=Value(0.0, output_field=FloatField())
+        )
+
+
+class SQLiteFTS5SearchBackend(BaseSearchBackend):
+    """SQLite FTS5 trigram 检索：rowid 即 position_id，相关度取 bm25（取负值使越大越相关）"""
+
+    # trigram 分词至少需要 3 个字符
+    min_term_length = 3
+
+    @staticmethod
+    def match_expression(terms):
+        # 每个检索词作为短语匹配，多个检索词之间为 AND
+        return ' '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+    def search(self, queryset, terms):
+        indexed, short = self.split_terms(terms)
+        if not indexed:
+            return LikeSearchBackend().search(queryset, terms)
+
+        match = self.match_expression(indexed)
+        weights = ', '.join(str(weight) for _name, weight in SEARCH_FIELDS)
+        table = queryset.model._meta.db_table
+        queryset = queryset.filter(
+            pk__in=RawSQL(
+                f'SELECT rowid FROM {SQLITE_SEARCH_TABLE} WHERE {SQLITE_SEARCH_TABLE} MATCH %s', [match]
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f'(SELECT -bm25({SQLITE_SEARCH_TABLE}, {weights}) FROM {SQLITE_SEARCH_TABLE} '
+                f'WHERE {SQLITE_SEARCH_TABLE} MATCH %s AND rowid = "{table}"."position_id")',
+                [match],
+                output_field=FloatField(),
+            )
+        )
+        if short:
+            queryset = queryset.filter(_like_q(short, [name for name, _weight in SEARCH_FIELDS]))
+        return queryset
+
+    def index(self, position):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SQLITE_SEARCH_TABLE} WHERE rowid = %s', [position.pk])
+            cursor.execute(
+                f'INSERT INTO {SQLITE_SEARCH_TABLE} (rowid, title, course_name, description) '
+                'VALUES (%s, %s, %s, %s)',
+                [position.pk, position.title, position.course_name, position.description],
+            )
+
+    def remove(self, position_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SQLITE_SEARCH_TABLE} WHERE rowid = %s', [position_id])
+
+    def rebuild(self):
+        return rebuild_sqlite_index(connection)
+
+
+class MySQLFulltextSearchBackend(BaseSearchBackend):
+    """MySQL FULLTEXT（ngram 分词）检索：索引由 MySQL 随 position 表自动维护"""
+
+    # 与 MySQL 默认 ngram_token_size 一致
+    min_term_length = 2
+
+    @staticmethod
+    def match_expression(terms):
+        # 布尔模式：每个检索词都必须出现（短语匹配）
+        return ' '.join('+"{}"'.format(term.replace('"', ' ')) for term in terms)
+
+    def search(self, queryset, terms):
+        indexed, short = self.split_terms(terms)
+        if not indexed:
+            return LikeSearchBackend().search(queryset, terms)
+
+        match = self.match_expression(indexed)
+        columns = ', '.join(name for name, _weight in SEARCH_FIELDS)
+        # WHERE MATCH(...) > 0 可直接使用 FULLTEXT 索引
+        queryset = queryset.annotate(
+            search_rank=RawSQL(
+                f'MATCH ({columns}) AGAINST (%s IN BOOLEAN MODE)', [match], output_field=FloatField()
+            )
+        ).filter(search_rank__gt=0)
+        if short:
+            queryset = queryset.filter(_like_q(short, [name for name, _weight in SEARCH_FIELDS]))
+        return queryset
+
+
+def rebuild_sqlite_index(conn):
+    """以 position 表全量重建 FTS5 索引（迁移与 rebuild_position_search 命令共用）"""
+    with conn.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SQLITE_SEARCH_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {SQLITE_SEARCH_TABLE} (rowid, title, course_name, description) '
+            'SELECT position_id, title, course_name, description FROM position'
+        )
+        cursor.execute(f'SELECT COUNT(*) FROM {SQLITE_SEARCH_TABLE}')
+        return cursor.fetchone()[0]
+
+
+def _default_backend_path():
+    """按数据库自动选择：SQLite 需存在 FTS5 表（旧版 SQLite 不支持 trigram 时迁移会跳过建表）"""
+    if connection.vendor == 'sqlite':
+        if SQLITE_SEARCH_TABLE in connection.introspection.table_names():
+            return 'recruitment.search.SQLiteFTS5SearchBackend'
+    elif connection.vendor == 'mysql':
+        return 'recruitment.search.MySQLFulltextSearchBackend'
+    return 'recruitment.search.LikeSearchBackend'
+
+
+def get_search_backend():
+    """当前进程的岗位检索后端（单例）；可通过 POSITION_SEARCH_BACKEND 显式指定"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                path = getattr(settings, 'POSITION_SEARCH_BACKEND', None) or _default_backend_path()
+                _backend = import_string(path)()
+    return _backend
+
+
+class PositionSearchFilter(filters.SearchFilter):
+    """
+    ?search= 走全文检索后端；未显式指定 ?ordering= 时按相关度排序
+    检索字段固定为 SEARCH_FIELDS（与全文索引一致），视图无需也不应声明 search_fields
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        queryset = get_search_backend().search(queryset, terms)
+        if not request.query_params.get('ordering'):
+            queryset = queryset.order_by('-search_rank', '-created_at')
+        return queryset
@@ -4,6 +4,7 @@ from .models import Position
 
 class PositionListSerializer(serializers.ModelSerializer):
     posted_by_name = serializers.CharField(source='posted_by.real_name', read_only=True)
+    status = serializers.CharField(source='get_effective_status', read_only=True)
 
     class Meta:
         model = Position
@@ -16,6 +17,7 @@ class PositionListSerializer(serializers.ModelSerializer):
 
 class PositionDetailSerializer(serializers.ModelSerializer):
     posted_by_name = serializers.CharField(source='posted_by.real_name', read_only=True)
+    status = serializers.CharField(source='get_effective_status', read_only=True)
 
     class Meta:
         model = Position
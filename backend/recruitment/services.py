@@ -0,0 +1,162 @@
+"""
+学生助教管理平台 - 招募管理模块业务服务
+包含：教师看板统计（按教师缓存，岗位/申请/工时变更时失效）、学生看板统计（按用户短时缓存）
+"""
+
+from datetime import timedelta
+
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from dashboard.invalidation import bump_generation, get_or_compute, versioned_key
+from application.models import Application
+from timesheet.models import Timesheet
+from .caching import catalog_version
+from .models import Position, effective_open_q, status_change_at
+
+
+FACULTY_DASHBOARD_TTL = 300  # 秒；写入由代数失效，TTL 只兜底非信号路径
+USER_DASHBOARD_TTL = 60      # 秒；学生/助教看板短时缓存（"最近一个月"等按时间变化的内容以此为上限）
+PENDING_APPLICATION_STATUSES = ['submitted', 'reviewing']
+
+
+def faculty_dashboard_metric(faculty_id):
+    """教师看板的缓存代数指标（每位教师独立，互不影响）"""
+    return f'faculty_dashboard:{faculty_id}'
+
+
+def invalidate_faculty_dashboard(*faculty_ids):
+    """使指定教师的看板缓存失效"""
+    bump_generation(*(faculty_dashboard_metric(faculty_id) for faculty_id in set(faculty_ids) if faculty_id))
+
+
+def user_dashboard_metric(user_id):
+    """学生/助教看板的缓存代数指标（按用户）"""
+    return f'user_dashboard:{user_id}'
+
+
+def invalidate_user_dashboard(*user_ids):
+    """使指定学生/助教的看板缓存失效（其申请、工时、薪酬变更时调用）"""
+    bump_generation(*(user_dashboard_metric(user_id) for user_id in set(user_ids) if user_id))
+
+
+def position_owner_id(instance):
+    """岗位/申请/工时所属的发布教师ID（岗位已加载时不查询）"""
+    if isinstance(instance, Position):
+        return instance.posted_by_id
+    if type(instance).position.is_cached(instance):
+        return instance.position.posted_by_id
+    return Position.objects.filter(pk=instance.position_id).values_list('posted_by_id', flat=True).first()
+
+
+def _faculty_statistics(user):
+    """每张表一次条件聚合查询，返回 (统计字典, 下一个岗位到期时间点)"""
+    positions = Position.objects.filter(posted_by=user).with_effective_status().aggregate(
+        total_positions=Count('pk'),
+        open_positions=Count('pk', filter=effective_open_q()),
+        closed_positions=Count('pk', filter=Q(effective_status='closed')),
+        filled_positions=Count('pk', filter=Q(effective_status='filled')),
+        next_deadline=Min('application_deadline', filter=effective_open_q()),
+        next_end_date=Min('end_date', filter=effective_open_q()),
+    )
+    applications = Application.objects.filter(position__posted_by=user).aggregate(
+        total_applications=Count('pk'),
+        pending_applications=Count('pk', filter=Q(status__in=PENDING_APPLICATION_STATUSES)),
+        accepted_applications=Count('pk', filter=Q(status='accepted')),
+        rejected_applications=Count('pk', filter=Q(status='rejected')),
+        active_tas=Count('applicant', filter=Q(status='accepted'), distinct=True),
+    )
+    timesheets = Timesheet.objects.filter(position__posted_by=user).aggregate(
+        pending_timesheets=Count('pk', filter=Q(status='pending')),
+    )
+    next_change = status_change_at(positions.pop('next_deadline'), positions.pop('next_end_date'))
+    return {**positions, **applications, **timesheets}, next_change
+
+
+def build_faculty_dashboard(user):
+    """教师看板数据：统计 3 次聚合查询 + 最近岗位/申请/待审核工时 3 次查询"""
+    from application.serializers import ApplicationListSerializer
+    from timesheet.serializers import TimesheetListSerializer
+    from .serializers import PositionListSerializer
+
+    statistics, next_change = _faculty_statistics(user)
+
+    recent_positions = Position.objects.filter(
+        posted_by=user
+    ).with_effective_status().select_related('posted_by')[:3]
+    recent_applications = Application.objects.filter(
+        position__posted_by=user
+    ).select_related('applicant', 'position')[:5]
+    recent_timesheets = Timesheet.objects.filter(
+        position__posted_by=user,
+        status='pending'
+    ).with_salary_amount().select_related('position', 'ta')[:5]
+
+    return {
+        'statistics': statistics,
+        'recent_positions': PositionListSerializer(recent_positions, many=True).data,
+        'recent_applications': ApplicationListSerializer(recent_applications, many=True).data,
+        'recent_timesheets': TimesheetListSerializer(recent_timesheets, many=True).data,
+    }, next_change
+
+
+def _faculty_dashboard_timeout(result):
+    """有开放岗位时，缓存不超过最早的到期时间点（到期后开放/关闭统计随之变化）"""
+    _data, next_change = result
+    if next_change is None:
+        return FACULTY_DASHBOARD_TTL
+    remaining = (next_change - timezone.now()).total_seconds()
+    return max(1, min(FACULTY_DASHBOARD_TTL, int(remaining)))
+
+
+def faculty_dashboard(user):
+    """
+    教师看板（按教师缓存，与学生/助教看板相同的单飞回源）
+    - 缓存键包含该教师的看板代数：其岗位、岗位下的申请与工时写入时递增
+    - 缓存时长见 _faculty_dashboard_timeout
+    """
+    cache_key = versioned_key(f'dashboard:faculty:{user.pk}', [faculty_dashboard_metric(user.pk)])
+    data, _next_change = get_or_compute(
+        cache_key, lambda: build_faculty_dashboard(user), _faculty_dashboard_timeout
+    )
+    return data
+
+
+def build_student_dashboard(user):
+    """学生看板数据：可申请岗位数 1 次、申请条件聚合 1 次、最近岗位/申请各 1 次"""
+    from application.serializers import ApplicationListSerializer
+    from .serializers import PositionListSerializer
+
+    # 可申请岗位数与列表页面口径一致：按实际状态开放
+    open_positions = Position.objects.filter_effective_status('open')
+    statistics = {'available_positions': open_positions.count()}
+    statistics.update(Application.objects.filter(applicant=user).aggregate(
+        total_applications=Count('pk'),
+        pending_applications=Count('pk', filter=Q(status__in=PENDING_APPLICATION_STATUSES)),
+        accepted_applications=Count('pk', filter=Q(status='accepted')),
+        rejected_applications=Count('pk', filter=Q(status='rejected')),
+    ))
+
+    # 最近一个月发布的开放岗位（最近5条）与我的最近申请（最近5条）
+    recent_positions = open_positions.filter(
+        created_at__gte=timezone.now() - timedelta(days=30)
+    ).select_related('posted_by').order_by('-created_at')[:5]
+    recent_applications = Application.objects.filter(
+        applicant=user
+    ).select_related('position', 'applicant').order_by('-applied_at')[:5]
+
+    return {
+        'statistics': statistics,
+        'recent_positions': PositionListSerializer(recent_positions, many=True).data,
+        'recent_applications': ApplicationListSerializer(recent_applications, many=True).data,
+    }
+
+
+def student_dashboard(user):
+    """
+    学生看板（按用户短时缓存）
+    缓存键包含岗位目录版本（岗位写入或到期时变化）与该学生的看板代数（其申请写入时递增）
+    """
+    prefix = f'dashboard:student:{user.pk}:{catalog_version()}'
+    cache_key = versioned_key(prefix, [user_dashboard_metric(user.pk)])
+    return get_or_compute(cache_key, lambda: build_student_dashboard(user), USER_DASHBOARD_TTL)
@@ -1,15 +1,16 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from .models import Position
-from notifications.models import Notification
-from accounts.models import User, Role
+from .search import SEARCH_FIELD_NAMES, get_search_backend
+from notifications.models import Notification, BroadcastNotification
+from accounts.models import Role
 
 
 @receiver(post_save, sender=Position)
 def on_position_published(sender, instance: Position, created: bool, **kwargs):
     """
     岗位发布通知
-    当新岗位创建且状态为open时，通知所有学生用户
+    当新岗位创建且状态为open时，通知所有学生用户（广播通知，存储一行）
     注意：信号处理中的异常不应该影响岗位创建，所以使用try-except包裹
     """
     if created and instance.status == 'open':
@@ -35,33 +36,18 @@ def on_position_published(sender, instance: Position, created: bool, **kwargs):
                     pass  # 通知失败不影响岗位创建
                 return
             
-            # 获取所有学生用户
-            students = User.objects.filter(userrole__role=student_role).distinct()
-            
-            # 为每个学生创建通知
-            notifications = []
-            for student in students:
-                notifications.append(
-                    Notification(
-                        recipient=student,
-                        sender=instance.posted_by,
-                        notification_type='position_published',
-                        category='system',
-                        title='新岗位发布',
-                        message=f'新岗位发布：{instance.title}（{instance.course_name}）',
-                        related_model='Position',
-                        related_object_id=instance.position_id,
-                        priority='medium',
-                    )
-                )
-            
-            # 批量创建通知（提高性能）
-            if notifications:
-                try:
-                    Notification.objects.bulk_create(notifications)
-                except Exception:
-                    # 批量创建失败，尝试单个创建（降级处理）
-                    pass
+            # 面向全体学生的广播通知只存一行，学生已读状态记录在回执表中
+            BroadcastNotification.objects.create(
+                audience_role=student_role.role_code,
+                sender=instance.posted_by,
+                notification_type='position_published',
+                category='system',
+                title='新岗位发布',
+                message=f'新岗位发布：{instance.title}（{instance.course_name}）',
+                related_model='Position',
+                related_object_id=instance.position_id,
+                priority='medium',
+            )
             
             # 同时通知发布者本人（岗位发布成功）
             try:
@@ -86,3 +72,18 @@ def on_position_published(sender, instance: Position, created: bool, **kwargs):
             # 不抛出异常，确保岗位创建成功
 
 
+@receiver(post_save, sender=Position)
+def sync_position_search_index(sender, instance: Position, update_fields=None, **kwargs):
+    """
+    岗位新增/修改后同步全文索引（与岗位写入处于同一事务，回滚时索引一并回滚）
+    只更新录用人数、状态等非检索字段（update_fields 与检索字段无交集）时跳过
+    """
+    if update_fields is not None and not SEARCH_FIELD_NAMES.intersection(update_fields):
+        return
+    get_search_backend().index(instance)
+
+
+@receiver(post_delete, sender=Position)
+def remove_position_search_index(sender, instance: Position, **kwargs):
+    """岗位删除后移除全文索引"""
+    get_search_backend().remove(instance.pk)
@@ -1,3 +1,412 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.utils import timezone
+
+from application.models import Application
+from timesheet.models import Timesheet
+from TeachingAssistant.testing import DashboardTestMixin
+from .models import NEXT_STATUS_CHANGE_CACHE_KEY, Position
+from .search import (
+    SQLITE_SEARCH_TABLE, LikeSearchBackend, MySQLFulltextSearchBackend, SQLiteFTS5SearchBackend,
+)
+from .services import FACULTY_DASHBOARD_TTL
+
+
+class StudentDashboardQueryCountTest(DashboardTestMixin, TestCase):
+    """学生看板：查询数固定，不随岗位与申请数增长"""
+
+    # 角色 1 + 岗位到期水位线 1 + 可申请岗位数 1 + 申请条件聚合 1 + 最近岗位 1 + 最近申请 1
+    EXPECTED_QUERIES = 6
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_roles()
+        cls.faculty = cls.create_faculty(0)
+        cls.student = cls.create_student(0)
+
+    def add_applications(self, start, count):
+        for index in range(start, start + count):
+            position = self.create_position(self.faculty, index)
+            Application.objects.create(
+                position=position, applicant=self.student,
+                status=['submitted', 'reviewing', 'accepted', 'rejected'][index % 4]
+            )
+
+    def get_dashboard(self):
+        self.client.force_authenticate(self.student)
+        response = self.client.get('/api/student/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_query_count_fixed_as_data_grows(self):
+        self.add_applications(0, 2)
+        cache.clear()
+        with self.assertNumQueries(self.EXPECTED_QUERIES):
+            small = self.get_dashboard()
+        self.assertEqual(small['statistics']['total_applications'], 2)
+
+        self.add_applications(2, 10)
+        cache.clear()
+        with self.assertNumQueries(self.EXPECTED_QUERIES):
+            large = self.get_dashboard()
+        self.assertEqual(large['statistics']['total_applications'], 12)
+        self.assertEqual(large['statistics']['available_positions'], 12)
+        self.assertEqual(large['statistics']['pending_applications'], 6)
+        self.assertEqual(len(large['recent_positions']), 5)
+        self.assertEqual(len(large['recent_applications']), 5)
+
+    def test_cached_until_own_application_changes(self):
+        self.add_applications(0, 3)
+        self.get_dashboard()
+        with self.assertNumQueries(0):
+            self.get_dashboard()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            position = self.create_position(self.faculty, 99)
+            Application.objects.create(position=position, applicant=self.student)
+        data = self.get_dashboard()
+        self.assertEqual(data['statistics']['total_applications'], 4)
+        self.assertEqual(data['statistics']['available_positions'], 4)
+
+
+class FacultyDashboardQueryCountTest(DashboardTestMixin, TestCase):
+    """教师看板：每张表一次条件聚合 + 三个最近列表，查询数不随岗位数增长"""
+
+    # 角色 1 + 岗位/申请/工时聚合 3 + 最近岗位/申请/待审核工时 3
+    EXPECTED_QUERIES = 7
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_roles()
+        cls.faculty = cls.create_faculty(0)
+        cls.other_faculty = cls.create_faculty(1)
+        cls.students = [cls.create_student(index, is_ta=True) for index in range(3)]
+
+    def add_positions(self, start, count):
+        month = timezone.now().date().replace(day=1)
+        for index in range(start, start + count):
+            position = self.create_position(self.faculty, index)
+            for student in self.students:
+                Application.objects.create(position=position, applicant=student, status='accepted')
+                Timesheet.objects.create(
+                    ta=student, position=position, month=month,
+                    hours_worked=Decimal('12.50'), work_description='答疑'
+                )
+
+    def get_dashboard(self, user=None):
+        self.client.force_authenticate(user or self.faculty)
+        response = self.client.get('/api/faculty/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_query_count_fixed_as_positions_grow(self):
+        self.add_positions(0, 2)
+        cache.clear()
+        with self.assertNumQueries(self.EXPECTED_QUERIES):
+            small = self.get_dashboard()
+        self.assertEqual(small['statistics']['total_positions'], 2)
+
+        self.add_positions(2, 8)
+        cache.clear()
+        with self.assertNumQueries(self.EXPECTED_QUERIES):
+            large = self.get_dashboard()
+        statistics = large['statistics']
+        self.assertEqual(statistics['total_positions'], 10)
+        self.assertEqual(statistics['open_positions'], 10)
+        self.assertEqual(statistics['accepted_applications'], 30)
+        self.assertEqual(statistics['active_tas'], 3)
+        self.assertEqual(statistics['pending_timesheets'], 30)
+        self.assertEqual(len(large['recent_positions']), 3)
+        self.assertEqual(len(large['recent_timesheets']), 5)
+
+    def test_cache_invalidated_per_faculty(self):
+        self.add_positions(0, 2)
+        self.get_dashboard()
+
+        # 其他教师的岗位变更不影响本教师的看板缓存
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_position(self.other_faculty, 50)
+        with self.assertNumQueries(0):
+            self.get_dashboard()
+
+        # 本教师岗位下的申请变更后重新统计
+        with self.captureOnCommitCallbacks(execute=True):
+            Application.objects.filter(position__posted_by=self.faculty).first().delete()
+        data = self.get_dashboard()
+        self.assertEqual(data['statistics']['total_applications'], 5)
+
+    def test_reassigned_position_invalidates_previous_owner(self):
+        self.add_positions(0, 2)
+        self.assertEqual(self.get_dashboard()['statistics']['total_positions'], 2)
+        self.assertEqual(self.get_dashboard(self.other_faculty)['statistics']['total_positions'], 0)
+
+        position = Position.objects.filter(posted_by=self.faculty).first()
+        position.posted_by = self.other_faculty
+        with self.captureOnCommitCallbacks(execute=True):
+            position.save()
+        self.assertEqual(self.get_dashboard()['statistics']['total_positions'], 1)
+        self.assertEqual(self.get_dashboard(self.other_faculty)['statistics']['total_positions'], 1)
+
+    def test_cache_expires_at_next_deadline(self):
+        self.create_position(self.faculty, 0, application_deadline=timezone.now() + timedelta(seconds=90))
+        self.create_position(self.other_faculty, 1)
+
+        with mock.patch.object(cache, 'set', wraps=cache.set) as cache_set:
+            self.get_dashboard()
+            self.get_dashboard(self.other_faculty)
+        timeouts = {
+            args[0].split(':')[2]: args[2]
+            for args, _kwargs in cache_set.call_args_list if args[0].startswith('dashboard:faculty:')
+        }
+        # 缓存不超过最早的申请截止时间；没有临近截止的岗位时取默认时长
+        self.assertLessEqual(timeouts[str(self.faculty.pk)], 90)
+        self.assertEqual(timeouts[str(self.other_faculty.pk)], FACULTY_DASHBOARD_TTL)
+
+
+class PositionSearchTest(DashboardTestMixin, TestCase):
+    """岗位检索：全文索引按字段权重排序，短检索词退回模糊匹配，非检索字段更新不重建索引"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_roles()
+        cls.faculty = cls.create_faculty(0)
+        cls.student = cls.create_student(0)
+        # 同一检索词分别命中标题、课程名、描述
+        cls.by_title = cls.create_position(cls.faculty, 0, title='机器学习助教')
+        cls.by_course = cls.create_position(cls.faculty, 1, course_name='机器学习导论')
+        cls.by_description = cls.create_position(cls.faculty, 2, description='协助机器学习实验课答疑')
+        cls.unrelated = cls.create_position(cls.faculty, 3, title='操作系统助教', course_name='操作系统')
+
+    def search_ids(self, term, **params):
+        self.client.force_authenticate(self.student)
+        response = self.client.get('/api/student/positions/', {'search': term, **params})
+        self.assertEqual(response.status_code, 200)
+        return [row['position_id'] for row in response.data['results']]
+
+    def require_fts5(self):
+        if connection.vendor != 'sqlite' or SQLITE_SEARCH_TABLE not in connection.introspection.table_names():
+            self.skipTest('当前数据库不支持 FTS5 trigram')
+
+    def test_fts5_ranks_title_over_course_over_description(self):
+        self.require_fts5()
+        queryset = SQLiteFTS5SearchBackend().search(Position.objects.all(), ['机器学习'])
+        ranked = list(queryset.order_by('-search_rank').values_list('pk', flat=True))
+        self.assertEqual(ranked, [self.by_title.pk, self.by_course.pk, self.by_description.pk])
+
+    def test_endpoint_orders_by_relevance_unless_ordering_given(self):
+        self.assertEqual(
+            self.search_ids('机器学习'), [self.by_title.pk, self.by_course.pk, self.by_description.pk]
+        )
+        self.assertEqual(
+            self.search_ids('机器学习', ordering='created_at'),
+            [self.by_title.pk, self.by_course.pk, self.by_description.pk],
+        )
+        self.assertEqual(
+            self.search_ids('机器学习', ordering='-created_at'),
+            [self.by_description.pk, self.by_course.pk, self.by_title.pk],
+        )
+
+    def test_multiple_terms_must_all_match(self):
+        # 描述中的“答疑”对所有岗位成立，“实验课”只命中一个
+        self.assertEqual(self.search_ids('机器学习 实验课'), [self.by_description.pk])
+        self.assertEqual(self.search_ids('机器学习 操作系统'), [])
+
+    def test_short_terms_fall_back_to_like(self):
+        self.require_fts5()
+        backend = SQLiteFTS5SearchBackend()
+        self.assertEqual(backend.split_terms(['机器学习', '助教', '课']), (['机器学习'], ['助教', '课']))
+
+        # 全部检索词都短于 trigram 长度时整体走模糊匹配
+        self.assertEqual(self.search_ids('导论'), [self.by_course.pk])
+        # 长短混合：全文索引过滤后再对短词做模糊匹配
+        self.assertEqual(self.search_ids('机器学习 实验'), [self.by_description.pk])
+
+    def test_like_backend(self):
+        queryset = LikeSearchBackend().search(Position.objects.all(), ['机器学习', '导论'])
+        self.assertEqual(list(queryset.values_list('pk', flat=True)), [self.by_course.pk])
+        self.assertEqual(queryset.get().search_rank, 0.0)
+
+    def test_mysql_backend_match_expression_and_fallback(self):
+        backend = MySQLFulltextSearchBackend()
+        self.assertEqual(backend.match_expression(['机器学习', 'a"b']), '+"机器学习" +"a b"')
+        self.assertEqual(backend.split_terms(['机器', '课']), (['机器'], ['课']))
+        # 只有单字检索词时不使用 MATCH ... AGAINST
+        queryset = backend.search(Position.objects.all(), ['课'])
+        self.assertNotIn('AGAINST', str(queryset.query))
+        self.assertEqual(list(queryset.values_list('pk', flat=True)), [self.by_description.pk])
+
+    def test_index_follows_text_changes(self):
+        self.require_fts5()
+        self.unrelated.title = '机器学习实验助教'
+        self.unrelated.save()
+        self.assertIn(self.unrelated.pk, self.search_ids('机器学习'))
+
+        self.unrelated.delete()
+        self.assertNotIn(self.unrelated.pk, self.search_ids('机器学习'))
+
+    def test_non_text_update_skips_reindex(self):
+        backend = mock.Mock()
+        with mock.patch('recruitment.signals.get_search_backend', return_value=backend):
+            self.by_title.num_filled = 1
+            self.by_title.save(update_fields=['num_filled', 'updated_at'])
+            backend.index.assert_not_called()
+
+            self.by_title.description = '批改机器学习作业'
+            self.by_title.save(update_fields=['description', 'updated_at'])
+            backend.index.assert_called_once_with(self.by_title)
+
+            self.by_title.save()
+            self.assertEqual(backend.index.call_count, 2)
+
+
+class CatalogCacheTest(DashboardTestMixin, TestCase):
+    """学生端岗位目录缓存：按目录版本命中，岗位写入或越过到期水位线后失效，支持条件请求"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_roles()
+        cls.faculty = cls.create_faculty(0)
+        cls.student = cls.create_student(0)
+        cls.positions = [cls.create_position(cls.faculty, index) for index in range(2)]
+
+    def get_catalog(self, path='/api/student/positions/', **headers):
+        self.client.force_authenticate(self.student)
+        return self.client.get(path, **headers)
+
+    def catalog_ids(self):
+        response = self.get_catalog()
+        self.assertEqual(response.status_code, 200)
+        return {row['position_id'] for row in response.data['results']}
+
+    def test_cache_hit_without_queries(self):
+        first = self.get_catalog()
+        with self.assertNumQueries(0):
+            second = self.get_catalog()
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertIn('no-cache', second['Cache-Control'])
+
+        # 查询参数不同的请求各自缓存
+        self.assertNotEqual(self.get_catalog('/api/student/positions/?ordering=created_at')['ETag'], first['ETag'])
+
+    def test_position_write_invalidates(self):
+        etag = self.get_catalog()['ETag']
+        detail_path = f'/api/student/positions/{self.positions[0].pk}/'
+        self.get_catalog(detail_path)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            added = self.create_position(self.faculty, 2)
+        response = self.get_catalog()
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertIn(added.pk, {row['position_id'] for row in response.data['results']})
+
+        position = self.positions[0]
+        position.title = '数据结构助教（已更新）'
+        with self.captureOnCommitCallbacks(execute=True):
+            position.save()
+        self.assertEqual(self.get_catalog(detail_path).data['title'], '数据结构助教（已更新）')
+
+    def test_watermark_rolls_over_at_deadline(self):
+        now = timezone.now()
+        expiring = self.create_position(self.faculty, 2, application_deadline=now + timedelta(hours=1))
+        cache.clear()
+        response = self.get_catalog()
+        self.assertIn(expiring.pk, {row['position_id'] for row in response.data['results']})
+
+        # 没有任何写入，只是越过了最早的申请截止时间
+        with mock.patch('django.utils.timezone.now', return_value=now + timedelta(hours=2)):
+            rolled = self.get_catalog()
+            self.assertNotEqual(rolled['ETag'], response['ETag'])
+            self.assertEqual(self.catalog_ids(), {position.pk for position in self.positions})
+            # 新水位线是剩余岗位的截止时间，之前不会再次回源计算
+            with self.assertNumQueries(0):
+                self.get_catalog()
+
+    def test_conditional_requests_return_304(self):
+        response = self.get_catalog()
+        etag, last_modified = response['ETag'], response['Last-Modified']
+
+        self.assertEqual(self.get_catalog(HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.get_catalog(HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+        self.assertEqual(self.get_catalog(HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_position(self.faculty, 2)
+        # 目录版本变化后旧 ETag 不再匹配
+        self.assertEqual(self.get_catalog(HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class EffectiveStatusTest(DashboardTestMixin, TestCase):
+    """岗位实际状态在查询时计算：到期未清扫的岗位视为关闭，清扫按水位线跳过"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_roles()
+        cls.faculty = cls.create_faculty(0)
+        cls.student = cls.create_student(0)
+        cls.open_position = cls.create_position(cls.faculty, 0)
+        cls.expired = cls.create_position(cls.faculty, 1)
+        # 绕过 save：模拟截止时间已过但尚未被清扫的岗位
+        Position.objects.filter(pk=cls.expired.pk).update(
+            application_deadline=timezone.now() - timedelta(hours=1)
+        )
+
+    def list_ids(self, user, path, **params):
+        self.client.force_authenticate(user)
+        response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200)
+        return {row['position_id'] for row in response.data['results']}
+
+    def test_expired_unswept_position_is_closed_at_query_time(self):
+        self.assertEqual(Position.objects.get(pk=self.expired.pk).status, 'open')
+        annotated = Position.objects.with_effective_status().get(pk=self.expired.pk)
+        self.assertEqual(annotated.effective_status, 'closed')
+        self.assertEqual(Position.objects.get(pk=self.expired.pk).get_effective_status(), 'closed')
+
+        self.assertEqual(self.list_ids(self.student, '/api/student/positions/'), {self.open_position.pk})
+        self.assertEqual(
+            self.list_ids(self.faculty, '/api/faculty/positions/', status='closed'), {self.expired.pk}
+        )
+        # 读接口不写库
+        self.assertEqual(Position.objects.get(pk=self.expired.pk).status, 'open')
+
+    def test_full_position_is_closed_at_query_time(self):
+        Position.objects.filter(pk=self.open_position.pk).update(num_filled=10)
+        self.assertEqual(
+            Position.objects.with_effective_status().get(pk=self.open_position.pk).effective_status, 'closed'
+        )
+        self.assertEqual(self.list_ids(self.student, '/api/student/positions/'), set())
+
+    def test_sweep_skips_database_before_watermark(self):
+        self.assertEqual(Position.sweep_statuses(), 1)
+        self.assertEqual(Position.objects.get(pk=self.expired.pk).status, 'closed')
+        self.assertEqual(cache.get(NEXT_STATUS_CHANGE_CACHE_KEY), self.open_position.next_status_change_at())
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(Position.sweep_statuses())
+
+        # 越过水位线后再次清扫
+        later = self.open_position.next_status_change_at() + timedelta(seconds=1)
+        with mock.patch('django.utils.timezone.now', return_value=later):
+            self.assertEqual(Position.sweep_statuses(), 1)
+        self.assertEqual(Position.objects.get(pk=self.open_position.pk).status, 'closed')
+        self.assertEqual(cache.get(NEXT_STATUS_CHANGE_CACHE_KEY), '')
+
+    def test_saving_earlier_deadline_lowers_watermark(self):
+        Position.sweep_statuses()
+        watermark = cache.get(NEXT_STATUS_CHANGE_CACHE_KEY)
+
+        # 到期更晚的岗位不影响水位线
+        self.create_position(self.faculty, 2, application_deadline=watermark + timedelta(days=1))
+        self.assertEqual(cache.get(NEXT_STATUS_CHANGE_CACHE_KEY), watermark)
 
-# Create your tests here.
+        earlier = self.create_position(self.faculty, 3, application_deadline=watermark - timedelta(days=1))
+        self.assertIsNone(cache.get(NEXT_STATUS_CHANGE_CACHE_KEY))
+        self.assertEqual(Position.sweep_statuses(), 0)
+        self.assertEqual(cache.get(NEXT_STATUS_CHANGE_CACHE_KEY), earlier.next_status_change_at())
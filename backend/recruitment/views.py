@@ -6,31 +6,36 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Count, Q
 from accounts.permissions import IsStudent, IsFaculty
 from .models import Position
+from .search import PositionSearchFilter
+from .caching import CatalogCacheMixin
+from .services import faculty_dashboard, student_dashboard
 from .serializers import PositionListSerializer, PositionDetailSerializer, PositionCreateUpdateSerializer
-from application.models import Application
-from timesheet.models import Timesheet
 
 
-class StudentPositionList(generics.ListAPIView):
+def filter_by_effective_status(queryset, request):
+    """?status= 按岗位实际状态过滤（替代 filterset_fields 中的 status）"""
+    status_param = request.query_params.get('status')
+    if status_param:
+        queryset = queryset.filter_effective_status(status_param)
+    return queryset
+
+
+class StudentPositionList(CatalogCacheMixin, generics.ListAPIView):
+    """学生端岗位列表：按目录版本缓存，支持 ETag/Last-Modified 条件请求"""
     permission_classes = [permissions.IsAuthenticated, IsStudent]
     serializer_class = PositionListSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['status', 'course_code', 'posted_by']
-    search_fields = ['title', 'course_name', 'description']
+    filter_backends = [DjangoFilterBackend, PositionSearchFilter, filters.OrderingFilter]
+    filterset_fields = ['course_code', 'posted_by']
     ordering_fields = ['application_deadline', 'created_at']
 
     def get_queryset(self):
-        from django.utils import timezone
-        # 统一刷新岗位状态，避免教师端/学生端显示不一致
-        Position.refresh_statuses()
-        now = timezone.now()
-        return Position.objects.filter(
-            status='open',
-            application_deadline__gte=now
-        ).select_related('posted_by')
+        # 按实际状态过滤（到期岗位即使尚未被清扫也不会出现），读接口不写库
+        queryset = Position.objects.filter_effective_status('open').select_related('posted_by')
+        return filter_by_effective_status(queryset, self.request)
 
 
-class StudentPositionDetail(generics.RetrieveAPIView):
+class StudentPositionDetail(CatalogCacheMixin, generics.RetrieveAPIView):
+    """学生端岗位详情：按目录版本缓存，支持条件请求"""
     permission_classes = [permissions.IsAuthenticated, IsStudent]
     serializer_class = PositionDetailSerializer
     lookup_field = 'position_id'
@@ -45,15 +50,15 @@ class FacultyPositionCreate(generics.CreateAPIView):
 
 class FacultyPositionListCreate(generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated, IsFaculty]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['status', 'course_code']
-    search_fields = ['title', 'course_name', 'description']
+    filter_backends = [DjangoFilterBackend, PositionSearchFilter, filters.OrderingFilter]
+    filterset_fields = ['course_code']
     ordering_fields = ['application_deadline', 'created_at']
 
     def get_queryset(self):
-        # 统一刷新岗位状态，避免过期岗位仍显示 open
-        Position.refresh_statuses()
-        return Position.objects.filter(posted_by=self.request.user).select_related('posted_by')
+        queryset = Position.objects.filter(
+            posted_by=self.request.user
+        ).with_effective_status().select_related('posted_by')
+        return filter_by_effective_status(queryset, self.request)
 
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -88,7 +93,7 @@ class FacultyPositionClose(APIView):
 
     def patch(self, request, position_id):
         pos = get_object_or_404(Position, position_id=position_id, posted_by=request.user)
-        if pos.status != 'open':
+        if pos.get_effective_status() != 'open':
             return Response({'detail': '只能关闭开放中的岗位'}, status=400)
         pos.status = 'closed'
         pos.save(update_fields=['status', 'updated_at'])
@@ -103,62 +108,8 @@ class StudentDashboard(APIView):
     permission_classes = [permissions.IsAuthenticated, IsStudent]
     
     def get(self, request):
-        """获取学生看板统计数据"""
-        from django.utils import timezone
-        from datetime import timedelta
-        
-        user = request.user
-        now = timezone.now()
-        Position.refresh_statuses()
-        
-        # 统计可申请岗位数（开放中的岗位且未过期，与列表页面保持一致）
-        available_positions = Position.objects.filter(
-            status='open',
-            application_deadline__gte=now
-        ).count()
-        
-        # 统计申请数据
-        applications = Application.objects.filter(applicant=user)
-        total_applications = applications.count()
-        pending_applications = applications.filter(
-            status__in=['submitted', 'reviewing']
-        ).count()
-        accepted_applications = applications.filter(status='accepted').count()
-        rejected_applications = applications.filter(status='rejected').count()
-        
-        # 获取最近一个月的岗位（最近5条，按创建时间倒序，且未过期）
-        one_month_ago = now - timedelta(days=30)
-        recent_positions = Position.objects.filter(
-            status='open',
-            application_deadline__gte=now,
-            created_at__gte=one_month_ago
-        ).select_related('posted_by').order_by('-created_at')[:5]
-        recent_positions_data = PositionListSerializer(
-            recent_positions,
-            many=True
-        ).data
-        
-        # 获取最近的申请（最近5条，按申请时间倒序）
-        recent_applications = applications.select_related(
-            'position'
-        ).order_by('-applied_at')[:5]
-        from application.serializers import ApplicationListSerializer
-        recent_applications_data = ApplicationListSerializer(
-            recent_applications,
-            many=True
-        ).data
-        
-        return Response({
-            'statistics': {
-                'available_positions': available_positions,
-                'total_applications': total_applications,
-                'pending_applications': pending_applications,
-                'accepted_applications': accepted_applications,
-                'rejected_applications': rejected_applications,
-            },
-            'recent_positions': recent_positions_data,
-            'recent_applications': recent_applications_data,
-        })
+        """获取学生看板统计数据（按用户短时缓存，见 recruitment.services.student_dashboard）"""
+        return Response(student_dashboard(request.user))
 
 
 class FacultyDashboard(APIView):
@@ -169,81 +120,5 @@ class FacultyDashboard(APIView):
     permission_classes = [permissions.IsAuthenticated, IsFaculty]
     
     def get(self, request):
-        """获取教师看板统计数据"""
-        user = request.user
-        Position.refresh_statuses()
-        
-        # 统计岗位数据
-        positions = Position.objects.filter(posted_by=user)
-        total_positions = positions.count()
-        open_positions = positions.filter(status='open').count()
-        closed_positions = positions.filter(status='closed').count()
-        filled_positions = positions.filter(status='filled').count()
-        
-        # 统计申请数据
-        applications = Application.objects.filter(position__posted_by=user)
-        total_applications = applications.count()
-        pending_applications = applications.filter(
-            status__in=['submitted', 'reviewing']
-        ).count()
-        accepted_applications = applications.filter(status='accepted').count()
-        rejected_applications = applications.filter(status='rejected').count()
-        
-        # 统计在岗助教数（已通过申请的助教）
-        active_tas = Application.objects.filter(
-            position__posted_by=user,
-            status='accepted'
-        ).values('applicant').distinct().count()
-        
-        # 统计待审核工时数
-        pending_timesheets = Timesheet.objects.filter(
-            position__posted_by=user,
-            status='pending'
-        ).count()
-        
-        # 获取最近的岗位（最近3条）
-        recent_positions = positions.select_related('posted_by')[:3]
-        recent_positions_data = PositionListSerializer(
-            recent_positions,
-            many=True
-        ).data
-        
-        # 获取最近的申请（最近5条）
-        recent_applications = applications.select_related(
-            'applicant',
-            'position'
-        )[:5]
-        from application.serializers import ApplicationListSerializer
-        recent_applications_data = ApplicationListSerializer(
-            recent_applications,
-            many=True
-        ).data
-        
-        # 获取最近的待审核工时（最近5条）
-        recent_timesheets = Timesheet.objects.filter(
-            position__posted_by=user,
-            status='pending'
-        ).select_related('position', 'ta')[:5]
-        from timesheet.serializers import TimesheetListSerializer
-        recent_timesheets_data = TimesheetListSerializer(
-            recent_timesheets,
-            many=True
-        ).data
-        
-        return Response({
-            'statistics': {
-                'total_positions': total_positions,
-                'open_positions': open_positions,
-                'closed_positions': closed_positions,
-                'filled_positions': filled_positions,
-                'total_applications': total_applications,
-                'pending_applications': pending_applications,
-                'accepted_applications': accepted_applications,
-                'rejected_applications': rejected_applications,
-                'active_tas': active_tas,
-                'pending_timesheets': pending_timesheets,
-            },
-            'recent_positions': recent_positions_data,
-            'recent_applications': recent_applications_data,
-            'recent_timesheets': recent_timesheets_data,
-        })
+        """获取教师看板统计数据（按教师缓存，见 recruitment.services.faculty_dashboard）"""
+        return Response(faculty_dashboard(request.user))
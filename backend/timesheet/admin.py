@@ -11,8 +11,8 @@ from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from django.contrib import admin
 from django.utils.html import format_html
-from django.utils import timezone
 from .models import Timesheet, Salary
+from .services import bulk_review_timesheets, generate_salaries
 
 
 @admin.register(Timesheet)
@@ -33,7 +33,7 @@ class TimesheetAdmin(admin.ModelAdmin):
     date_hierarchy = 'month'
     
     # 批量操作
-    actions = ['batch_approve', 'batch_reject']
+    actions = ['batch_approve', 'batch_reject', 'batch_generate_salaries']
     
     fieldsets = (
         ('工时信息', {
@@ -73,25 +73,29 @@ class TimesheetAdmin(admin.ModelAdmin):
     status_colored.admin_order_field = 'status'
     
     def batch_approve(self, request, queryset):
-        """批量批准工时"""
-        updated = queryset.update(
-            status='approved',
-            reviewed_by=request.user,
-            reviewed_at=timezone.now()
-        )
-        self.message_user(request, f'成功批准 {updated} 个工时表')
+        """批量批准工时表（批量写入状态与通知，见 bulk_review_timesheets）"""
+        updated, skipped = bulk_review_timesheets(queryset, 'approve', request.user)
+        message = f'成功批准 {updated} 个工时表'
+        if skipped:
+            message += f'，跳过 {skipped} 个（非待审核状态）'
+        self.message_user(request, message)
     batch_approve.short_description = '✓ 批量批准选中的工时'
     
     def batch_reject(self, request, queryset):
-        """批量驳回工时"""
-        updated = queryset.update(
-            status='rejected',
-            reviewed_by=request.user,
-            reviewed_at=timezone.now()
-        )
-        self.message_user(request, f'成功驳回 {updated} 个工时表')
+        """批量驳回工时表"""
+        updated, skipped = bulk_review_timesheets(queryset, 'reject', request.user)
+        message = f'成功驳回 {updated} 个工时表'
+        if skipped:
+            message += f'，跳过 {skipped} 个（非待审核状态）'
+        self.message_user(request, message)
     batch_reject.short_description = '✗ 批量驳回选中的工时'
     
+    def batch_generate_salaries(self, request, queryset):
+        """为选中的已批准工时批量生成薪酬（已生成过的跳过）"""
+        created, total = generate_salaries(queryset, request.user)
+        self.message_user(request, f'成功生成 {created} 条薪酬记录，合计 ¥{total}')
+    batch_generate_salaries.short_description = '¥ 为选中的已批准工时生成薪酬'
+    
     def get_readonly_fields(self, request, obj=None):
         """编辑时，部分字段只读"""
         if obj:  # 编辑现有对象
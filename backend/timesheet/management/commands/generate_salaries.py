@@ -0,0 +1,53 @@
+"""
+按工作月份批量生成薪酬：为已批准且尚未生成薪酬的工时表写入 Salary
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User
+from dashboard.snapshots import current_month
+from timesheet.services import payroll_candidates, generate_salaries
+
+
+class Command(BaseCommand):
+    help = '为指定工作月份（默认上月）已批准且未生成薪酬的工时表批量生成薪酬记录'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, help='工作月份所在年份')
+        parser.add_argument('--month', type=int, help='工作月份（1-12）')
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='不限月份，处理全部已批准且未生成薪酬的工时表'
+        )
+        parser.add_argument(
+            '--generated-by',
+            help='记录为报表生成人的管理员用户名（默认第一个超级管理员）'
+        )
+
+    def handle(self, *args, **options):
+        if options['generated_by']:
+            generated_by = User.objects.filter(username=options['generated_by']).first()
+            if generated_by is None:
+                raise CommandError(f'用户不存在：{options["generated_by"]}')
+        else:
+            generated_by = User.objects.filter(is_superuser=True, is_active=True).order_by('pk').first()
+            if generated_by is None:
+                raise CommandError('未找到超级管理员，请通过 --generated-by 指定生成人')
+
+        if options['all']:
+            year = month = None
+            label = '全部月份'
+        else:
+            year, month = options['year'], options['month']
+            if not (year and month):
+                year, month = current_month()
+                year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+            if not 1 <= month <= 12:
+                raise CommandError('--month 取值应为 1-12')
+            label = f'{year}年{month:02d}月'
+
+        created, total = generate_salaries(payroll_candidates(year, month), generated_by)
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {label}薪酬生成完成：{created} 条，合计 ¥{total}'
+        ))
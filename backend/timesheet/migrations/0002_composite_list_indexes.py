@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timesheet', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='timesheet',
+            index=models.Index(fields=['ta', 'month', 'submitted_at'], name='timesheet_ta_id_c51a60_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timesheet',
+            index=models.Index(fields=['position', 'status'], name='timesheet_positio_1d6bca_idx'),
+        ),
+        # 先建复合索引再删除被其前缀覆盖的单列索引（MySQL 外键列必须始终有索引）
+        migrations.RemoveIndex(
+            model_name='timesheet',
+            name='timesheet_ta_id_70580c_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='timesheet',
+            name='timesheet_positio_78bd3b_idx',
+        ),
+    ]
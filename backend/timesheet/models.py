@@ -3,14 +3,42 @@
 包含：Timesheet（工时表）、Salary（薪酬记录表）
 """
 
+from decimal import Decimal, ROUND_HALF_UP
+
 from django.db import models
+from django.db.models.functions import Round
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.conf import settings
+from TeachingAssistant.mixins import FieldTrackerMixin
 from recruitment.models import Position
 
 
-class Timesheet(models.Model):
+SALARY_QUANT = Decimal('0.01')
+
+
+def salary_amount_expression(hours='hours_worked', rate='position__hourly_rate'):
+    """薪酬金额 = 工时 × 时薪（数据库端计算并四舍五入到分）"""
+    return Round(
+        models.ExpressionWrapper(
+            models.F(hours) * models.F(rate),
+            output_field=models.DecimalField(max_digits=14, decimal_places=4),
+        ),
+        2,
+        output_field=models.DecimalField(max_digits=10, decimal_places=2),
+    )
+
+
+class TimesheetQuerySet(models.QuerySet):
+    def with_salary_amount(self):
+        """注解 salary_amount：列表、详情、薪酬生成在同一查询中取得精确金额"""
+        return self.annotate(salary_amount=salary_amount_expression())
+
+
+class Timesheet(FieldTrackerMixin, models.Model):
     """工时表 - 记录助教的工作时间"""
+
+    # 信号据此判断状态流转与工作月份变更，无需 pre_save 再查询旧记录
+    tracked_fields = ('status', 'month')
     
     # 审核状态选择
     STATUS_CHOICES = [
@@ -87,6 +115,8 @@ class Timesheet(models.Model):
         auto_now=True,
         verbose_name='更新时间'
     )
+
+    objects = TimesheetQuerySet.as_manager()
     
     class Meta:
         db_table = 'timesheet'
@@ -96,8 +126,10 @@ class Timesheet(models.Model):
         unique_together = [['ta', 'position', 'month']]
         ordering = ['-month', '-submitted_at']
         indexes = [
-            models.Index(fields=['ta']),
-            models.Index(fields=['position']),
+            # 我的工时：ta=? ORDER BY month DESC, submitted_at DESC
+            models.Index(fields=['ta', 'month', 'submitted_at']),
+            # 教师端待审核工时：position IN (...) AND status='pending'
+            models.Index(fields=['position', 'status']),
             models.Index(fields=['status']),
             models.Index(fields=['month']),
         ]
@@ -116,8 +148,11 @@ class Timesheet(models.Model):
         return self.status == 'approved'
     
     def calculate_salary(self):
-        """计算薪酬金额"""
-        return float(self.hours_worked) * float(self.position.hourly_rate)
+        """计算薪酬金额（Decimal，四舍五入到分）；已通过 with_salary_amount 注解时直接使用注解值"""
+        amount = getattr(self, 'salary_amount', None)
+        if amount is None:
+            amount = self.hours_worked * self.position.hourly_rate
+        return Decimal(amount).quantize(SALARY_QUANT, rounding=ROUND_HALF_UP)
 
 
 class Salary(models.Model):
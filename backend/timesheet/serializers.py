@@ -73,6 +73,81 @@ class TimesheetCreateSerializer(serializers.ModelSerializer):
         )
 
 
+class TimesheetBatchEntrySerializer(serializers.ModelSerializer):
+    """批量提交中的单条工时（岗位以ID接收，存在性与权限在批量校验中统一查询）"""
+    position = serializers.IntegerField(help_text='岗位ID')
+    month = serializers.DateField(
+        input_formats=['%Y-%m-%d'],
+        help_text='工作月份，格式：YYYY-MM-DD（月初日期，如：2025-03-01）'
+    )
+
+    class Meta:
+        model = Timesheet
+        fields = ['position', 'month', 'hours_worked', 'work_description']
+
+    def validate_month(self, value):
+        if value > datetime.now().date():
+            raise serializers.ValidationError('不能提交未来月份的工时表')
+        return value
+
+
+class TimesheetBatchCreateSerializer(serializers.Serializer):
+    """
+    工时表批量提交：与单条提交相同的校验规则，但所有条目合计只查询两次
+    （已录用岗位一次、已提交工时一次），任一条目不合法时整批拒绝
+    """
+    MAX_ENTRIES = 100
+
+    entries = TimesheetBatchEntrySerializer(many=True, allow_empty=False, max_length=MAX_ENTRIES)
+
+    def validate_entries(self, entries):
+        user = self.context['request'].user
+        position_ids = {entry['position'] for entry in entries}
+
+        # 查询 1：当前用户已被录用的岗位（附带通知所需的岗位标题与发布教师）
+        positions = {
+            position_id: (title, faculty_id)
+            for position_id, title, faculty_id in Application.objects.filter(
+                applicant=user,
+                position_id__in=position_ids,
+                status='accepted',
+            ).values_list('position_id', 'position__title', 'position__posted_by_id')
+        }
+        # 查询 2：这些岗位在所提交月份中已存在的工时表
+        existing = set(
+            Timesheet.objects.filter(
+                ta=user,
+                position_id__in=position_ids,
+                month__in={entry['month'] for entry in entries},
+            ).values_list('position_id', 'month')
+        )
+
+        errors = []
+        seen = set()
+        for entry in entries:
+            key = (entry['position'], entry['month'])
+            error = {}
+            if entry['position'] not in positions:
+                error['position'] = ['您不是该岗位的助教，无法提交工时表']
+            elif key in existing:
+                error['month'] = ['该月份工时表已提交，无法重复提交']
+            elif key in seen:
+                error['month'] = ['同一岗位同一月份在本次提交中重复']
+            seen.add(key)
+            errors.append(error)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+        self.positions = positions
+        return entries
+
+    def create(self, validated_data):
+        from .services import bulk_submit_timesheets
+        return bulk_submit_timesheets(
+            self.context['request'].user, validated_data['entries'], self.positions
+        )
+
+
 class TimesheetUpdateSerializer(serializers.ModelSerializer):
     """工时表更新序列化器（仅限待审核状态）"""
     month = serializers.DateField(
@@ -117,6 +192,7 @@ class TimesheetListSerializer(serializers.ModelSerializer):
     month_display = serializers.SerializerMethodField()
     ta_name = serializers.SerializerMethodField()
     reviewed_by_name = serializers.SerializerMethodField()
+    calculated_salary = serializers.SerializerMethodField()
     
     class Meta:
         model = Timesheet
@@ -138,6 +214,7 @@ class TimesheetListSerializer(serializers.ModelSerializer):
             'reviewed_by_name',
             'reviewed_at',
             'review_notes',
+            'calculated_salary',
         ]
     
     def get_month_display(self, obj):
@@ -161,6 +238,12 @@ class TimesheetListSerializer(serializers.ModelSerializer):
         """获取审核人姓名，安全处理 None 值"""
         return obj.reviewed_by.real_name if obj.reviewed_by else None
 
+    def get_calculated_salary(self, obj):
+        """已批准工时的薪酬金额（列表视图通过 with_salary_amount 注解在查询中算出）"""
+        if obj.status == 'approved':
+            return obj.calculate_salary()
+        return None
+
 
 class TimesheetDetailSerializer(serializers.ModelSerializer):
     """工时表详情序列化器"""
@@ -229,9 +312,9 @@ class TimesheetDetailSerializer(serializers.ModelSerializer):
         return obj.ta.real_name if obj.ta else None
     
     def get_calculated_salary(self, obj):
-        """计算薪酬金额"""
+        """薪酬金额（视图通过 with_salary_amount 注解在查询中算出）"""
         if obj.status == 'approved':
-            return float(obj.calculate_salary())
+            return obj.calculate_salary()
         return None
     
     def get_has_salary(self, obj):
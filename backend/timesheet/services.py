@@ -0,0 +1,258 @@
+"""
+学生助教管理平台 - 工时管理模块业务服务
+包含：工时提交/审核通知、批量提交、批量审核（Admin 批量操作）、批量生成薪酬、助教看板统计
+"""
+
+import uuid
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import connection, transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from application.models import Application
+from dashboard.invalidation import bump_generation, get_or_compute, versioned_key
+from dashboard.snapshots import next_month, refresh_snapshot
+from notifications.models import Notification
+from recruitment.services import (
+    USER_DASHBOARD_TTL,
+    invalidate_faculty_dashboard,
+    invalidate_user_dashboard,
+    user_dashboard_metric,
+)
+from .models import Timesheet, Salary, SALARY_QUANT
+
+
+SALARY_BATCH_SIZE = 500
+
+
+def submission_notification(timesheet, ta_name, position_title, faculty_id):
+    """工时表提交后通知岗位发布教师（未保存的 Notification）"""
+    # 使用 f-string 避免 Windows locale 编码问题
+    month_str = f"{timesheet.month.year}年{timesheet.month.month:02d}月"
+    return Notification(
+        recipient_id=faculty_id,
+        sender_id=timesheet.ta_id,
+        notification_type='timesheet_submitted',
+        category='timesheet',
+        title='收到新的工时表',
+        message=f'{ta_name} 提交了岗位"{position_title}"在{month_str}的工时表',
+        related_model='Timesheet',
+        related_object_id=timesheet.timesheet_id,
+        priority='medium',
+    )
+
+
+def bulk_submit_timesheets(ta, entries, positions):
+    """
+    助教批量提交工时表（entries 已校验），返回创建的 Timesheet 列表
+    positions 为 {position_id: (岗位标题, 发布教师ID)}，由校验阶段的查询一并取出
+    工时表与教师通知各一次批量插入，并在同一事务中提交
+    """
+    timesheets = [
+        Timesheet(
+            ta=ta,
+            position_id=entry['position'],
+            month=entry['month'],
+            hours_worked=entry['hours_worked'],
+            work_description=entry['work_description'],
+            status='pending',
+        )
+        for entry in entries
+    ]
+    with transaction.atomic():
+        Timesheet.objects.bulk_create(timesheets)
+        if not connection.features.can_return_rows_from_bulk_insert:
+            # MySQL 批量插入不回填主键：按 (岗位, 月份) 唯一约束查回
+            ids = dict(
+                ((position_id, month), timesheet_id)
+                for timesheet_id, position_id, month in Timesheet.objects.filter(
+                    ta=ta,
+                    position_id__in={t.position_id for t in timesheets},
+                    month__in={t.month for t in timesheets},
+                ).values_list('timesheet_id', 'position_id', 'month')
+            )
+            for timesheet in timesheets:
+                timesheet.timesheet_id = ids[(timesheet.position_id, timesheet.month)]
+
+        Notification.objects.bulk_create([
+            submission_notification(timesheet, ta.real_name, *positions[timesheet.position_id])
+            for timesheet in timesheets
+        ])
+
+        # 与信号一致：提交日期所在月份与各工作月份的快照均需重算
+        months = {(day.year, day.month) for day in [timezone.now().date()] + [t.month for t in timesheets]}
+        for year, month in sorted(months):
+            refresh_snapshot('timesheets', date(year, month, 1))
+
+    bump_generation('timesheets')
+    invalidate_faculty_dashboard(*(faculty_id for _title, faculty_id in positions.values()))
+    invalidate_user_dashboard(ta.pk)
+    return timesheets
+
+
+def review_notification(timesheet):
+    """
+    工时表被批准/驳回时通知助教（未保存的 Notification，其他状态返回 None）
+    需要 timesheet.position 已加载
+    """
+    if timesheet.status not in ['approved', 'rejected']:
+        return None
+    position = timesheet.position
+    # 使用 f-string 避免 Windows locale 编码问题
+    month_str = f"{timesheet.month.year}年{timesheet.month.month:02d}月"
+    if timesheet.status == 'approved':
+        notification_type, title, result = 'timesheet_approved', '工时表已批准', '已通过审核'
+    else:
+        notification_type, title, result = 'timesheet_rejected', '工时表被驳回', '未通过审核'
+    return Notification(
+        recipient_id=timesheet.ta_id,
+        sender_id=timesheet.reviewed_by_id or position.posted_by_id,
+        notification_type=notification_type,
+        category='timesheet',
+        title=title,
+        message=f'您提交的"{position.title}"在{month_str}的工时表{result}。',
+        related_model='Timesheet',
+        related_object_id=timesheet.timesheet_id,
+        priority='medium',
+    )
+
+
+def bulk_review_timesheets(queryset, action, reviewer, notes=None):
+    """
+    批量审核工时表，action 为 'approve' 或 'reject'；返回 (处理数, 跳过数)
+    只处理待审核的工时表；状态更新与通知批量写入，并在同一事务中提交
+    """
+    if action not in ('approve', 'reject'):
+        raise ValueError('action 取值应为 approve 或 reject')
+    new_status = 'approved' if action == 'approve' else 'rejected'
+
+    with transaction.atomic():
+        timesheets = list(
+            queryset.filter(status='pending').select_for_update().select_related('position')
+        )
+        total = queryset.count()
+        if not timesheets:
+            return 0, total
+
+        now = timezone.now()
+        values = {'status': new_status, 'reviewed_by': reviewer, 'reviewed_at': now, 'updated_at': now}
+        if notes:
+            values['review_notes'] = notes
+        Timesheet.objects.filter(pk__in=[t.pk for t in timesheets]).update(**values)
+
+        for timesheet in timesheets:
+            timesheet.status = new_status
+            timesheet.reviewed_by = reviewer
+        Notification.objects.bulk_create([review_notification(timesheet) for timesheet in timesheets])
+
+    bump_generation('timesheets')
+    invalidate_faculty_dashboard(*(timesheet.position.posted_by_id for timesheet in timesheets))
+    invalidate_user_dashboard(*(timesheet.ta_id for timesheet in timesheets))
+    return len(timesheets), total - len(timesheets)
+
+
+def payroll_candidates(year=None, month=None):
+    """已批准且尚未生成薪酬的工时表；给定年月时只取该工作月份"""
+    queryset = Timesheet.objects.filter(status='approved', salary__isnull=True)
+    if year and month:
+        queryset = queryset.filter(
+            month__gte=date(year, month, 1),
+            month__lt=date(*next_month(year, month), 1),
+        )
+    return queryset
+
+
+def generate_salaries(timesheets, generated_by):
+    """
+    为工时表批量生成薪酬记录，返回 (生成条数, 金额合计)
+    - 已生成过薪酬或未批准的工时表自动跳过
+    - 金额由 with_salary_amount 在同一关联查询中算出（Decimal，四舍五入到分）
+    - Salary 行批量插入（绕过 Salary.save 与信号，报表缓存与快照在此统一刷新）
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            timesheets.filter(status='approved', salary__isnull=True).with_salary_amount().order_by(
+                'timesheet_id'
+            ).values_list(
+                'timesheet_id', 'month', 'hours_worked', 'position__hourly_rate', 'salary_amount', 'ta_id'
+            )
+        )
+        if not rows:
+            return 0, Decimal('0.00')
+
+        salaries = []
+        total = Decimal('0.00')
+        for timesheet_id, _month, hours, rate, amount, _ta_id in rows:
+            amount = Decimal(amount).quantize(SALARY_QUANT, rounding=ROUND_HALF_UP)
+            total += amount
+            salaries.append(Salary(
+                timesheet_id=timesheet_id,
+                amount=amount,
+                calculation_details={
+                    'hours': float(hours),
+                    'rate': float(rate),
+                    'formula': f'{hours} × {rate}',
+                },
+                generated_by=generated_by,
+                transaction_id=uuid.uuid4().hex.upper(),
+            ))
+        # 同一工时表并发生成时由唯一约束拦截，整批回滚
+        Salary.objects.bulk_create(salaries, batch_size=SALARY_BATCH_SIZE)
+
+        refresh_snapshot('salaries', now.date())
+        for work_month in {row[1] for row in rows}:
+            refresh_snapshot('salaries', work_month)
+
+    bump_generation('salaries')
+    invalidate_user_dashboard(*(row[5] for row in rows))
+    return len(salaries), total
+
+
+def build_ta_dashboard(user):
+    """
+    助教看板数据：工时与薪酬一次条件聚合（工时 LEFT JOIN 一对一薪酬，计数不重复）、
+    在岗岗位数 1 次、最近工时/薪酬各 1 次
+    """
+    from .serializers import TimesheetListSerializer, SalaryListSerializer
+
+    timesheets = Timesheet.objects.filter(ta=user)
+    totals = timesheets.aggregate(
+        total_timesheets=Count('pk'),
+        pending_timesheets=Count('pk', filter=Q(status='pending')),
+        approved_timesheets=Count('pk', filter=Q(status='approved')),
+        rejected_timesheets=Count('pk', filter=Q(status='rejected')),
+        total_salary=Sum('salary__amount'),
+        paid_salary=Sum('salary__amount', filter=Q(salary__payment_status='paid')),
+        pending_salary=Sum('salary__amount', filter=Q(salary__payment_status='pending')),
+    )
+    # 在岗岗位数（已通过的申请）
+    active_positions = Application.objects.filter(applicant=user, status='accepted').count()
+
+    recent_timesheets = timesheets.with_salary_amount().select_related('position', 'ta', 'reviewed_by')[:3]
+    recent_salaries = Salary.objects.filter(
+        timesheet__ta=user
+    ).select_related('timesheet__position', 'generated_by')[:3]
+
+    return {
+        'statistics': {
+            'total_timesheets': totals['total_timesheets'],
+            'pending_timesheets': totals['pending_timesheets'],
+            'approved_timesheets': totals['approved_timesheets'],
+            'rejected_timesheets': totals['rejected_timesheets'],
+            'active_positions': active_positions,
+            'total_salary': float(totals['total_salary'] or 0),
+            'paid_salary': float(totals['paid_salary'] or 0),
+            'pending_salary': float(totals['pending_salary'] or 0),
+        },
+        'recent_timesheets': TimesheetListSerializer(recent_timesheets, many=True).data,
+        'recent_salaries': SalaryListSerializer(recent_salaries, many=True).data,
+    }
+
+
+def ta_dashboard(user):
+    """助教看板（按用户短时缓存，其工时、薪酬、申请写入时失效）"""
+    cache_key = versioned_key(f'dashboard:ta:{user.pk}', [user_dashboard_metric(user.pk)])
+    return get_or_compute(cache_key, lambda: build_ta_dashboard(user), USER_DASHBOARD_TTL)
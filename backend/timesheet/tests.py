@@ -1,3 +1,327 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from application.models import Application
+from notifications.models import Notification
+from TeachingAssistant.testing import DashboardTestMixin
+from .models import Timesheet, Salary
+from .serializers import TimesheetBatchCreateSerializer
+from .services import bulk_review_timesheets, generate_salaries
+
+
+class TADashboardQueryCountTest(DashboardTestMixin, TestCase):
+    """助教看板：工时与薪酬一次条件聚合，查询数不随工时/薪酬记录增长"""
+
+    # 角色 1 + 工时薪酬聚合 1 + 在岗岗位数 1 + 最近工时 1 + 最近薪酬 1
+    EXPECTED_QUERIES = 5
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_roles()
+        cls.admin = cls.create_admin()
+        cls.faculty = cls.create_faculty(0)
+        cls.ta = cls.create_student(0, is_ta=True)
+
+    def add_timesheets(self, start, count):
+        """每个岗位提交一份工时：偶数已批准并生成薪酬，奇数待审核"""
+        for index in range(start, start + count):
+            position = self.create_position(self.faculty, index)
+            Application.objects.create(position=position, applicant=self.ta, status='accepted')
+            Timesheet.objects.create(
+                ta=self.ta, position=position, month=position.start_date.replace(day=1),
+                hours_worked=Decimal('10.50'), work_description='批改作业',
+                status='approved' if index % 2 == 0 else 'pending'
+            )
+        generate_salaries(Timesheet.objects.filter(ta=self.ta), self.admin)
+
+    def get_dashboard(self):
+        self.client.force_authenticate(self.ta)
+        response = self.client.get('/api/ta/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_query_count_fixed_as_records_grow(self):
+        self.add_timesheets(0, 2)
+        cache.clear()
+        with self.assertNumQueries(self.EXPECTED_QUERIES):
+            small = self.get_dashboard()
+        self.assertEqual(small['statistics']['total_timesheets'], 2)
+
+        self.add_timesheets(2, 8)
+        cache.clear()
+        with self.assertNumQueries(self.EXPECTED_QUERIES):
+            large = self.get_dashboard()
+        statistics = large['statistics']
+        self.assertEqual(statistics['total_timesheets'], 10)
+        self.assertEqual(statistics['approved_timesheets'], 5)
+        self.assertEqual(statistics['pending_timesheets'], 5)
+        self.assertEqual(statistics['active_positions'], 10)
+        # 5 份已批准工时 × 10.50 小时 × 30 元
+        self.assertEqual(statistics['total_salary'], 1575.0)
+        self.assertEqual(statistics['pending_salary'], 1575.0)
+        self.assertEqual(statistics['paid_salary'], 0.0)
+        self.assertEqual(len(large['recent_timesheets']), 3)
+        self.assertEqual(len(large['recent_salaries']), 3)
+
+    def test_cached_until_salary_changes(self):
+        self.add_timesheets(0, 2)
+        self.get_dashboard()
+        with self.assertNumQueries(0):
+            self.get_dashboard()
+
+        salary = Salary.objects.get(timesheet__ta=self.ta)
+        salary.payment_status = 'paid'
+        with self.captureOnCommitCallbacks(execute=True):
+            salary.save()
+        data = self.get_dashboard()
+        self.assertEqual(data['statistics']['paid_salary'], 315.0)
+        self.assertEqual(data['statistics']['pending_salary'], 0.0)
+
+
+class BulkReviewTimesheetsTest(DashboardTestMixin, TestCase):
+    """批量审核工时：只处理待审核的工时表，状态与通知批量写入"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_roles()
+        cls.faculty = cls.create_faculty(0)
+        cls.tas = [cls.create_student(index, is_ta=True) for index in range(3)]
+        cls.position = cls.create_position(cls.faculty, 0)
+
+    def submit(self, ta, status='pending'):
+        return Timesheet.objects.create(
+            ta=ta, position=self.position, month=self.position.start_date.replace(day=1),
+            hours_worked=Decimal('8.00'), work_description='答疑', status=status
+        )
+
+    def review(self, action):
+        with self.captureOnCommitCallbacks(execute=True):
+            return bulk_review_timesheets(Timesheet.objects.all(), action, self.faculty, '批量审核')
+
+    def test_approve_pending_only_with_bulk_notifications(self):
+        pending = [self.submit(ta) for ta in self.tas[:2]]
+        self.submit(self.tas[2], status='rejected')
+
+        # 锁定待审核工时 1 + 总数 1 + 状态 UPDATE 1 + 通知批量插入 1 + 未读计数 2 + 保存点 2
+        with self.assertNumQueries(8):
+            self.assertEqual(self.review('approve'), (2, 1))
+
+        self.assertEqual(
+            dict(Timesheet.objects.values_list('ta_id', 'status')),
+            {self.tas[0].pk: 'approved', self.tas[1].pk: 'approved', self.tas[2].pk: 'rejected'},
+        )
+        reviewed = Timesheet.objects.get(pk=pending[0].pk)
+        self.assertEqual(reviewed.reviewed_by, self.faculty)
+        self.assertEqual(reviewed.review_notes, '批量审核')
+        self.assertIsNotNone(reviewed.reviewed_at)
+
+        notifications = Notification.objects.filter(notification_type='timesheet_approved')
+        self.assertEqual(
+            sorted(notifications.values_list('related_object_id', flat=True)),
+            sorted(timesheet.pk for timesheet in pending),
+        )
+        self.assertEqual(set(notifications.values_list('recipient_id', flat=True)), {ta.pk for ta in self.tas[:2]})
+        self.assertEqual(set(notifications.values_list('sender_id', flat=True)), {self.faculty.pk})
+
+    def test_reject_and_nothing_to_review(self):
+        self.submit(self.tas[0])
+        self.assertEqual(self.review('reject'), (1, 0))
+        self.assertEqual(Notification.objects.filter(notification_type='timesheet_rejected').count(), 1)
+        # 再次审核时已没有待审核工时
+        self.assertEqual(self.review('approve'), (0, 1))
+        self.assertFalse(Notification.objects.filter(notification_type='timesheet_approved').exists())
+
+    def test_invalid_action(self):
+        with self.assertRaises(ValueError):
+            bulk_review_timesheets(Timesheet.objects.all(), 'accept', self.faculty)
+
+
+class GenerateSalariesTest(DashboardTestMixin, TestCase):
+    """按月生成薪酬：重复生成不产生新记录，并发生成触发唯一约束时整批回滚并返回 409"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_roles()
+        cls.admin = cls.create_admin()
+        cls.faculty = cls.create_faculty(0)
+        cls.tas = [cls.create_student(index, is_ta=True) for index in range(3)]
+        position = cls.create_position(cls.faculty, 0)
+        cls.month = position.start_date.replace(day=1)
+        for index, ta in enumerate(cls.tas):
+            Timesheet.objects.create(
+                ta=ta, position=position, month=cls.month, hours_worked=Decimal('10.50'),
+                work_description='批改作业', status='pending' if index == 2 else 'approved'
+            )
+
+    def generate(self):
+        self.client.force_authenticate(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                '/api/admin/salaries/generate/', {'year': self.month.year, 'month': self.month.month}, format='json'
+            )
+
+    def test_generate_twice_is_idempotent(self):
+        response = self.generate()
+        self.assertEqual(response.status_code, 201)
+        # 2 份已批准工时 × 10.50 小时 × 30 元，待审核工时跳过
+        self.assertEqual(response.data['created_count'], 2)
+        self.assertEqual(response.data['total_amount'], '630.00')
+        self.assertEqual(
+            set(Salary.objects.values_list('timesheet__ta_id', flat=True)), {ta.pk for ta in self.tas[:2]}
+        )
+
+        again = self.generate()
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(again.data['created_count'], 0)
+        self.assertEqual(again.data['total_amount'], '0.00')
+        self.assertEqual(Salary.objects.count(), 2)
+
+    def test_concurrent_generation_returns_409(self):
+        bulk_create = Salary.objects.bulk_create
+
+        def concurrent_bulk_create(salaries, **kwargs):
+            # 读取候选工时之后、批量插入之前，另一个请求已为第一份工时生成了薪酬
+            bulk_create(salaries[:1])
+            return bulk_create(salaries, **kwargs)
+
+        with mock.patch.object(Salary.objects, 'bulk_create', side_effect=concurrent_bulk_create):
+            response = self.generate()
+        self.assertEqual(response.status_code, 409)
+        # 唯一约束冲突使本批整体回滚
+        self.assertFalse(Salary.objects.exists())
+
+        retry = self.generate()
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.data['created_count'], 2)
+
+    def test_rejects_invalid_month_and_non_admin(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.post('/api/admin/salaries/generate/', {'year': 2025, 'month': 13}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        self.client.force_authenticate(self.tas[0])
+        response = self.client.post('/api/admin/salaries/generate/', {'year': 2025, 'month': 3}, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Salary.objects.exists())
+
+
+class TimesheetBatchCreateTest(DashboardTestMixin, TestCase):
+    """批量提交工时：错误按条目顺序返回且整批不提交，单次最多 100 条"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_roles()
+        cls.faculty = cls.create_faculty(0)
+        cls.ta = cls.create_student(0, is_ta=True)
+        cls.positions = [cls.create_position(cls.faculty, index) for index in range(3)]
+        for position in cls.positions[:2]:
+            Application.objects.create(position=position, applicant=cls.ta, status='accepted')
+        Timesheet.objects.create(
+            ta=cls.ta, position=cls.positions[0], month=date(2024, 1, 1),
+            hours_worked=Decimal('8.00'), work_description='答疑'
+        )
+
+    def entry(self, position, month):
+        return {
+            'position': position.pk, 'month': month.isoformat(),
+            'hours_worked': '6.00', 'work_description': '批改作业',
+        }
+
+    def submitted_notifications(self):
+        return Notification.objects.filter(notification_type='timesheet_submitted').count()
+
+    def submit(self, entries):
+        self.client.force_authenticate(self.ta)
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post('/api/ta/timesheets/batch/', {'entries': entries}, format='json')
+
+    def test_creates_timesheets_and_notifies_faculty(self):
+        response = self.submit([
+            self.entry(self.positions[0], date(2024, 2, 1)),
+            self.entry(self.positions[1], date(2024, 1, 1)),
+        ])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created_count'], 2)
+        self.assertEqual(
+            [(row['position'], row['month']) for row in response.data['results']],
+            [(self.positions[0].pk, date(2024, 2, 1)), (self.positions[1].pk, date(2024, 1, 1))],
+        )
+        self.assertEqual(Timesheet.objects.filter(ta=self.ta).count(), 3)
+        created = [row['timesheet_id'] for row in response.data['results']]
+        notifications = Notification.objects.filter(
+            notification_type='timesheet_submitted', related_object_id__in=created
+        )
+        self.assertEqual(notifications.count(), 2)
+        self.assertEqual(set(notifications.values_list('recipient_id', flat=True)), {self.faculty.pk})
+
+    def test_errors_reported_per_entry_in_order(self):
+        notified = self.submitted_notifications()
+        response = self.submit([
+            self.entry(self.positions[1], date(2024, 3, 1)),
+            # 未被录用的岗位
+            self.entry(self.positions[2], date(2024, 3, 1)),
+            # 已提交过的月份
+            self.entry(self.positions[0], date(2024, 1, 1)),
+            self.entry(self.positions[0], date(2024, 4, 1)),
+            # 与上一条重复
+            self.entry(self.positions[0], date(2024, 4, 1)),
+        ])
+        self.assertEqual(response.status_code, 400)
+        errors = response.data['entries']
+        self.assertEqual(len(errors), 5)
+        self.assertEqual(errors[0], {})
+        self.assertEqual(list(errors[1]), ['position'])
+        self.assertEqual(errors[2]['month'], ['该月份工时表已提交，无法重复提交'])
+        self.assertEqual(errors[3], {})
+        self.assertEqual(errors[4]['month'], ['同一岗位同一月份在本次提交中重复'])
+        # 任一条目不合法时整批不提交
+        self.assertEqual(Timesheet.objects.filter(ta=self.ta).count(), 1)
+        self.assertEqual(self.submitted_notifications(), notified)
+
+    def test_entry_limit(self):
+        limit = TimesheetBatchCreateSerializer.MAX_ENTRIES
+        months = [date(2015 + index // 12, index % 12 + 1, 1) for index in range(limit // 2 + 1)]
+        entries = [self.entry(position, month) for month in months for position in self.positions[:2]]
+
+        response = self.submit(entries[:limit + 1])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('entries', response.data)
+        self.assertEqual(Timesheet.objects.filter(ta=self.ta).count(), 1)
+
+        response = self.submit(entries[:limit])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created_count'], limit)
+
+    def test_empty_batch_rejected(self):
+        self.assertEqual(self.submit([]).status_code, 400)
+
+
+class SalaryRoundingTest(DashboardTestMixin, TestCase):
+    """薪酬金额四舍五入到分：数据库注解与 calculate_salary 一致且均为 Decimal"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_roles()
+        cls.faculty = cls.create_faculty(0)
+        cls.ta = cls.create_student(0, is_ta=True)
+        # 40.50 小时 × 50.05 元 = 2027.025，恰好落在半分上
+        position = cls.create_position(cls.faculty, 0, hourly_rate=Decimal('50.05'))
+        cls.timesheet = Timesheet.objects.create(
+            ta=cls.ta, position=position, month=position.start_date.replace(day=1),
+            hours_worked=Decimal('40.50'), work_description='批改作业', status='approved'
+        )
+
+    def test_half_cent_rounds_up(self):
+        annotated = Timesheet.objects.with_salary_amount().get(pk=self.timesheet.pk)
+        plain = Timesheet.objects.select_related('position').get(pk=self.timesheet.pk)
+
+        self.assertIsInstance(annotated.salary_amount, Decimal)
+        self.assertEqual(annotated.salary_amount, Decimal('2027.03'))
+        for timesheet in (annotated, plain):
+            amount = timesheet.calculate_salary()
+            self.assertIsInstance(amount, Decimal)
+            self.assertEqual(amount, Decimal('2027.03'))
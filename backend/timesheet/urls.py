@@ -5,6 +5,7 @@
 from django.urls import path
 from .views import (
     TimesheetListCreate,
+    TimesheetBatchCreate,
     MyTimesheetDetail,
     UpdateTimesheet,
     MySalaries,
@@ -13,6 +14,7 @@ from .views import (
     FacultyTimesheetList,
     FacultyTimesheetDetail,
     ReviewTimesheet,
+    GenerateSalaries,
 )
 
 app_name = 'timesheet'
@@ -20,6 +22,7 @@ app_name = 'timesheet'
 urlpatterns = [
     # 工时管理
     path('api/ta/timesheets/', TimesheetListCreate.as_view(), name='timesheet-list-create'),
+    path('api/ta/timesheets/batch/', TimesheetBatchCreate.as_view(), name='timesheet-batch-create'),
     path('api/ta/timesheets/<int:timesheet_id>/', MyTimesheetDetail.as_view(), name='timesheet-detail'),
     path('api/ta/timesheets/<int:timesheet_id>/update/', UpdateTimesheet.as_view(), name='update-timesheet'),
     
@@ -34,5 +37,8 @@ urlpatterns = [
     path('api/faculty/timesheets/', FacultyTimesheetList.as_view(), name='faculty-timesheet-list'),
     path('api/faculty/timesheets/<int:timesheet_id>/', FacultyTimesheetDetail.as_view(), name='faculty-timesheet-detail'),
     path('api/faculty/timesheets/<int:timesheet_id>/review/', ReviewTimesheet.as_view(), name='review-timesheet'),
+
+    # 管理员批量生成薪酬
+    path('api/admin/salaries/generate/', GenerateSalaries.as_view(), name='generate-salaries'),
 ]
 
@@ -7,14 +7,15 @@ from rest_framework import generics, permissions, filters
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Sum, Q
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
-from django.db import transaction
+from django.db import transaction, IntegrityError
 from django.utils import timezone
-from accounts.permissions import IsTA, IsFaculty
+from accounts.permissions import IsTA, IsFaculty, IsAdministrator
 from .models import Timesheet, Salary
 from .serializers import (
     TimesheetCreateSerializer,
+    TimesheetBatchCreateSerializer,
     TimesheetUpdateSerializer,
     TimesheetListSerializer,
     TimesheetDetailSerializer,
@@ -22,7 +23,7 @@ from .serializers import (
     SalaryListSerializer,
     SalaryDetailSerializer,
 )
-from application.models import Application
+from .services import payroll_candidates, generate_salaries, ta_dashboard
 
 
 class TimesheetListCreate(generics.ListCreateAPIView):
@@ -43,7 +44,7 @@ class TimesheetListCreate(generics.ListCreateAPIView):
         """获取当前助教的工时表列表"""
         return Timesheet.objects.filter(
             ta=self.request.user
-        ).select_related(
+        ).with_salary_amount().select_related(
             'position',
             'ta',
             'reviewed_by'
@@ -61,6 +62,36 @@ class TimesheetListCreate(generics.ListCreateAPIView):
         serializer.save()
 
 
+class TimesheetBatchCreate(APIView):
+    """
+    批量提交工时表（多个岗位 / 多个月份）
+    POST /api/ta/timesheets/batch/  body: { "entries": [{position, month, hours_worked, work_description}, ...] }
+    任一条目校验失败则整批不提交，错误按条目顺序返回
+    """
+    permission_classes = [permissions.IsAuthenticated, IsTA]
+
+    def post(self, request):
+        serializer = TimesheetBatchCreateSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        try:
+            timesheets = serializer.save()
+        except IntegrityError:
+            # 并发重复提交同一岗位同一月份时，唯一约束使本批整体回滚
+            return Response({'detail': '部分工时表已提交，请刷新后重试'}, status=409)
+        return Response({
+            'created_count': len(timesheets),
+            'results': [
+                {
+                    'timesheet_id': timesheet.timesheet_id,
+                    'position': timesheet.position_id,
+                    'month': timesheet.month,
+                    'status': timesheet.status,
+                }
+                for timesheet in timesheets
+            ],
+        }, status=201)
+
+
 class MyTimesheetDetail(generics.RetrieveAPIView):
     """
     我的工时详情
@@ -74,7 +105,7 @@ class MyTimesheetDetail(generics.RetrieveAPIView):
         """只允许查看自己的工时表"""
         return Timesheet.objects.filter(
             ta=self.request.user
-        ).select_related(
+        ).with_salary_amount().select_related(
             'position',
             'ta',
             'reviewed_by'
@@ -149,68 +180,8 @@ class TADashboard(APIView):
     permission_classes = [permissions.IsAuthenticated, IsTA]
     
     def get(self, request):
-        """获取助教看板统计数据"""
-        user = request.user
-        
-        # 统计工时表数据
-        timesheets = Timesheet.objects.filter(ta=user)
-        total_timesheets = timesheets.count()
-        pending_timesheets = timesheets.filter(status='pending').count()
-        approved_timesheets = timesheets.filter(status='approved').count()
-        rejected_timesheets = timesheets.filter(status='rejected').count()
-        
-        # 统计薪酬数据
-        salaries = Salary.objects.filter(timesheet__ta=user)
-        total_salary = salaries.aggregate(
-            total=Sum('amount')
-        )['total'] or 0
-        
-        paid_salary = salaries.filter(payment_status='paid').aggregate(
-            total=Sum('amount')
-        )['total'] or 0
-        
-        pending_salary = salaries.filter(payment_status='pending').aggregate(
-            total=Sum('amount')
-        )['total'] or 0
-        
-        # 统计在岗岗位数（有已通过的申请）
-        active_positions = Application.objects.filter(
-            applicant=user,
-            status='accepted'
-        ).count()
-        
-        # 获取最近的工时表（最近3条）
-        recent_timesheets = timesheets.select_related(
-            'position'
-        )[:3]
-        recent_timesheets_data = TimesheetListSerializer(
-            recent_timesheets,
-            many=True
-        ).data
-        
-        # 获取最近的薪酬记录（最近3条）
-        recent_salaries = salaries.select_related(
-            'timesheet__position'
-        )[:3]
-        recent_salaries_data = SalaryListSerializer(
-            recent_salaries,
-            many=True
-        ).data
-        
-        return Response({
-            'statistics': {
-                'total_timesheets': total_timesheets,
-                'pending_timesheets': pending_timesheets,
-                'approved_timesheets': approved_timesheets,
-                'rejected_timesheets': rejected_timesheets,
-                'active_positions': active_positions,
-                'total_salary': float(total_salary),
-                'paid_salary': float(paid_salary),
-                'pending_salary': float(pending_salary),
-            },
-            'recent_timesheets': recent_timesheets_data,
-            'recent_salaries': recent_salaries_data,
-        })
+        """获取助教看板统计数据（按用户短时缓存，见 timesheet.services.ta_dashboard）"""
+        return Response(ta_dashboard(request.user))
 
 
 class FacultyTimesheetList(generics.ListAPIView):
@@ -231,7 +202,7 @@ class FacultyTimesheetList(generics.ListAPIView):
         """获取当前教师发布的岗位的所有工时表"""
         return Timesheet.objects.filter(
             position__posted_by=self.request.user
-        ).select_related(
+        ).with_salary_amount().select_related(
             'position',
             'ta',
             'reviewed_by'
@@ -251,7 +222,7 @@ class FacultyTimesheetDetail(generics.RetrieveAPIView):
         """只允许查看自己岗位下的工时表"""
         return Timesheet.objects.filter(
             position__posted_by=self.request.user
-        ).select_related(
+        ).with_salary_amount().select_related(
             'position',
             'ta',
             'reviewed_by'
@@ -305,3 +276,32 @@ class ReviewTimesheet(APIView):
             'status_display': timesheet.get_status_display(),
             'reviewed_at': timesheet.reviewed_at,
         })
+
+
+class GenerateSalaries(APIView):
+    """
+    管理员：按工作月份批量生成薪酬
+    POST /api/admin/salaries/generate/  body: { "year": 2025, "month": 3 }
+    """
+    permission_classes = [permissions.IsAuthenticated, IsAdministrator]
+
+    def post(self, request):
+        try:
+            year = int(request.data.get('year'))
+            month = int(request.data.get('month'))
+        except (TypeError, ValueError):
+            return Response({'detail': '请提供有效的 year 与 month'}, status=400)
+        if not 1 <= month <= 12:
+            return Response({'detail': 'month 取值应为 1-12'}, status=400)
+
+        try:
+            created, total = generate_salaries(payroll_candidates(year, month), request.user)
+        except IntegrityError:
+            # 并发生成同一批工时的薪酬时，唯一约束使本次整体回滚
+            return Response({'detail': '薪酬正在生成中，请稍后重试'}, status=409)
+        return Response({
+            'year': year,
+            'month': month,
+            'created_count': created,
+            'total_amount': str(total),
+        }, status=201 if created else 200)
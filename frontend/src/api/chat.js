@@ -48,4 +48,13 @@ export default {
       data: { content },
     })
   },
+
+  /** messageId 可选：只标记该消息及之前的消息为已读 */
+  markConversationRead(conversationId, messageId) {
+    return request({
+      url: `/chat/conversations/${conversationId}/read/`,
+      method: 'post',
+      data: messageId ? { message_id: messageId } : {},
+    })
+  },
 }
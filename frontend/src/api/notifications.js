@@ -26,6 +26,22 @@ export default {
     })
   },
 
+  // 广播通知详情（查看时自动标记为已读）
+  getBroadcastDetail(broadcastId) {
+    return request({
+      url: `/notifications/broadcasts/${broadcastId}/`,
+      method: 'get',
+    })
+  },
+
+  // 标记广播通知已读
+  markBroadcastAsRead(broadcastId) {
+    return request({
+      url: `/notifications/broadcasts/${broadcastId}/read/`,
+      method: 'post',
+    })
+  },
+
   // 全部标记为已读
   markAllAsRead() {
     return request({
@@ -41,5 +57,13 @@ export default {
       method: 'get',
     })
   },
+
+  // 实时推送连接票据（一次性，短时有效）
+  getStreamTicket() {
+    return request({
+      url: '/notifications/stream/ticket/',
+      method: 'post',
+    })
+  },
 }
 
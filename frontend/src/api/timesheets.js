@@ -10,6 +10,15 @@ export default {
     })
   },
 
+  // 助教端：批量提交工时表（entries: [{ position, month, hours_worked, work_description }]）
+  batchCreateTimesheets(entries) {
+    return request({
+      url: '/ta/timesheets/batch/',
+      method: 'post',
+      data: { entries },
+    })
+  },
+
   // 助教端：我的工时列表
   getMyTimesheets(params) {
     return request({
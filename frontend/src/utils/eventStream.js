@@ -0,0 +1,108 @@
+/**
+ * 实时事件订阅（Server-Sent Events）
+ * 全局共享一个 EventSource 连接，组件按事件类型订阅：message / notification / broadcast
+ * 后端未以 ASGI 部署（接口返回 501）或连接失败时，各组件继续使用轮询
+ * 访问令牌不放进 URL：每次建立连接前先换取一次性票据，以 ?ticket= 连接
+ */
+
+import { storage } from '@/utils/storage'
+import notificationApi from '@/api/notifications'
+
+const STREAM_URL = '/api/notifications/stream/'
+/** 连接未能建立（服务端不支持、票据无效等）后重新尝试的间隔（毫秒） */
+const RECONNECT_MS = 60000
+/** 已建立的连接被服务端正常断开后，换取新票据重连的间隔（毫秒） */
+const RESUME_MS = 3000
+const EVENT_TYPES = ['message', 'notification', 'broadcast']
+
+const listeners = new Map()
+let source = null
+let connecting = false
+let connected = false
+let reconnectTimer = null
+
+const dispatch = (type, event) => {
+  let data = null
+  try {
+    data = JSON.parse(event.data)
+  } catch (e) {
+    return
+  }
+  ;(listeners.get(type) || new Set()).forEach((handler) => handler(data))
+}
+
+const scheduleReconnect = (delay) => {
+  if (reconnectTimer) return
+  reconnectTimer = setTimeout(() => {
+    reconnectTimer = null
+    connect()
+  }, delay)
+}
+
+const connect = async () => {
+  if (!storage.getAccessToken() || source || connecting || typeof EventSource === 'undefined') return
+  connecting = true
+  let ticket = null
+  try {
+    ticket = (await notificationApi.getStreamTicket()).ticket
+  } catch (e) {
+    ticket = null
+  } finally {
+    connecting = false
+  }
+  if (!ticket || source || listeners.size === 0) {
+    if (!ticket) scheduleReconnect(RECONNECT_MS)
+    return
+  }
+
+  const current = new EventSource(`${STREAM_URL}?ticket=${encodeURIComponent(ticket)}`)
+  source = current
+  current.addEventListener('ready', () => {
+    connected = true
+  })
+  EVENT_TYPES.forEach((type) => {
+    current.addEventListener(type, (event) => dispatch(type, event))
+  })
+  current.onerror = () => {
+    // 票据只能使用一次，不依赖浏览器的自动重连：关闭后换取新票据再连
+    const wasConnected = connected
+    connected = false
+    current.close()
+    if (source === current) {
+      source = null
+      scheduleReconnect(wasConnected ? RESUME_MS : RECONNECT_MS)
+    }
+  }
+}
+
+const disconnect = () => {
+  if (source) {
+    source.close()
+    source = null
+  }
+  if (reconnectTimer) {
+    clearTimeout(reconnectTimer)
+    reconnectTimer = null
+  }
+  connected = false
+}
+
+/**
+ * 订阅事件，返回取消订阅函数；最后一个订阅取消时关闭连接
+ */
+export const subscribe = (type, handler) => {
+  if (!listeners.has(type)) listeners.set(type, new Set())
+  listeners.get(type).add(handler)
+  connect()
+  return () => {
+    const handlers = listeners.get(type)
+    if (handlers) handlers.delete(handler)
+    const total = [...listeners.values()].reduce((sum, set) => sum + set.size, 0)
+    if (total === 0) disconnect()
+  }
+}
+
+/** 实时连接是否可用（可用时组件可放缓轮询） */
+export const isStreamConnected = () => connected
+
+export default { subscribe, isStreamConnected }